@@ -1,9 +1,12 @@
+import hashlib
 import json
 import os
 import sys
+import threading
 import numpy as np
 import scipy.constants as constants
 from collections import OrderedDict
+from types import MappingProxyType
 
 
 # invalid configuration exception
@@ -15,7 +18,162 @@ class ConfigNotLoaded(Exception):
     pass
 
 
+def freeze_config(config):
+    """Get a read-only copy of a parsed configuration (dicts become mappingproxies, lists become tuples)"""
+    if isinstance(config, (dict, MappingProxyType)):
+        return MappingProxyType(
+            {key: freeze_config(value) for key, value in config.items()}
+        )
+    if isinstance(config, (list, tuple)):
+        return tuple(freeze_config(value) for value in config)
+    return config
+
+
+def thaw_config(config):
+    """Get a mutable copy of a frozen configuration (see freeze_config())"""
+    if isinstance(config, (dict, MappingProxyType)):
+        return OrderedDict((key, thaw_config(value)) for key, value in config.items())
+    if isinstance(config, (list, tuple)):
+        return [thaw_config(value) for value in config]
+    return config
+
+
+class CachedConfig:
+    def __init__(self, sha1: str, radar_config: MappingProxyType):
+        """A parsed configuration file held by a ConfigCache (shared by every file with the same contents)
+
+        Args:
+            sha1 (str): sha1 hash of the file contents
+            radar_config (MappingProxyType): the frozen configuration (see freeze_config())
+        """
+        self.sha1 = sha1
+        self.radar_config = radar_config
+
+        self._radar_performance = None
+        return
+
+    @property
+    def radar_performance(self):
+        """The frozen range/velocity/angle performance of the configuration (computed on first access)"""
+        if self._radar_performance is None:
+            config_manager = ConfigManager()
+            config_manager.radar_config = self.radar_config
+            config_manager.config_loaded = True
+            config_manager.compute_radar_perforance()
+            self._radar_performance = freeze_config(config_manager.radar_performance)
+        return self._radar_performance
+
+
+class ConfigCache:
+    # configuration file formats
+    CFG = "cfg"
+    JSON = "json"
+
+    def __init__(self):
+        """Cache of parsed .cfg and .json configuration files. Files are only parsed again when their
+        modification time or size changes (and their contents are different), so tools that load the
+        same configurations repeatedly only pay for parsing once
+        """
+        # (path, format) -> (mtime_ns, size, CachedConfig)
+        self._files = {}
+
+        # (sha1, format) -> CachedConfig
+        self._configs = {}
+
+        self._lock = threading.Lock()
+
+        # cache status
+        self.num_hits = 0
+        self.num_misses = 0
+
+        return
+
+    def load(self, config_path: str, config_format: str = None):
+        """Get the parsed configuration of a file
+
+        Args:
+            config_path (str): path to a .cfg or .json configuration file
+            config_format (str, optional): CFG or JSON. Defaults to None (.json files are JSON, all other
+                files are CFG).
+
+        Returns:
+            CachedConfig: the cached configuration (do not modify, see thaw_config() for a mutable copy)
+        """
+        if config_format is None:
+            if os.path.splitext(config_path)[1] == ".json":
+                config_format = ConfigCache.JSON
+            else:
+                config_format = ConfigCache.CFG
+
+        file_key = (os.path.abspath(config_path), config_format)
+        stat = os.stat(config_path)
+
+        with self._lock:
+            file_entry = self._files.get(file_key)
+            if file_entry is not None and file_entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self.num_hits += 1
+                return file_entry[2]
+
+        with open(config_path, "rb") as f:
+            content = f.read()
+        config_key = (hashlib.sha1(content).hexdigest(), config_format)
+
+        with self._lock:
+            cached_config = self._configs.get(config_key)
+
+        # only files with new contents are parsed
+        if cached_config is None:
+            if config_format == ConfigCache.JSON:
+                radar_config = json.loads(content, object_pairs_hook=OrderedDict)
+            else:
+                config_manager = ConfigManager()
+                config_manager._load_cfg_lines(content.decode().splitlines())
+                radar_config = config_manager.radar_config
+            cached_config = CachedConfig(config_key[0], freeze_config(radar_config))
+
+        with self._lock:
+            cached_config = self._configs.setdefault(config_key, cached_config)
+            self._files[file_key] = (stat.st_mtime_ns, stat.st_size, cached_config)
+            self.num_misses += 1
+
+        return cached_config
+
+    def index_directory(self, directory: str, extensions: tuple = (".cfg", ".json")):
+        """Load every configuration file in a directory (ex: configurations/)
+
+        Args:
+            directory (str): path to the directory
+            extensions (tuple, optional): extensions of the files to load. Defaults to (".cfg", ".json").
+
+        Returns:
+            OrderedDict: file path -> CachedConfig for every file that could be parsed (sorted by path)
+        """
+        index = OrderedDict()
+        for file_name in sorted(os.listdir(directory)):
+            config_path = os.path.join(directory, file_name)
+            if os.path.splitext(file_name)[1] not in extensions or not os.path.isfile(config_path):
+                continue
+
+            try:
+                index[config_path] = self.load(config_path)
+            except (ValueError, IndexError):
+                # invalid JSON or .cfg commands with missing parameters
+                continue
+
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+            self._configs.clear()
+            self.num_hits = 0
+            self.num_misses = 0
+
+
 class ConfigManager:
+    # parsed configuration files shared by every ConfigManager in the process
+    config_cache = ConfigCache()
+
     def __init__(self):
         # path for the TI radar config file
         self.TI_radar_config_path = None
@@ -193,15 +351,65 @@ class ConfigManager:
     def apply_new_CFAR_threshold(self, T_db: int):
         N = self._get_num_Tx_antennas() * self._get_num_Rx_antennas()
 
-        N_prime = np.power(2, np.ceil(np.log2(N)))
+        T_cli = self.CFAR_threshold_dB_to_cli(T_db, N)
 
-        T_cli = int(512 * T_db * N / (6 * N_prime))
-
-        self.radar_config["cfarCfg"]["threshold"] = T_cli
+        # SDK 3.x thresholds are set in dB, SDK 2.x thresholds in the radar's units
+        for cfarCfg in self.radar_config["cfarCfg"]:
+            if self.CFAR_threshold_in_dB(cfarCfg):
+                cfarCfg["threshold"] = T_db
+            else:
+                cfarCfg["threshold"] = T_cli
 
         # export the new configuration
         self.export_config_as_cfg("generated_config_custom_CFAR.cfg")
 
+    @staticmethod
+    def CFAR_threshold_dB_to_cli(T_db: float, num_virtual_antennas: int):
+        """Convert a CFAR threshold in dB to the cfarCfg threshold used by the radar. The radar's
+        detection matrix is the sum of the log2 magnitudes (Q9 format) across the virtual antennas
+        divided by the next power of 2, with each log2 step counted as 6 dB
+
+        Args:
+            T_db (float): the CFAR threshold in dB
+            num_virtual_antennas (int): number of virtual antennas (num Tx x num Rx)
+
+        Returns:
+            int: the cfarCfg threshold
+        """
+        N = num_virtual_antennas
+        N_prime = np.power(2, np.ceil(np.log2(N)))
+
+        return int(512 * T_db * N / (6 * N_prime))
+
+    @staticmethod
+    def CFAR_threshold_cli_to_dB(T_cli: int, num_virtual_antennas: int):
+        """Convert a cfarCfg threshold back to dB (see CFAR_threshold_dB_to_cli())
+
+        Args:
+            T_cli (int): the cfarCfg threshold
+            num_virtual_antennas (int): number of virtual antennas (num Tx x num Rx)
+
+        Returns:
+            float: the CFAR threshold in dB
+        """
+        N = num_virtual_antennas
+        N_prime = np.power(2, np.ceil(np.log2(N)))
+
+        return float(T_cli) * 6 * N_prime / (512 * N)
+
+    @staticmethod
+    def CFAR_threshold_in_dB(cfarCfg: dict):
+        """Check if the threshold of a cfarCfg command is in dB (SDK 3.x, which added peakGroupingEn)
+        or in the radar's units (SDK 2.x, see CFAR_threshold_dB_to_cli())
+
+        Args:
+            cfarCfg (dict): a cfarCfg command (see _load_cfarCfg_from_cfg())
+
+        Returns:
+            bool: True if the threshold is in dB
+        """
+        return cfarCfg["peakGrouping"] is not None
+
     # Importing from JSON
     def load_config_from_JSON(self, json_TI_radar_config_path: str):
         """Load a TI radar config from a JSON file
@@ -209,12 +417,10 @@ class ConfigManager:
         Args:
             json_TI_radar_config_path (str): path to the JSON file
         """
-        # open the JSON file
-        f = open(json_TI_radar_config_path)
-        content = ""
-        for line in f:
-            content += line
-        self.radar_config = json.loads(content, object_pairs_hook=OrderedDict)
+        cached_config = ConfigManager.config_cache.load(
+            json_TI_radar_config_path, ConfigCache.JSON
+        )
+        self.radar_config = thaw_config(cached_config.radar_config)
 
         self.config_loaded = True
         self.json_TI_radar_config_path = json_TI_radar_config_path
@@ -232,8 +438,8 @@ class ConfigManager:
             for key in self.radar_config:
                 command_string = key
                 params = self.radar_config[key]
-                if key == "chirpCfg":
-                    out_string += self._export_chirpCfg_config(params)
+                if key in ("chirpCfg", "cfarCfg"):
+                    out_string += self._export_command_list_config(key, params)
                 else:
                     for param_key in params:
                         value = params[param_key]
@@ -261,15 +467,16 @@ class ConfigManager:
                 "ConfigManager.export_config_as_cfg: No configuration loaded to save"
             )
 
-    def _export_chirpCfg_config(self, chirp_configs: list):
-        """Special behavior to handle multiple chirp configurations
+    def _export_command_list_config(self, command: str, configs: list):
+        """Special behavior to handle commands with multiple configurations (chirpCfg and cfarCfg)
 
         Args:
-            chirp_configs (list): a list of chirp configurations stored in dictionaries
+            command (str): the command (ex: "chirpCfg")
+            configs (list): a list of configurations stored in dictionaries
         """
         out_str = ""
-        for config in chirp_configs:
-            command_string = "chirpCfg"
+        for config in configs:
+            command_string = command
             for param_key in config:
                 value = config[param_key]
                 if type(value) is list:
@@ -309,79 +516,35 @@ class ConfigManager:
         Args:
             TI_radar_config_path (str): path to the .cfg file
         """
-        # open the .cfg file file
-        f = open(TI_radar_config_path)
+        cached_config = ConfigManager.config_cache.load(
+            TI_radar_config_path, ConfigCache.CFG
+        )
+        self.radar_config = thaw_config(cached_config.radar_config)
+
+        self.TI_radar_config_path = TI_radar_config_path
+        self.config_loaded = True
+
+    def _load_cfg_lines(self, lines):
+        """Parse the lines of a .cfg file into self.radar_config
+
+        Args:
+            lines (iterable): the lines of the .cfg file
+        """
         # reset the radar config
         self.radar_config = OrderedDict()
-        for line in f:
+        for line in lines:
             # skip comments (marked by %)
             if "%" not in line:
                 self._load_cfg_command_from_line(line)
 
-        self.TI_radar_config_path = TI_radar_config_path
-        self.config_loaded = True
-
     def _load_cfg_command_from_line(self, line: str):
         # split the line in parts
         str_split = line.strip("\n").split(" ")
-        key = str_split[0]
-
-        match key:
-            case "dfeDataOutputMode":
-                self._load_dfeDataOutputMode_from_cfg(str_split)
-            case "channelCfg":
-                self._load_channelCfg_from_cfg(str_split)
-            case "adcCfg":
-                self._load_adcCfg_from_cfg(str_split)
-            case "adcbufCfg":
-                self._load_adcbufCfg_from_cfg(str_split)
-            case "profileCfg":
-                self._load_profileCfg_from_cfg(str_split)
-            case "chirpCfg":
-                self._load_chirpCfg_from_cfg(str_split)
-            case "frameCfg":
-                self._load_frameCfg_from_cfg(str_split)
-            case "lowPower":
-                self._load_lowPower_from_cfg(str_split)
-            case "guiMonitor":
-                self._load_guiMonitor_from_cfg(str_split)
-            case "cfarCfg":
-                self._load_cfarCfg_from_cfg(str_split)
-            case "peakGrouping":
-                self._load_peakGrouping_from_cfg(str_split)
-            case "multiObjBeamForming":
-                self._load_multiObjBeamForming_from_cfg(str_split)
-            case "clutterRemoval":
-                self._load_clutterRemoval_from_cfg(str_split)
-            case "calibDcRangeSig":
-                self._load_calibDcRangeSig_from_cfg(str_split)
-            case "compRangeBiasAndRxChanPhase":
-                self._load_compRangeBiasAndRxChanPhase_from_cfg(str_split)
-            case "measureRangeBiasAndRxChanPhase":
-                self._load_measureRangeBiasAndRxChanPhase_from_cfg(str_split)
-            case "CQRxSatMonitor":
-                self._load_CQRxSatMonitor_from_cfg(str_split)
-            case "CQSigImgMonitor":
-                self._load_CQSigImgMonitor_from_cfg(str_split)
-            case "analogMonitor":
-                self._load_analogMonitor_from_cfg(str_split)
-            case _:
-                pass
-                # if key not in [
-                #     "sensorStop",
-                #     "flushCfg",
-                #     "sensorStart",
-                #     "setProfileCfg",
-                #     "testFmkCfg",
-                #     "extendedMaxVelocity",
-                #     "bpmCfg",
-                #     "lvdsStreamCfg",
-                #     "aoaFovCfg",
-                #     "cfarFovCfg",
-                #     "cfarFovCfg",
-                #     "calibData"
-                # ]:
-                #     raise InvalidConfiguration("Received unknown configuration command: {}".format(key))
+
+        # unknown commands are ignored
+        load_command = ConfigManager._CFG_COMMAND_LOADERS.get(str_split[0])
+        if load_command is not None:
+            load_command(self, str_split)
 
     def _load_dfeDataOutputMode_from_cfg(self, params: list):
         self.radar_config["dfeDataOutputMode"] = {"modeType": params[1]}
@@ -469,8 +632,17 @@ class ConfigManager:
         }
 
     def _load_cfarCfg_from_cfg(self, params: list):
-        self.radar_config["cfarCfg"] = {
-            "subFrameIndex": None,
+        # SDK 2.x (xwr14xx): direction mode noiseWindow guardLength shiftDivisor cyclic threshold
+        # SDK 3.x: subFrameIdx procDirection averageMode winLen guardLen noiseDiv cyclicMode
+        #   thresholdScale (dB) peakGroupingEn
+        params = [param for param in params if param]
+        if len(params) > 8:
+            sub_frame_index, params = params[1], params[1:]
+        else:
+            sub_frame_index = None
+
+        value = {
+            "subFrameIndex": sub_frame_index,
             "direction": params[1],
             "mode": params[2],
             "noiseWindow": params[3],
@@ -478,8 +650,15 @@ class ConfigManager:
             "shiftDivisor": params[5],
             "cyclic": params[6],
             "threshold": params[7],
+            "peakGrouping": params[8] if len(params) > 8 else None,
         }
 
+        # one command for each direction (range and doppler)
+        if "cfarCfg" in self.radar_config.keys():
+            self.radar_config["cfarCfg"].append(value)
+        else:
+            self.radar_config["cfarCfg"] = [value]
+
     def _load_peakGrouping_from_cfg(self, params: list):
         self.radar_config["peakGrouping"] = {
             "subFrameIndex": None,
@@ -544,6 +723,29 @@ class ConfigManager:
             "sigImgBand": params[2],
         }
 
+    # .cfg command -> function loading its parameters into self.radar_config
+    _CFG_COMMAND_LOADERS = {
+        "dfeDataOutputMode": _load_dfeDataOutputMode_from_cfg,
+        "channelCfg": _load_channelCfg_from_cfg,
+        "adcCfg": _load_adcCfg_from_cfg,
+        "adcbufCfg": _load_adcbufCfg_from_cfg,
+        "profileCfg": _load_profileCfg_from_cfg,
+        "chirpCfg": _load_chirpCfg_from_cfg,
+        "frameCfg": _load_frameCfg_from_cfg,
+        "lowPower": _load_lowPower_from_cfg,
+        "guiMonitor": _load_guiMonitor_from_cfg,
+        "cfarCfg": _load_cfarCfg_from_cfg,
+        "peakGrouping": _load_peakGrouping_from_cfg,
+        "multiObjBeamForming": _load_multiObjBeamForming_from_cfg,
+        "clutterRemoval": _load_clutterRemoval_from_cfg,
+        "calibDcRangeSig": _load_calibDcRangeSig_from_cfg,
+        "compRangeBiasAndRxChanPhase": _load_compRangeBiasAndRxChanPhase_from_cfg,
+        "measureRangeBiasAndRxChanPhase": _load_measureRangeBiasAndRxChanPhase_from_cfg,
+        "CQRxSatMonitor": _load_CQRxSatMonitor_from_cfg,
+        "CQSigImgMonitor": _load_CQSigImgMonitor_from_cfg,
+        "analogMonitor": _load_analogMonitor_from_cfg,
+    }
+
 
 if __name__ == "__main__":
     # create the controller object
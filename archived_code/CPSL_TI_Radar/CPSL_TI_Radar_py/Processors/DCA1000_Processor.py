@@ -3,9 +3,17 @@ from multiprocessing import connection, AuthenticationError
 
 import numpy as np
 from multiprocessing.connection import Listener
+from collections import deque
 import threading
 
 from CPSL_TI_Radar.Processors._Processor import _Processor
+from CPSL_TI_Radar._Shared_Frame_Ring import _SharedFrameRing
+from CPSL_TI_Radar.utilities.Shared_Memory_Transport import SharedMemoryPublisher
+from CPSL_TI_Radar.Processors.DCA1000_Processors._Frame_Processor import (
+    FrameProducts,
+    _FrameProcessor,
+    _FrameProcessorPool,
+)
 
 
 class DCA1000Processor(_Processor):
@@ -38,6 +46,25 @@ class DCA1000Processor(_Processor):
 
         self.current_packet = bytearray()
 
+        # shared memory ring that the streamer writes frames into
+        # (attached once the first frame is received)
+        self.frame_ring: _SharedFrameRing = None
+        self.frame_ring_name = _SharedFrameRing.name_from_settings(
+            self._settings["Streamer"]["DCA1000_streaming"]
+        )
+        self.num_overwritten_frames = 0
+
+        # decoding raw frames into ADC data cubes
+        self.adc_data_format = self._settings["Streamer"]["DCA1000_streaming"][
+            "adc_data_format"
+        ]
+
+        # frames are processed by a _FrameProcessor when num_workers is 0, otherwise they
+        # are distributed to a pool of worker processes (re-created for each new config)
+        self.num_workers = self._settings["Processor"]["num_workers"]
+        self.frame_processor: _FrameProcessor = None
+        self.frame_processor_pool: _FrameProcessorPool = None
+
         # key radar parameters
         # TODO: enable these at a later time
         self.max_range_bin = 64  # enable this a bit better
@@ -67,6 +94,13 @@ class DCA1000Processor(_Processor):
         self.AoA_method = "FFT" #'FFT','Bartlet','Capon'
         self.angle_bins = None
 
+        # window applied before the range FFT
+        self.range_window = self._settings["Processor"]["range_window"]
+
+        # point clouds from the RadCloud model or CFAR detection ("RadCloudModel" or "CFAR")
+        self.point_cloud_method = self._settings["Processor"]["point_cloud_method"]
+        self.CFAR_method = self._settings["Processor"]["CFAR_method"]
+
         #specify power ranges
         self.rng_az_power_range_dB_FFT = [67, 105]
         self.rng_az_power_range_dB_Bartlet = [120,200]
@@ -75,9 +109,7 @@ class DCA1000Processor(_Processor):
         
         #capon and bartlet transform variables
         self.angle_range_deg = [-90,90]
-        self.spatial_signatures = None
-        self.a_phi = None
-        self.a_phi_H = None
+        self.capon_diagonal_loading = 1e-3
 
         # mesh grid coordinates for plotting
         self.thetas = None
@@ -87,6 +119,13 @@ class DCA1000Processor(_Processor):
 
         # listeners
         self._listeners_enabled = False
+
+        # "pipe" sends each output over its listener connection, "shared_memory" publishes
+        # the outputs to shared memory segments (the connection is only used for the handshake)
+        self.listener_transport = self._settings["Processor"]["DCA1000_Listeners"][
+            "transport"
+        ]
+        self._listener_publishers = {}
         self._listener_ADCDataCube_enabled = False
         self._listener_ADCDataCube = None
         self._conn_ADCDataCube = None
@@ -107,6 +146,16 @@ class DCA1000Processor(_Processor):
         self._conn_RadCloudModel = None
         self._conn_RadCloudModel_enabled = None
 
+        # frame numbers of the range-azimuth responses waiting on the RadCloud model (in order)
+        self._RadCloudModel_frames_in_flight = deque()
+        # point clouds that the model still owes for frames sent before streaming was restarted
+        self._RadCloudModel_num_stale_results = 0
+        self.RadCloudModel_max_frames_in_flight = 1
+        self.num_frames_skipped_RadCloudModel = 0
+        # number of frames sent to the listeners since the frame of the latest model point cloud
+        self.RadCloudModel_latency_frames = 0
+        self._last_frame_number = 0
+
         self._listener_PointCloud_enabled = False
         self._listener_PointCloud = None
         self._conn_PointCloud = None
@@ -118,12 +167,35 @@ class DCA1000Processor(_Processor):
         return
 
     def close(self):
-        pass
+        self._close_frame_processor_pool()
+        self._detach_frame_ring()
+        self._close_listener_publishers()
+
+    def _close_listener_publishers(self):
+        for publisher in self._listener_publishers.values():
+            publisher.close()
+        self._listener_publishers = {}
+
+    def _close_frame_processor_pool(self):
+        if self.frame_processor_pool:
+            self.num_overwritten_frames += self.frame_processor_pool.num_overwritten_frames
+            self.frame_processor_pool.close()
+            self.frame_processor_pool = None
+
+    def _detach_frame_ring(self):
+        if self.frame_ring:
+            # release any views into the ring before closing it
+            self.current_packet = bytearray()
+            self.frame_ring.close()
+            self.frame_ring = None
 
     def _load_new_config(self, config_info: dict):
         # call the parent class method to save the new radar config and performance
         super()._load_new_config(config_info)
 
+        # the streamer re-creates the frame ring for each new config
+        self._detach_frame_ring()
+
         # key radar parameters
         self.rx_channels = self.radar_performance["angle"]["num_rx_antennas"]
         self.num_az_antennas = self.radar_performance["angle"]["num_az_antennas"]
@@ -153,6 +225,28 @@ class DCA1000Processor(_Processor):
 
         self._init_AoA_compute_method()
 
+        if self.point_cloud_method == "CFAR" and "cfarCfg" not in self.radar_config:
+            self._conn_send_message_to_print(
+                "DCA1000_Processor._load_new_config: CFAR point clouds require a cfarCfg in the radar config"
+            )
+            self._conn_send_parent_error_message()
+            self.point_cloud_method = "RadCloudModel"
+
+        # setup frame processing for the new config
+        self._close_frame_processor_pool()
+        if self.num_workers > 0:
+            self.frame_processor = None
+            self.frame_processor_pool = _FrameProcessorPool(
+                num_workers=self.num_workers,
+                frame_ring_name=self.frame_ring_name,
+                frame_config=self._get_frame_config(),
+                frame_ring_slots=int(
+                    self._settings["Streamer"]["DCA1000_streaming"]["frame_ring_slots"]
+                ),
+            )
+        else:
+            self.frame_processor = _FrameProcessor(self._get_frame_config())
+
         self._init_plot_grid()
         
         return
@@ -207,46 +301,88 @@ class DCA1000Processor(_Processor):
         angles_deg = np.arange(self.angle_range_deg[0],self.angle_range_deg[1],step)
         self.angle_bins = np.deg2rad(angles_deg)
 
-        #compute the spatial signatures
-        self.a_phi = self._compute_spatial_signatures(self.angle_bins)
-        self.a_phi_H = np.conj(np.transpose(self.a_phi,axes=(0,2,1)))
-
-
-    def _compute_spatial_signature(self,angle_rad):
-        """Compute the spatial signature for the Capon/Bartlet methods for a 
-        linear array geometry at a specific angle with lambda/2 spacing between elements
-
-        Args:
-            angle_rad (_type_): the angle to compute the spatial signature at
+    def _get_frame_config(self):
+        """Get the processing parameters for the current config (used to create _FrameProcessors)
 
         Returns:
-            np.ndarray(dtype=np.complex_): spatial signature with num_az_antennas elements
+            dict: the frame processing parameters
         """
-        indicies = np.arange(0,self.num_az_antennas,dtype=np.float32)
-        spatial_signature = np.exp(1j * np.pi * indicies * np.sin(angle_rad))
-
-        return spatial_signature
-    
-    def _compute_spatial_signatures(self,angles_rad:np.ndarray):
-        """Compute the spatial signatures used by the Capon and Bartlet AoA estimation techniques for a given set of AoA's
 
-        Args:
-            angles_rad (np.ndarray): Array of angles to compute the spatial signatures at
+        match self.AoA_method:
+            case "Bartlet":
+                rng_az_power_range_dB = self.rng_az_power_range_dB_Bartlet
+            case "Capon":
+                rng_az_power_range_dB = self.rng_az_power_range_dB_Capon
+            case _:
+                rng_az_power_range_dB = self.rng_az_power_range_dB_FFT
+
+        return {
+            "rx_channels": self.rx_channels,
+            "num_az_antennas": self.num_az_antennas,
+            "virtual_antennas_enabled": self.virtual_antennas_enabled,
+            "samples_per_chirp": self.samples_per_chirp,
+            "total_chirps_per_frame": self.total_chirps_per_frame,
+            "chirp_loops_per_frame": self.chirp_loops_per_frame,
+            "num_chirps_to_save": self.num_chirps_to_save,
+            "max_range_bin": self.max_range_bin,
+            "num_angle_bins": self.num_angle_bins,
+            "angle_bins": self.angle_bins,
+            "AoA_method": self.AoA_method,
+            "adc_data_format": self.adc_data_format,
+            "range_window": self.range_window,
+            "capon_diagonal_loading": self.capon_diagonal_loading,
+            "rng_az_power_range_dB": rng_az_power_range_dB,
+            "rng_dop_power_range_dB": self.rng_dop_poer_range_dB,
+            "range_res": self.radar_performance["range"]["range_res"],
+            "vel_res": self.radar_performance["velocity"]["vel_res"],
+            "cfarCfg": self.radar_config["cfarCfg"]
+            if self.point_cloud_method == "CFAR"
+            else None,
+            "CFAR_method": self.CFAR_method,
+            "products": self._get_frame_products(),
+        }
+
+    def _get_frame_products(self):
+        """Get the products that the connected listeners need for each frame
+        (nothing beyond decoding is computed when no listeners need it)
 
         Returns:
-            np.ndarray: num_angle_bins x num_az_antennas x 1 array of spatial signatures
-            which can easily be used for np.matmul() operations
+            list: the FrameProducts.OUTPUTS to compute
         """
 
-        spatial_signatures = np.zeros(
-            shape=(self.num_angle_bins,self.num_az_antennas,1),
-            dtype=np.complex_)
+        products = []
+        if self._conn_ADCDataCube_enabled:
+            products.append(FrameProducts.ADC_DATA_CUBE)
+        # the RadCloud model generates the point cloud from the range-azimuth response
+        if self._conn_NormRngAzResp_enabled or (
+            self._conn_RadCloudModel_enabled
+            and self.point_cloud_method == "RadCloudModel"
+        ):
+            products.append(FrameProducts.NORM_RNG_AZ_RESP)
+        if self._conn_NormRngDopResp_enabled:
+            products.append(FrameProducts.NORM_RNG_DOP_RESP)
+        if self._conn_PointCloud_enabled and self.point_cloud_method == "CFAR":
+            products.append(FrameProducts.POINT_CLOUD)
+
+        return products
+
+    def _start_streaming(self):
+        super()._start_streaming()
+        self.num_frames_skipped_RadCloudModel = 0
+        self.RadCloudModel_latency_frames = 0
+
+        # the point clouds of frames from the previous stream are discarded when they are received
+        self._RadCloudModel_num_stale_results += len(self._RadCloudModel_frames_in_flight)
+        self._RadCloudModel_frames_in_flight.clear()
+
+        # the listeners may have connected since the config was loaded
+        if self.streaming_enabled:
+            products = self._get_frame_products()
+            if self.frame_processor_pool:
+                self.frame_processor_pool.set_products(products)
+            elif self.frame_processor:
+                self.frame_processor.set_products(products)
 
-        for i in range(len(angles_rad)):
-            spatial_signatures[i,:,0] = self._compute_spatial_signature(angles_rad[i])
-        
-        return spatial_signatures
-    
     def _init_listeners(self):
         # get listener client enabled status
         listener_info = self._settings["Processor"]["DCA1000_Listeners"]
@@ -324,6 +460,7 @@ class DCA1000Processor(_Processor):
         ADCDataCube_addr = ("localhost", int(listener_info["ADCDataCube"]["addr"]))
         self._listener_ADCDataCube = Listener(ADCDataCube_addr, authkey=authkey)
         self._conn_ADCDataCube = self._listener_ADCDataCube.accept()
+        self._conn_send_listener_handshake(self._conn_ADCDataCube, "ADCDataCube")
         self._conn_ADCDataCube_enabled = True
 
     def _init_NormRngAzResp_listener(self):
@@ -337,6 +474,7 @@ class DCA1000Processor(_Processor):
         NormRngAzResp_addr = ("localhost", int(listener_info["NormRngAzResp"]["addr"]))
         self._listener_NormRngAzResp = Listener(NormRngAzResp_addr, authkey=authkey)
         self._conn_NormRngAzResp = self._listener_NormRngAzResp.accept()
+        self._conn_send_listener_handshake(self._conn_NormRngAzResp, "NormRngAzResp")
         self._conn_NormRngAzResp_enabled = True
 
     def _init_NormRngDopResp_listener(self):
@@ -353,6 +491,7 @@ class DCA1000Processor(_Processor):
         )
         self._listener_NormRngDopResp = Listener(NormRngDopResp_addr, authkey=authkey)
         self._conn_NormRngDopResp = self._listener_NormRngDopResp.accept()
+        self._conn_send_listener_handshake(self._conn_NormRngDopResp, "NormRngDopResp")
         self._conn_NormRngDopResp_enabled = True
 
     def _init_RadCloudModel_listener(self):
@@ -364,6 +503,9 @@ class DCA1000Processor(_Processor):
         authkey = authkey_str.encode()
 
         RadCloudModel_addr = ("localhost", int(listener_info["RadCloudModel"]["addr"]))
+        self.RadCloudModel_max_frames_in_flight = int(
+            listener_info["RadCloudModel"]["max_frames_in_flight"]
+        )
         self._listener_RadCloudModel = Listener(RadCloudModel_addr, authkey=authkey)
         self._conn_RadCloudModel = self._listener_RadCloudModel.accept()
         self._conn_RadCloudModel_enabled = True
@@ -381,328 +523,322 @@ class DCA1000Processor(_Processor):
         self._conn_PointCloud = self._listener_PointCloud.accept()
         self._conn_PointCloud_enabled = True
 
-    # processing packets
-    def _process_new_packet(self):
-        # load the packet into the current_packet byte array
-        super()._process_new_packet()
+    def _get_listener_segment_name(self, listener_name: str):
+        return "{}_{}".format(self.frame_ring_name, listener_name)
 
-        adc_data_cube = self._get_raw_ADC_data_cube()
+    def _conn_send_listener_handshake(self, conn: Connection, listener_name: str):
+        """When using the shared memory transport, send the name of the shared memory segment
+        that the listener's output is published to (nothing is sent for the pipe transport)
 
-        range_azimuth_response = self._compute_normalized_range_azimuth_heatmap(
-            adc_data_cube
-        )
-
-        range_doppler_response = self._compute_normalized_range_doppler_response(
-            adc_data_cube
-        )
+        Args:
+            conn (Connection): the listener connection
+            listener_name (str): the listener (ex: "ADCDataCube")
+        """
 
-        # compute point cloud
-        if self._conn_RadCloudModel_enabled:
-            # send range azimuth response to RadCloud model
-            try:
-                self._conn_RadCloudModel.send(range_azimuth_response)
-            except ConnectionResetError:
-                self._conn_send_message_to_print(
-                    "DCA1000 Processor._process_new_packet: Error sending to RadCloud Model"
-                )
-                self._conn_send_parent_error_message()
-                self.streaming_enabled = False
+        if self.listener_transport == "shared_memory":
+            conn.send(
+                {
+                    "transport": "shared_memory",
+                    "name": self._get_listener_segment_name(listener_name),
+                }
+            )
 
-            # receive the generated point cloud
-            try:
-                point_cloud = np.float32(self._conn_RadCloudModel.recv())
-            except EOFError:
-                self._conn_send_message_to_print(
-                    "DCA1000 Processor._process_new_packet: Error receiving from RadCloud Model"
-                )
-                self._conn_send_parent_error_message()
-                self.streaming_enabled = False
+    # processing packets
+    def _get_data_conns(self):
+        conns = super()._get_data_conns()
+        if self.frame_processor_pool:
+            conns = conns + self.frame_processor_pool.result_conns
+        if self._RadCloudModel_frames_in_flight or self._RadCloudModel_num_stale_results:
+            conns = conns + [self._conn_RadCloudModel]
+        return conns
+
+    def _process_data_conn(self, conn: Connection):
+        if conn == self._conn_processor_data:
+            self._process_new_packet()
+        elif conn == self._conn_RadCloudModel:
+            self._process_RadCloudModel_results()
+        else:
+            self._process_frame_processor_pool_results(conn)
 
+    def _frames_ready(self):
+        if self.frame_processor_pool:
+            return (
+                len(self._frame_queue) > 0 and self.frame_processor_pool.has_capacity
+            )
         else:
-            point_cloud = None
+            return super()._frames_ready()
 
-        self._conn_send_data_to_listeners(
-            adc_data_cube, range_azimuth_response, range_doppler_response, point_cloud
-        )
+    def _process_new_packet(self):
+        if self.frame_processor_pool:
+            self._receive_new_frames()
+            self._submit_queued_frames()
+            return
+
+        # load the next frame ring message into the current_packet byte array
+        if not super()._process_new_packet() or not self.streaming_enabled:
+            return
+
+        # access the frame directly from its ring slot
+        slot_idx, seq = _SharedFrameRing.decode_message(self.current_packet)
+        if self.frame_ring is None:
+            self.frame_ring = _SharedFrameRing(name=self.frame_ring_name)
+        self.current_packet = self.frame_ring.get_slot(slot_idx)
+
+        adc_data_cube = self.frame_processor.decode_frame(self.current_packet)
+
+        # drop the frame if the streamer overwrote the slot while it was being read
+        if not self.frame_ring.slot_valid(slot_idx, seq):
+            self.num_overwritten_frames += 1
+            return
+
+        # only the products needed by the listeners are computed
+        self._send_frame_results(seq, *self.frame_processor.compute_products(adc_data_cube))
         return
 
-    def _conn_send_data_to_listeners(
-        self,
-        adc_data_cube: np.ndarray,
-        range_azimuth_response: np.ndarray,
-        range_doppler_response: np.ndarray,
-        point_cloud: np.ndarray,
-    ):
-        if self._listeners_enabled:
-            # send ADC data cube
-            try:
-                if self._conn_ADCDataCube_enabled:
-                    self._conn_ADCDataCube.send(adc_data_cube)
-                if self._conn_NormRngAzResp_enabled:
-                    self._conn_NormRngAzResp.send(range_azimuth_response)
-                if self._conn_NormRngDopResp_enabled:
-                    self._conn_NormRngDopResp.send(range_doppler_response)
-                if self._conn_PointCloud_enabled:
-                    self._conn_PointCloud.send(point_cloud)
-            except ConnectionResetError:
-                self._conn_send_message_to_print(
-                    "DCA1000 Processor.__conn_send_data_to_listeners: A listener was already closed or reset"
-                )
-                self._conn_send_parent_error_message()
-                self.streaming_enabled = False
-
-    def _get_raw_ADC_data_cube(self):
-        """Generate the raw ADC data cube from the streamed packet
+    def _submit_queued_frames(self):
+        """Send queued frames to the frame processor pool while its workers have capacity"""
 
-        Returns:
-            np.ndarray: the raw ADC data cube indexed by [rx_channel, sample, chirp]
-        """
+        while self._frame_queue and self.frame_processor_pool.has_capacity:
+            slot_idx, seq = _SharedFrameRing.decode_message(self._frame_queue.popleft())
+            self.frame_processor_pool.submit(slot_idx, seq)
+            self.num_frames_processed += 1
 
-        adc_data = np.frombuffer(self.current_packet, dtype=np.int16)
+        self._report_frame_processor_worker_failures()
 
-        # reshape to get the real and imaginary parts
-        adc_data = np.reshape(
-            adc_data, (DCA1000Processor.LVDS_lanes * 2, -1), order="F"
-        )
+    def _process_frame_processor_pool_results(self, conn: Connection):
+        """Send the processed frames from a frame processor pool worker to the listeners (in frame order)
 
-        # convert into a complex format
-        adc_data = adc_data[0:4, :] + 1j * adc_data[4:, :]
-
-        if self.virtual_antennas_enabled:
-            # reshape to index as [rx channel, sample, chirp]
-            adc_data_cube = np.reshape(
-                adc_data,
-                (self.rx_channels, self.samples_per_chirp, self.total_chirps_per_frame),
-                order="F",
-            )
-
-            virtual_array_data_cube = np.zeros_like(
-                adc_data_cube,
-                shape=(
-                    self.num_az_antennas,
-                    self.samples_per_chirp,
-                    self.chirp_loops_per_frame,
-                ),
-            )
-            # virtual_array_data_cube = np.zeros((self.num_az_antennas,self.samples_per_chirp,self.chirp_loops_per_frame))
-
-            tx_1_chirps = np.arange(0, self.total_chirps_per_frame, 2)
-            tx_2_chirps = np.arange(1, self.total_chirps_per_frame, 2)
-
-            virtual_array_data_cube[0 : self.rx_channels, :, :] = adc_data_cube[
-                :, :, tx_1_chirps
-            ]
-            virtual_array_data_cube[self.rx_channels :, :, :] = adc_data_cube[
-                :, :, tx_2_chirps
-            ]
-
-            return virtual_array_data_cube
-        else:
-            # reshape to index as [rx channel, sample, chirp]
-            adc_data_cube = np.reshape(
-                adc_data,
-                (self.rx_channels, self.samples_per_chirp, self.total_chirps_per_frame),
-                order="F",
-            )
+        Args:
+            conn (Connection): the worker connection with new results
+        """
 
-            return adc_data_cube
+        ready_results = self.frame_processor_pool.recv_results(conn)
 
-    def _compute_normalized_range_azimuth_heatmap(self,adc_data_cube:np.ndarray):
+        for seq, results in ready_results:
+            self._send_frame_results(seq, *results)
 
-        #use the appropriate range-azimuth heatmap computation method
-        match self.AoA_method:
-            case "FFT":
-                return self._compute_normalized_range_azimuth_heatmap_FFT(adc_data_cube)
-            case "Bartlet":
-                return self._compute_normalized_range_azimuth_heatmap_bartlet(adc_data_cube)
-            case "Capon":
-                return self._compute_normalized_range_azimuth_heatmap_capon(adc_data_cube)
+        # keep the workers busy
+        self._submit_queued_frames()
 
-    def _compute_normalized_range_azimuth_heatmap_FFT(
-        self, adc_data_cube: np.ndarray
-    ):
-        frame_range_az_heatmaps = np.zeros(
-            (self.max_range_bin, self.num_angle_bins, self.num_chirps_to_save)
-        )
+    def _report_frame_processor_worker_failures(self):
+        """Report the frame processor pool workers that exited unexpectedly (the pool restarts them
+        and drops the frames they were processing)"""
 
-        for i in range(self.num_chirps_to_save):
-            frame_range_az_heatmaps[
-                :, :, i
-            ] = self._compute_chirp_normalized_range_azimuth_heatmap_FFT(
-                adc_data_cube, chirp=i
+        for worker_idx, exitcode in self.frame_processor_pool.pop_worker_failures():
+            self._conn_send_message_to_print(
+                "DCA1000Processor: frame processor worker {} exited unexpectedly (exit code {}), restarted it".format(
+                    worker_idx, exitcode
+                )
             )
+            self._conn_send_parent_error_message()
 
-        return frame_range_az_heatmaps
-    
-
-    def _compute_chirp_normalized_range_azimuth_heatmap_FFT(
-        self, adc_data_cube: np.ndarray, chirp=0
+    def _get_frame_stats(self):
+        frame_stats = super()._get_frame_stats()
+
+        # frames that the streamer overwrote before they could be processed
+        frame_stats["num_frames_overwritten"] = self.num_overwritten_frames
+        if self.frame_processor_pool:
+            frame_stats[
+                "num_frames_overwritten"
+            ] += self.frame_processor_pool.num_overwritten_frames
+            frame_stats[
+                "num_frames_in_workers"
+            ] = self.frame_processor_pool.num_pending_frames
+            frame_stats[
+                "num_frames_dropped_workers"
+            ] = self.frame_processor_pool.num_dropped_frames
+        if self._RadCloudModel_in_use():
+            frame_stats[
+                "num_frames_skipped_RadCloudModel"
+            ] = self.num_frames_skipped_RadCloudModel
+            frame_stats["RadCloudModel_latency_frames"] = self.RadCloudModel_latency_frames
+
+        return frame_stats
+
+    def _send_frame_results(
+        self,
+        frame_number: int,
+        adc_data_cube: np.ndarray,
+        range_azimuth_response: np.ndarray,
+        range_doppler_response: np.ndarray,
+        point_cloud: np.ndarray = None,
     ):
-        """Compute the range azimuth heatmap for a single chirp in the raw ADC data frame
+        """Send a processed frame to the listeners and to the RadCloud model (if enabled). The point
+        clouds from the RadCloud model are sent to the PointCloud listener once they are received
+        (see _process_RadCloudModel_results())
 
         Args:
-            adc_data_cube (np.ndarray): _description_
-            chirp (int, optional): _description_. Defaults to 0.
-
-        Returns:
-            np.ndarray: the computed range-azimuth heatmap (normalized and thresholded)
+            frame_number (int): the frame (sequence) number
+            adc_data_cube (np.ndarray): the ADC data cube (None if not needed by the listeners)
+            range_azimuth_response (np.ndarray): the normalized range-azimuth response (None if not needed)
+            range_doppler_response (np.ndarray): the normalized range-doppler response (None if not needed)
+            point_cloud (np.ndarray, optional): the CFAR point cloud. Defaults to None.
         """
 
-        # get range angle cube
-        data = np.zeros((self.samples_per_chirp, self.num_angle_bins), dtype=complex)
-        data[:, 0 : self.num_az_antennas] = np.transpose(adc_data_cube[:, :, chirp])
-
-        # compute Range FFT
-        data = np.fft.fftshift(np.fft.fft(data, axis=0))
-
-        # compute azimuth response
-        data = 20 * np.log10(np.abs(np.fft.fftshift(np.fft.fft(data, axis=-1))))
-
-        # [for debugging] to get an idea of what the max should be
-        max_db = np.max(data)
-
-        # filter to only output the desired ranges
-        data = data[: self.max_range_bin, :]
-
-        # perform thresholding on the input data
-        data[data <= self.rng_az_power_range_dB_FFT[0]] = self.rng_az_power_range_dB_FFT[0]
-        data[data >= self.rng_az_power_range_dB_FFT[1]] = self.rng_az_power_range_dB_FFT[1]
+        self._last_frame_number = frame_number
+        if self._RadCloudModel_in_use():
+            self._conn_send_RadCloudModel_frame(frame_number, range_azimuth_response)
 
-        # normalize the data
-        data = (data - self.rng_az_power_range_dB_FFT[0]) / (
-            self.rng_az_power_range_dB_FFT[1] - self.rng_az_power_range_dB_FFT[0]
+        self._conn_send_data_to_listeners(
+            frame_number,
+            adc_data_cube,
+            range_azimuth_response,
+            range_doppler_response,
+            point_cloud,
         )
+        return
 
-        return data
-    
-    def _compute_normalized_range_azimuth_heatmap_bartlet(
-        self, adc_data_cube: np.ndarray
-    ):
-        """Compute the normalized range-azimuth heatmap using the bartlet method
-
-        Args:
-            adc_data_cube (np.ndarray): num_Rx_antennas x num_adc_samples x num_chirps ADC data cube
+    def _RadCloudModel_in_use(self):
+        """Check if the point clouds are generated by the RadCloud model
 
         Returns:
-            np.ndarray: num_range_bins x num_angle_bins x 1 range-azimuth response using bartlet method
+            bool: True if the RadCloud model is connected and point_cloud_method is "RadCloudModel"
         """
-        #get the ADC data cube into the correct format
-        adc_data_cube = np.transpose(adc_data_cube,axes=(1,0,2))
-        
-        #compute the range FFT
-        rng_fft = np.fft.fft(adc_data_cube,axis=0)
-
-        L_rng_bins = np.shape(adc_data_cube)[0]
-        I_angle_bins = self.num_angle_bins
-        p_bartlet = np.zeros(
-            shape=(L_rng_bins,I_angle_bins),dtype=np.complex_)
-        
-        for l in range(L_rng_bins):
-            # x_n = np.transpose(rng_fft[l,:,:,np.newaxis],axes=(1,0,2))
-            x_n = np.expand_dims(np.transpose(rng_fft[l,:,:]),axis=-1) #NxMx1
-            x_n_h = np.conj(np.transpose(x_n,axes=(0,2,1)))
-
-            Rxx = np.mean(np.matmul(x_n,x_n_h),axis=0)
-
-            p = self.a_phi_H @ Rxx @ self.a_phi
-
-            p_bartlet[l,:] = p[:,0,0]
-
-        #convert to dB
-        p_bartlet = 20 * np.log10(np.abs(p_bartlet))
-
-        # filter to only output the desired ranges
-        p_bartlet = p_bartlet[: self.max_range_bin, :]
-
-        # perform thresholding on the input data
-        p_bartlet[p_bartlet <= self.rng_az_power_range_dB_Bartlet[0]] = self.rng_az_power_range_dB_Bartlet[0]
-        p_bartlet[p_bartlet >= self.rng_az_power_range_dB_Bartlet[1]] = self.rng_az_power_range_dB_Bartlet[1]
-
-        # normalize the data
-        p_bartlet = (p_bartlet - self.rng_az_power_range_dB_Bartlet[0]) / (
-            self.rng_az_power_range_dB_Bartlet[1] - self.rng_az_power_range_dB_Bartlet[0]
+        return bool(self._conn_RadCloudModel_enabled) and (
+            self.point_cloud_method == "RadCloudModel"
         )
-        
-        #expand the dimmentsions to align with the other formats
-        p_bartlet = np.expand_dims(p_bartlet,axis=-1)
-        return p_bartlet
-    
-    def _compute_normalized_range_azimuth_heatmap_capon(
-        self, adc_data_cube: np.ndarray
+
+    def _conn_send_RadCloudModel_frame(
+        self, frame_number: int, range_azimuth_response: np.ndarray
     ):
-        """Compute the normalized range-azimuth heatmap using the Capon method
+        """Send a range-azimuth response to the RadCloud model without waiting for its point cloud.
+        The frame is skipped if max_frames_in_flight frames (including frames from a previous stream)
+        are already waiting on the model
 
         Args:
-            adc_data_cube (np.ndarray): num_Rx_antennas x num_adc_samples x num_chirps ADC data cube
-
-        Returns:
-            np.ndarray: num_range_bins x num_angle_bins x 1 range-azimuth response using capon method
+            frame_number (int): the frame (sequence) number
+            range_azimuth_response (np.ndarray): the normalized range-azimuth response
         """
-        #get the ADC data cube into the correct format
-        adc_data_cube = np.transpose(adc_data_cube,axes=(1,0,2))
-        
-        #compute the range FFT
-        rng_fft = np.fft.fft(adc_data_cube,axis=0)
 
-        L_rng_bins = np.shape(adc_data_cube)[0]
-        I_angle_bins = self.num_angle_bins
-        p_capon = np.zeros(
-            shape=(L_rng_bins,I_angle_bins),dtype=np.complex_)
-        
-        for l in range(L_rng_bins):
-            # x_n = np.transpose(rng_fft[l,:,:,np.newaxis],axes=(1,0,2))
-            x_n = np.expand_dims(np.transpose(rng_fft[l,:,:]),axis=-1) #NxMx1
-            x_n_h = np.conj(np.transpose(x_n,axes=(0,2,1)))
+        if (
+            len(self._RadCloudModel_frames_in_flight)
+            + self._RadCloudModel_num_stale_results
+            >= self.RadCloudModel_max_frames_in_flight
+        ):
+            self.num_frames_skipped_RadCloudModel += 1
+            return
 
-            Rxx = np.mean(np.matmul(x_n,x_n_h),axis=0)
-            Rxx_inv = np.linalg.inv(Rxx)
-
-            p = self.a_phi_H @ Rxx_inv @ self.a_phi
-
-            p_capon[l,:] = 1.0 / p[:,0,0]
+        try:
+            self._conn_RadCloudModel.send(range_azimuth_response)
+            self._RadCloudModel_frames_in_flight.append(frame_number)
+        except ConnectionResetError:
+            self._conn_send_message_to_print(
+                "DCA1000 Processor._conn_send_RadCloudModel_frame: Error sending to RadCloud Model"
+            )
+            self._conn_send_parent_error_message()
+            self.streaming_enabled = False
 
-        #convert to dB
-        p_capon = 20 * np.log10(np.abs(p_capon))
+    def _process_RadCloudModel_results(self):
+        """Receive the point clouds generated by the RadCloud model (in the order that the frames
+        were sent) and send them to the PointCloud listener"""
 
-        # filter to only output the desired ranges
-        p_capon = p_capon[: self.max_range_bin, :]
+        try:
+            while (
+                self._RadCloudModel_frames_in_flight
+                or self._RadCloudModel_num_stale_results
+            ) and self._conn_RadCloudModel.poll():
+                point_cloud = np.float32(self._conn_RadCloudModel.recv())
 
-        # perform thresholding on the input data
-        p_capon[p_capon <= self.rng_az_power_range_dB_Capon[0]] = self.rng_az_power_range_dB_Capon[0]
-        p_capon[p_capon >= self.rng_az_power_range_dB_Capon[1]] = self.rng_az_power_range_dB_Capon[1]
+                # the frames sent before streaming was restarted are answered first
+                if self._RadCloudModel_num_stale_results:
+                    self._RadCloudModel_num_stale_results -= 1
+                    continue
 
-        # normalize the data
-        p_capon = (p_capon - self.rng_az_power_range_dB_Capon[0]) / (
-            self.rng_az_power_range_dB_Capon[1] - self.rng_az_power_range_dB_Capon[0]
-        )
-        
-        #expand the dimmentsions to align with the other formats
-        p_capon = np.expand_dims(p_capon,axis=-1)
-        return p_capon
+                frame_number = self._RadCloudModel_frames_in_flight.popleft()
+                self.RadCloudModel_latency_frames = self._last_frame_number - frame_number
+                self._conn_send_point_cloud(frame_number, point_cloud)
+        except EOFError:
+            self._conn_send_message_to_print(
+                "DCA1000 Processor._process_RadCloudModel_results: Error receiving from RadCloud Model"
+            )
+            self._conn_send_parent_error_message()
+            self._RadCloudModel_frames_in_flight.clear()
+            self._RadCloudModel_num_stale_results = 0
+            self.streaming_enabled = False
 
-    def _compute_normalized_range_doppler_response(self, adc_data_cube: np.ndarray):
-        # get the data from a single antenna
-        data = adc_data_cube[0, :, :]
+    def _conn_send_point_cloud(self, frame_number: int, point_cloud: np.ndarray):
+        """Send a point cloud to the PointCloud listener (if enabled) as a (frame number, point cloud)
+        tuple, since the RadCloud model point clouds arrive after the other outputs of their frame
 
-        # compute range FFT
-        data = np.fft.fftshift(np.fft.fft(data, axis=0))
+        Args:
+            frame_number (int): the frame (sequence) number that the point cloud was generated from
+            point_cloud (np.ndarray): the point cloud
+        """
 
-        # compute doppler FFT
-        data = 20 * np.log10(np.abs(np.fft.fftshift(np.fft.fft(data, axis=1))))
+        if self._listeners_enabled and self._conn_PointCloud_enabled:
+            try:
+                self._conn_PointCloud.send((frame_number, point_cloud))
+            except ConnectionResetError:
+                self._conn_send_message_to_print(
+                    "DCA1000 Processor._conn_send_point_cloud: the PointCloud listener was already closed or reset"
+                )
+                self._conn_send_parent_error_message()
+                self.streaming_enabled = False
 
-        max_db = np.max(data)
+    def _conn_send_data_to_listeners(
+        self,
+        frame_number: int,
+        adc_data_cube: np.ndarray,
+        range_azimuth_response: np.ndarray,
+        range_doppler_response: np.ndarray,
+        point_cloud: np.ndarray,
+    ):
+        if self._listeners_enabled:
+            # send ADC data cube
+            try:
+                if self._conn_ADCDataCube_enabled:
+                    self._send_to_listener(
+                        "ADCDataCube", self._conn_ADCDataCube, adc_data_cube, frame_number
+                    )
+                if self._conn_NormRngAzResp_enabled:
+                    self._send_to_listener(
+                        "NormRngAzResp",
+                        self._conn_NormRngAzResp,
+                        range_azimuth_response,
+                        frame_number,
+                    )
+                if self._conn_NormRngDopResp_enabled:
+                    self._send_to_listener(
+                        "NormRngDopResp",
+                        self._conn_NormRngDopResp,
+                        range_doppler_response,
+                        frame_number,
+                    )
+                # point clouds from the RadCloud model are sent once they are received
+                if self._conn_PointCloud_enabled and not self._RadCloudModel_in_use():
+                    self._conn_PointCloud.send((frame_number, point_cloud))
+            except ConnectionResetError:
+                self._conn_send_message_to_print(
+                    "DCA1000 Processor.__conn_send_data_to_listeners: A listener was already closed or reset"
+                )
+                self._conn_send_parent_error_message()
+                self.streaming_enabled = False
 
-        # filter to only the desired output ranges
-        data = data[: self.max_range_bin, :]
+    def _send_to_listener(
+        self, listener_name: str, conn: Connection, data: np.ndarray, frame_number: int
+    ):
+        """Send an output to a listener using the configured transport
 
-        # TODO implement thresholding
-        # perform thresholding on the input data
-        data[data <= self.rng_dop_poer_range_dB[0]] = self.rng_dop_poer_range_dB[0]
-        data[data >= self.rng_dop_poer_range_dB[1]] = self.rng_dop_poer_range_dB[1]
+        Args:
+            listener_name (str): the listener (ex: "ADCDataCube")
+            conn (Connection): the listener connection (used for the pipe transport)
+            data (np.ndarray): the output to send
+            frame_number (int): the frame number of the output
+        """
 
-        # normalize the data
-        data = (data - self.rng_dop_poer_range_dB[0]) / (
-            self.rng_dop_poer_range_dB[1] - self.rng_dop_poer_range_dB[0]
-        )
+        if self.listener_transport != "shared_memory":
+            conn.send(data)
+            return
+
+        # (re)create the segment when the output no longer fits (ex: after a new config is loaded)
+        publisher = self._listener_publishers.get(listener_name)
+        if publisher is None or publisher.capacity < data.nbytes:
+            if publisher:
+                publisher.close()
+            publisher = SharedMemoryPublisher(
+                name=self._get_listener_segment_name(listener_name),
+                capacity=data.nbytes,
+            )
+            self._listener_publishers[listener_name] = publisher
 
-        return data
+        publisher.publish(data, frame_number)
@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class _Beamformer:
+    BARTLET = "Bartlet"
+    CAPON = "Capon"
+
+    def __init__(
+        self,
+        num_antennas: int,
+        angle_bins: np.ndarray,
+        method: str = BARTLET,
+        diagonal_loading: float = 1e-3,
+    ):
+        """Batched Bartlet/Capon angle of arrival estimation for a linear array with
+        lambda/2 spacing between elements. The covariance of every range bin is computed
+        at once and all spatial signatures are evaluated in a single contraction
+
+        Args:
+            num_antennas (int): number of (virtual) azimuth antennas
+            angle_bins (np.ndarray): the angles (in radians) to evaluate the response at
+            method (str, optional): _Beamformer.BARTLET or _Beamformer.CAPON. Defaults to _Beamformer.BARTLET.
+            diagonal_loading (float, optional): (Capon only) value added to the covariance diagonal
+                relative to the average power per antenna so that the covariances can always be
+                inverted. Defaults to 1e-3.
+        """
+
+        if method not in (_Beamformer.BARTLET, _Beamformer.CAPON):
+            raise ValueError("_Beamformer: method {} not recognized".format(method))
+        self.method = method
+
+        self.num_antennas = int(num_antennas)
+        self.angle_bins = np.asarray(angle_bins)
+        self.diagonal_loading = diagonal_loading
+
+        # num_angle_bins x num_antennas spatial signatures
+        self.a_phi = self.compute_spatial_signatures(self.num_antennas, self.angle_bins)
+        self.a_phi_H = np.conj(self.a_phi)
+
+        return
+
+    @staticmethod
+    def compute_spatial_signatures(num_antennas: int, angles_rad: np.ndarray):
+        """Compute the spatial signatures for a linear array geometry with lambda/2 spacing between elements
+
+        Args:
+            num_antennas (int): number of antennas in the array
+            angles_rad (np.ndarray): Array of angles to compute the spatial signatures at
+
+        Returns:
+            np.ndarray: num_angle_bins x num_antennas array of spatial signatures
+        """
+        indicies = np.arange(0, num_antennas, dtype=np.float32)
+        return np.exp(1j * np.pi * np.outer(np.sin(angles_rad), indicies))
+
+    def compute_covariances(self, rng_fft: np.ndarray):
+        """Compute the spatial covariance matrix of each range bin (averaged over chirps)
+
+        Args:
+            rng_fft (np.ndarray): num_antennas x num_range_bins x num_chirps range FFT
+
+        Returns:
+            np.ndarray: num_range_bins x num_antennas x num_antennas covariance matricies
+        """
+        num_chirps = rng_fft.shape[-1]
+
+        # accumulate in double precision so that nulls are not lost to rounding
+        return (
+            np.einsum(
+                "mln,kln->lmk",
+                rng_fft,
+                np.conj(rng_fft),
+                dtype=np.complex128,
+                optimize=True,
+            )
+            / num_chirps
+        )
+
+    def compute_response(self, rng_fft: np.ndarray):
+        """Compute the (complex) range-azimuth response
+
+        Args:
+            rng_fft (np.ndarray): num_antennas x num_range_bins x num_chirps range FFT
+
+        Returns:
+            np.ndarray: num_range_bins x num_angle_bins range-azimuth response
+        """
+        Rxx = self.compute_covariances(rng_fft)
+
+        if self.method == _Beamformer.BARTLET:
+            return self._evaluate_spatial_signatures(Rxx)
+        else:
+            # invert all of the covariances as a single batch
+            loading = (
+                self.diagonal_loading
+                * np.real(np.trace(Rxx, axis1=1, axis2=2))
+                / self.num_antennas
+            )
+            Rxx[:, np.arange(self.num_antennas), np.arange(self.num_antennas)] += loading[
+                :, np.newaxis
+            ]
+            return 1.0 / self._evaluate_spatial_signatures(np.linalg.inv(Rxx))
+
+    def _evaluate_spatial_signatures(self, R: np.ndarray):
+        """Evaluate a^H R a for every range bin and spatial signature
+
+        Args:
+            R (np.ndarray): num_range_bins x num_antennas x num_antennas matricies
+
+        Returns:
+            np.ndarray: num_range_bins x num_angle_bins array
+        """
+        return np.einsum("am,lmk,ak->la", self.a_phi_H, R, self.a_phi, optimize=True)
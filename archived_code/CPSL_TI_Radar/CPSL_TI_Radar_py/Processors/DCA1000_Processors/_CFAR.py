@@ -0,0 +1,280 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from CPSL_TI_Radar.ConfigManager import ConfigManager
+
+
+class _CFAR:
+    # cell averaging (mean of the leading and lagging training cells)
+    CA = "CA"
+    # greatest of/smallest of the leading and lagging training cell means
+    CAGO = "CAGO"
+    CASO = "CASO"
+    # ordered statistic (the os_rank quantile of the training cells)
+    OS = "OS"
+
+    # cfarCfg averaging modes
+    CFG_MODES = {0: CA, 1: CAGO, 2: CASO}
+
+    def __init__(
+        self,
+        num_train: int,
+        num_guard: int,
+        threshold: float,
+        method: str = CA,
+        axis: int = 0,
+        cyclic: bool = False,
+        os_rank: float = 0.75,
+        peak_grouping: bool = False,
+    ):
+        """Vectorized 1D CFAR detector applied along a single axis of a detection matrix
+
+        Args:
+            num_train (int): number of training cells on each side of the cell under test
+            num_guard (int): number of guard cells on each side of the cell under test
+            threshold (float): detection threshold above the noise estimate (same units as the detection matrix)
+            method (str, optional): noise estimate (CA, CAGO, CASO, or OS). Defaults to CA.
+            axis (int, optional): the axis to slide the CFAR window along. Defaults to 0.
+            cyclic (bool, optional): wrap the training cells around the ends of the axis,
+                otherwise only the training cells inside the matrix are used. Defaults to False.
+            os_rank (float, optional): quantile of the training cells used as the noise estimate
+                for OS-CFAR. Defaults to 0.75.
+            peak_grouping (bool, optional): only keep the detected cells that are not smaller than
+                their neighbors along the axis. Defaults to False.
+        """
+
+        if method not in (self.CA, self.CAGO, self.CASO, self.OS):
+            raise ValueError("_CFAR: {} is not a valid CFAR method".format(method))
+
+        self.num_train = int(num_train)
+        self.num_guard = int(num_guard)
+        self.threshold = threshold
+        self.method = method
+        self.axis = axis
+        self.cyclic = cyclic
+        self.os_rank = os_rank
+        self.peak_grouping = peak_grouping
+
+        return
+
+    @classmethod
+    def from_cfarCfg(
+        cls, cfarCfg: dict, num_virtual_antennas: int, method: str = None
+    ):
+        """Create the CFAR detector for one direction of the radar's on-chip detection. Detection
+        matrices must be indexed by [range bin, doppler bin] and contain the mean log2 magnitude
+        across the virtual antennas (see _PointCloudGenerator)
+
+        Args:
+            cfarCfg (dict): one of the radar config's cfarCfg commands (see ConfigManager)
+            num_virtual_antennas (int): number of virtual antennas (num Tx x num Rx)
+            method (str, optional): override the cfarCfg averaging mode (ex: OS).
+                Defaults to None (use the cfarCfg averaging mode).
+
+        Returns:
+            _CFAR: the CFAR detector
+        """
+
+        if method is None:
+            method = cls.CFG_MODES[int(cfarCfg["mode"])]
+
+        # the radar counts each log2 step as 6 dB (see ConfigManager.apply_new_CFAR_threshold)
+        if ConfigManager.CFAR_threshold_in_dB(cfarCfg):
+            threshold_dB = float(cfarCfg["threshold"])
+        else:
+            threshold_dB = ConfigManager.CFAR_threshold_cli_to_dB(
+                int(cfarCfg["threshold"]), num_virtual_antennas
+            )
+
+        return cls(
+            num_train=int(cfarCfg["noiseWindow"]),
+            num_guard=int(cfarCfg["guardLength"]),
+            threshold=threshold_dB / 6,
+            method=method,
+            axis=int(cfarCfg["direction"]),
+            cyclic=bool(int(cfarCfg["cyclic"])),
+            peak_grouping=cfarCfg["peakGrouping"] is not None
+            and bool(int(cfarCfg["peakGrouping"])),
+        )
+
+    def detect(self, det_matrix: np.ndarray):
+        """Detect the cells that exceed the noise estimate by the threshold
+
+        Args:
+            det_matrix (np.ndarray): the detection matrix
+
+        Returns:
+            np.ndarray: boolean mask of the detected cells
+        """
+        detections = det_matrix > self.compute_noise(det_matrix) + self.threshold
+
+        if self.peak_grouping:
+            detections &= self._is_peak(det_matrix)
+
+        return detections
+
+    def _is_peak(self, det_matrix: np.ndarray):
+        """Find the cells that are not smaller than their neighbors along the axis (the cells
+        at the ends of a non-cyclic axis only have one neighbor)"""
+
+        data = np.moveaxis(det_matrix, self.axis, -1)
+        if self.cyclic:
+            padded = np.pad(data, [(0, 0)] * (data.ndim - 1) + [(1, 1)], mode="wrap")
+        else:
+            padded = np.pad(
+                data, [(0, 0)] * (data.ndim - 1) + [(1, 1)], constant_values=-np.inf
+            )
+
+        is_peak = (data >= padded[..., :-2]) & (data >= padded[..., 2:])
+        return np.moveaxis(is_peak, -1, self.axis)
+
+    def compute_noise(self, det_matrix: np.ndarray):
+        """Compute the noise estimate for each cell of a detection matrix
+
+        Args:
+            det_matrix (np.ndarray): the detection matrix
+
+        Returns:
+            np.ndarray: the noise estimate (same shape as det_matrix)
+        """
+
+        # slide the window along the last axis
+        data = np.moveaxis(det_matrix, self.axis, -1)
+
+        if self.method == self.OS:
+            noise = self._compute_noise_OS(data)
+        else:
+            noise = self._compute_noise_CA(data)
+
+        return np.moveaxis(noise, -1, self.axis)
+
+    def _pad(self, data: np.ndarray, pad_value: float):
+        """Pad the last axis by the window size on both ends (wrapping around for cyclic CFAR)"""
+
+        pad_width = [(0, 0)] * (data.ndim - 1) + [(self.num_guard + self.num_train,) * 2]
+        if self.cyclic:
+            return np.pad(data, pad_width, mode="wrap")
+        else:
+            return np.pad(data, pad_width, mode="constant", constant_values=pad_value)
+
+    def _window_sums(self, data: np.ndarray):
+        """Compute the sum of the lagging and leading training cells of each cell using cumulative sums
+
+        Returns:
+            tuple(np.ndarray,np.ndarray): the lagging and leading training cell sums
+        """
+
+        num_cells = data.shape[-1]
+        window = self.num_guard + self.num_train
+
+        padded = self._pad(data, 0)
+        cumsum = np.zeros(padded.shape[:-1] + (padded.shape[-1] + 1,), dtype=np.float64)
+        np.cumsum(padded, axis=-1, out=cumsum[..., 1:])
+
+        # cell i is at i + window in the padded array
+        idx = np.arange(num_cells) + window
+        lagging = cumsum[..., idx - self.num_guard] - cumsum[..., idx - window]
+        leading = cumsum[..., idx + window + 1] - cumsum[..., idx + self.num_guard + 1]
+
+        return lagging, leading
+
+    def _compute_noise_CA(self, data: np.ndarray):
+
+        lagging_sum, leading_sum = self._window_sums(data)
+
+        # number of training cells inside the matrix on each side of each cell
+        lagging_count, leading_count = self._window_sums(
+            np.ones(data.shape[-1], dtype=np.float64)
+        )
+
+        if self.method == self.CA:
+            return (lagging_sum + leading_sum) / np.maximum(
+                lagging_count + leading_count, 1
+            )
+
+        # only use one side at the ends of a non-cyclic axis
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lagging_mean = lagging_sum / lagging_count
+            leading_mean = leading_sum / leading_count
+        lagging_mean = np.where(lagging_count > 0, lagging_mean, leading_mean)
+        leading_mean = np.where(leading_count > 0, leading_mean, lagging_mean)
+
+        if self.method == self.CAGO:
+            return np.maximum(lagging_mean, leading_mean)
+        else:
+            return np.minimum(lagging_mean, leading_mean)
+
+    def _compute_noise_OS(self, data: np.ndarray):
+
+        window_size = 2 * (self.num_guard + self.num_train) + 1
+        train_idx = np.r_[0 : self.num_train, window_size - self.num_train : window_size]
+
+        # sorted training cells of each cell (cells outside of a non-cyclic axis are sorted last)
+        windows = sliding_window_view(self._pad(data, np.inf), window_size, axis=-1)
+        training_cells = np.sort(windows[..., train_idx], axis=-1)
+
+        # rank of the noise estimate among the training cells inside the matrix
+        inside = np.isfinite(self._pad(np.zeros(data.shape[-1]), np.inf))
+        num_training_cells = np.sum(
+            sliding_window_view(inside, window_size)[:, train_idx], axis=-1
+        )
+        rank = np.round(self.os_rank * (num_training_cells - 1)).astype(int)
+
+        return np.take_along_axis(
+            training_cells,
+            np.broadcast_to(rank[:, np.newaxis], training_cells.shape[:-1] + (1,)),
+            axis=-1,
+        )[..., 0]
+
+
+class _CFARDetector:
+    def __init__(self, cfars: list):
+        """Two pass CFAR detection like the radar's on-chip detection: a cell is detected
+        when it is detected by the CFAR along every direction (ex: range and doppler)
+
+        Args:
+            cfars (list): the _CFAR detector of each direction
+        """
+
+        self.cfars = cfars
+
+        return
+
+    @classmethod
+    def from_cfarCfg(
+        cls, cfarCfgs: list, num_virtual_antennas: int, method: str = None
+    ):
+        """Create a CFAR detector that matches the radar's on-chip detection (see _CFAR.from_cfarCfg())
+
+        Args:
+            cfarCfgs (list): the radar config's cfarCfg commands, one for each direction (see ConfigManager)
+            num_virtual_antennas (int): number of virtual antennas (num Tx x num Rx)
+            method (str, optional): override the cfarCfg averaging modes (ex: OS).
+                Defaults to None (use the cfarCfg averaging modes).
+
+        Returns:
+            _CFARDetector: the CFAR detector
+        """
+
+        return cls(
+            [
+                _CFAR.from_cfarCfg(cfarCfg, num_virtual_antennas, method)
+                for cfarCfg in cfarCfgs
+            ]
+        )
+
+    def detect(self, det_matrix: np.ndarray):
+        """Detect the cells that pass the CFAR of every direction
+
+        Args:
+            det_matrix (np.ndarray): the detection matrix
+
+        Returns:
+            np.ndarray: boolean mask of the detected cells
+        """
+
+        detections = np.ones(det_matrix.shape, dtype=bool)
+        for cfar in self.cfars:
+            detections &= cfar.detect(det_matrix)
+
+        return detections
@@ -0,0 +1,636 @@
+from multiprocessing import Process, Pipe
+from multiprocessing.connection import Connection
+from collections import deque
+import numpy as np
+
+from CPSL_TI_Radar._Shared_Frame_Ring import _SharedFrameRing
+from CPSL_TI_Radar.utilities.ADC_Decoder import ADCDecoder
+from CPSL_TI_Radar.Processors.DCA1000_Processors._Beamformer import _Beamformer
+from CPSL_TI_Radar.Processors.DCA1000_Processors._CFAR import _CFARDetector
+from CPSL_TI_Radar.Processors.DCA1000_Processors._Point_Cloud_Generator import (
+    _PointCloudGenerator,
+)
+from CPSL_TI_Radar.Processors.DCA1000_Processors._Processing_Context import (
+    _ProcessingContext,
+)
+
+
+class FrameProducts:
+    ADC_DATA_CUBE = "ADCDataCube"
+    RANGE_FFT = "RangeFFT"
+    NORM_RNG_AZ_RESP = "NormRngAzResp"
+    NORM_RNG_DOP_RESP = "NormRngDopResp"
+    RANGE_DOPPLER_FFT = "RangeDopplerFFT"
+    POINT_CLOUD = "PointCloud"
+
+    # products that can be requested from a _FrameProcessor (in the order that they are returned)
+    OUTPUTS = (ADC_DATA_CUBE, NORM_RNG_AZ_RESP, NORM_RNG_DOP_RESP, POINT_CLOUD)
+
+
+class _FrameProcessor:
+    def __init__(self, frame_config: dict):
+        """Computes the ADC data cube, range-azimuth response, and range-doppler response
+        for a single raw DCA1000 frame. All buffers are allocated up front and re-used for each frame
+
+        Args:
+            frame_config (dict): the processing parameters for the current radar config
+                (see DCA1000Processor._get_frame_config()) with entries for:
+                rx_channels, num_az_antennas, virtual_antennas_enabled, samples_per_chirp,
+                total_chirps_per_frame, chirp_loops_per_frame, num_chirps_to_save, max_range_bin,
+                num_angle_bins, angle_bins, AoA_method, adc_data_format, range_window,
+                capon_diagonal_loading, rng_az_power_range_dB, rng_dop_power_range_dB, range_res,
+                vel_res, cfarCfg (list of cfarCfg commands, None if point clouds are not generated), CFAR_method, and
+                products (optional, the FrameProducts.OUTPUTS to compute, defaults to all of the
+                products that the config supports)
+        """
+
+        self.frame_config = frame_config
+
+        self.rx_channels = frame_config["rx_channels"]
+        self.num_az_antennas = frame_config["num_az_antennas"]
+        self.virtual_antennas_enabled = frame_config["virtual_antennas_enabled"]
+        self.AoA_method = frame_config["AoA_method"]
+        self.rng_az_power_range_dB = frame_config["rng_az_power_range_dB"]
+        self.rng_dop_power_range_dB = frame_config["rng_dop_power_range_dB"]
+
+        # pre-allocate the decoded ADC data cubes
+        self.adc_decoder = ADCDecoder(
+            num_rx=self.rx_channels,
+            samples_per_chirp=frame_config["samples_per_chirp"],
+            chirps_per_frame=frame_config["total_chirps_per_frame"],
+            data_format=frame_config["adc_data_format"],
+        )
+        self._adc_data_cube = self.adc_decoder.allocate(num_frames=1)
+        if self.virtual_antennas_enabled:
+            self._virtual_array_data_cube = np.empty(
+                shape=(
+                    self.num_az_antennas,
+                    frame_config["samples_per_chirp"],
+                    frame_config["chirp_loops_per_frame"],
+                ),
+                dtype=np.complex64,
+            )
+        else:
+            self._virtual_array_data_cube = None
+
+        # pre-allocated workspaces and FFT plans
+        self.processing_context = _ProcessingContext(
+            num_antennas=self.num_az_antennas
+            if self.virtual_antennas_enabled
+            else self.rx_channels,
+            samples_per_chirp=frame_config["samples_per_chirp"],
+            num_chirps=frame_config["chirp_loops_per_frame"]
+            if self.virtual_antennas_enabled
+            else frame_config["total_chirps_per_frame"],
+            num_chirps_to_save=frame_config["num_chirps_to_save"],
+            max_range_bin=frame_config["max_range_bin"],
+            num_angle_bins=frame_config["num_angle_bins"],
+            range_window=frame_config["range_window"],
+        )
+
+        # batched bartlet/capon engine
+        if self.AoA_method in (_Beamformer.BARTLET, _Beamformer.CAPON):
+            self.beamformer = _Beamformer(
+                num_antennas=self.num_az_antennas,
+                angle_bins=frame_config["angle_bins"],
+                method=self.AoA_method,
+                diagonal_loading=frame_config["capon_diagonal_loading"],
+            )
+        else:
+            self.beamformer = None
+
+        # CFAR point cloud generation (matching the radar's on-chip detection)
+        if frame_config["cfarCfg"]:
+            self.point_cloud_generator = _PointCloudGenerator(
+                cfar=_CFARDetector.from_cfarCfg(
+                    frame_config["cfarCfg"],
+                    num_virtual_antennas=self.processing_context.num_antennas,
+                    method=frame_config["CFAR_method"],
+                ),
+                range_res=frame_config["range_res"],
+                vel_res=frame_config["vel_res"],
+                num_angle_bins=frame_config["num_angle_bins"],
+            )
+        else:
+            self.point_cloud_generator = None
+
+        # each product is computed (at most once per frame) from its source products,
+        # and only when a requested product depends on it
+        self._product_graph = {
+            FrameProducts.RANGE_FFT: (
+                self.processing_context.compute_range_fft,
+                [FrameProducts.ADC_DATA_CUBE],
+            ),
+            FrameProducts.NORM_RNG_AZ_RESP: (
+                self._compute_normalized_range_azimuth_heatmap,
+                [FrameProducts.RANGE_FFT],
+            ),
+            FrameProducts.NORM_RNG_DOP_RESP: (
+                self._compute_normalized_range_doppler_response,
+                [FrameProducts.RANGE_FFT],
+            ),
+            FrameProducts.RANGE_DOPPLER_FFT: (
+                self.processing_context.compute_range_doppler_fft,
+                [FrameProducts.RANGE_FFT],
+            ),
+        }
+        if self.point_cloud_generator:
+            self._product_graph[FrameProducts.POINT_CLOUD] = (
+                self.point_cloud_generator.generate,
+                [FrameProducts.RANGE_DOPPLER_FFT],
+            )
+        self._frame_products = {}
+        self.products = set()
+
+        # point clouds can only be computed when the config has a cfarCfg
+        default_products = [
+            product
+            for product in FrameProducts.OUTPUTS
+            if product != FrameProducts.POINT_CLOUD or self.point_cloud_generator
+        ]
+        self.set_products(frame_config.get("products", default_products))
+
+        return
+
+    def set_products(self, products):
+        """Set the products that are computed for each frame
+
+        Args:
+            products (iterable): the FrameProducts.OUTPUTS to compute
+        """
+
+        for product in products:
+            if product not in FrameProducts.OUTPUTS:
+                raise ValueError(
+                    "_FrameProcessor.set_products: {} is not a valid product".format(
+                        product
+                    )
+                )
+            if (
+                product == FrameProducts.POINT_CLOUD
+                and self.point_cloud_generator is None
+            ):
+                raise ValueError(
+                    "_FrameProcessor.set_products: point clouds require a cfarCfg"
+                )
+
+        self.products = set(products)
+
+    def process_frame(self, frame_bytes):
+        """Decode a raw frame and compute the requested products
+
+        Args:
+            frame_bytes (bytes-like or np.ndarray): the raw frame
+
+        Returns:
+            tuple(np.ndarray,np.ndarray,np.ndarray,np.ndarray): the ADC data cube, normalized
+                range-azimuth response, normalized range-doppler response (re-used for each frame),
+                and point cloud (None for products that were not requested)
+        """
+        return self.compute_products(self.decode_frame(frame_bytes))
+
+    def decode_frame(self, frame_bytes):
+        """Generate the raw ADC data cube from a raw frame
+
+        Args:
+            frame_bytes (bytes-like or np.ndarray): the raw frame
+
+        Returns:
+            np.ndarray: the raw ADC data cube indexed by [rx_channel, sample, chirp]
+                (re-used for each frame)
+        """
+
+        # decode directly into the pre-allocated cube and index as [rx channel, sample, chirp]
+        adc_data_cube = self.adc_decoder.decode(frame_bytes, out=self._adc_data_cube)[0]
+
+        if self.virtual_antennas_enabled:
+            # chirps alternate between tx 1 and tx 2
+            self._virtual_array_data_cube[0 : self.rx_channels, :, :] = adc_data_cube[
+                :, :, 0::2
+            ]
+            self._virtual_array_data_cube[self.rx_channels :, :, :] = adc_data_cube[
+                :, :, 1::2
+            ]
+
+            return self._virtual_array_data_cube
+        else:
+            return adc_data_cube
+
+    def compute_products(self, adc_data_cube: np.ndarray):
+        """Compute the requested products of an ADC data cube
+
+        Args:
+            adc_data_cube (np.ndarray): num_Rx_antennas x num_adc_samples x num_chirps ADC data cube
+
+        Returns:
+            tuple(np.ndarray,np.ndarray,np.ndarray,np.ndarray): the ADC data cube, normalized
+                range-azimuth response, normalized range-doppler response (re-used for each frame),
+                and point cloud (None for products that were not requested)
+        """
+
+        self._frame_products = {FrameProducts.ADC_DATA_CUBE: adc_data_cube}
+
+        return tuple(
+            self._get_product(product) if product in self.products else None
+            for product in FrameProducts.OUTPUTS
+        )
+
+    def compute_responses(self, adc_data_cube: np.ndarray):
+        """Compute the requested normalized range-azimuth and range-doppler responses of an ADC data cube
+
+        Args:
+            adc_data_cube (np.ndarray): num_Rx_antennas x num_adc_samples x num_chirps ADC data cube
+
+        Returns:
+            tuple(np.ndarray,np.ndarray): the normalized range-azimuth response and
+                the normalized range-doppler response (re-used for each frame,
+                None if not requested)
+        """
+        return self.compute_products(adc_data_cube)[1:3]
+
+    def _get_product(self, product: str):
+        """Get a product of the current frame, computing it (and the products it depends on) if needed
+
+        Args:
+            product (str): the product (see FrameProducts)
+
+        Returns:
+            np.ndarray: the product
+        """
+
+        if product not in self._frame_products:
+            compute, sources = self._product_graph[product]
+            self._frame_products[product] = compute(
+                *[self._get_product(source) for source in sources]
+            )
+
+        return self._frame_products[product]
+
+    def _compute_normalized_range_azimuth_heatmap(self, rng_fft: np.ndarray):
+
+        # use the appropriate range-azimuth heatmap computation method
+        match self.AoA_method:
+            case "FFT":
+                return self._compute_normalized_range_azimuth_heatmap_FFT(rng_fft)
+            case "Bartlet" | "Capon":
+                return self._compute_normalized_range_azimuth_heatmap_beamformer(
+                    rng_fft
+                )
+
+    def _compute_normalized_range_azimuth_heatmap_FFT(self, rng_fft: np.ndarray):
+        """Compute the range azimuth heatmap for each chirp using a single batched angle FFT
+
+        Args:
+            rng_fft (np.ndarray): num_antennas x max_range_bin x num_chirps range FFT
+
+        Returns:
+            np.ndarray: max_range_bin x num_angle_bins x num_chirps_to_save range-azimuth heatmaps
+                (normalized and thresholded)
+        """
+
+        data = self.processing_context.compute_range_azimuth_power_dB(rng_fft)
+
+        return self._normalize_power_dB(data, self.rng_az_power_range_dB)
+
+    def _compute_normalized_range_azimuth_heatmap_beamformer(
+        self, rng_fft: np.ndarray
+    ):
+        """Compute the normalized range-azimuth heatmap using the bartlet/capon beamformer
+
+        Args:
+            rng_fft (np.ndarray): num_antennas x max_range_bin x num_chirps range FFT
+
+        Returns:
+            np.ndarray: num_range_bins x num_angle_bins x 1 normalized range-azimuth response
+        """
+
+        # compute the response for all range bins at once and convert to dB
+        p = 20 * np.log10(np.abs(self.beamformer.compute_response(rng_fft)))
+
+        # expand the dimmentsions to align with the other formats
+        return np.expand_dims(
+            self._normalize_power_dB(p, self.rng_az_power_range_dB), axis=-1
+        )
+
+    def _compute_normalized_range_doppler_response(self, rng_fft: np.ndarray):
+        # compute the range-doppler response of a single antenna from the shared range FFT
+        data = self.processing_context.compute_range_doppler_power_dB(rng_fft, antenna=0)
+
+        return self._normalize_power_dB(data, self.rng_dop_power_range_dB)
+
+    @staticmethod
+    def _normalize_power_dB(data: np.ndarray, power_range_dB: list):
+        """Threshold and normalize a power response (in place)
+
+        Args:
+            data (np.ndarray): power response in dB
+            power_range_dB (list): [min,max] power (in dB), powers outside this range are thresholded
+
+        Returns:
+            np.ndarray: the normalized response (values in [0,1])
+        """
+
+        # perform thresholding on the input data
+        np.clip(data, power_range_dB[0], power_range_dB[1], out=data)
+
+        # normalize the data
+        data -= power_range_dB[0]
+        data /= power_range_dB[1] - power_range_dB[0]
+
+        return data
+
+
+def _run_frame_worker(conn: Connection, frame_ring_name: str, frame_config: dict):
+    """Worker process for the _FrameProcessorPool. Receives (slot index, sequence number)
+    messages, processes the frame in the given frame ring slot, and sends back
+    (sequence number, (adc data cube, range-azimuth response, range-doppler response, point cloud)).
+    None is sent back instead of the results when the frame was overwritten before it was read.
+    {"products":[...]} messages change the products that are computed (without a reply)
+
+    Args:
+        conn (Connection): connection to the _FrameProcessorPool
+        frame_ring_name (str): name of the shared frame ring to read frames from
+        frame_config (dict): the processing parameters (see _FrameProcessor)
+    """
+
+    frame_processor = _FrameProcessor(frame_config)
+
+    # attached once the first frame is received (the streamer creates the ring)
+    frame_ring: _SharedFrameRing = None
+
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            elif isinstance(msg, dict):
+                frame_processor.set_products(msg["products"])
+                continue
+
+            slot_idx, seq = msg
+            if frame_ring is None:
+                frame_ring = _SharedFrameRing(name=frame_ring_name)
+
+            adc_data_cube = frame_processor.decode_frame(frame_ring.get_slot(slot_idx))
+
+            # drop the frame if the streamer overwrote the slot while it was being read
+            if not frame_ring.slot_valid(slot_idx, seq):
+                conn.send((seq, None))
+                continue
+
+            conn.send((seq, frame_processor.compute_products(adc_data_cube)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if frame_ring:
+            frame_ring.close()
+        conn.close()
+
+    return
+
+
+class _FrameProcessorPool:
+    def __init__(
+        self,
+        num_workers: int,
+        frame_ring_name: str,
+        frame_config: dict,
+        max_pending_frames: int = None,
+        frame_ring_slots: int = None,
+    ):
+        """Pool of worker processes that process frames from the shared frame ring in
+        parallel. Frames are distributed to the workers round robin and results are
+        returned in frame order
+
+        Args:
+            num_workers (int): number of worker processes
+            frame_ring_name (str): name of the shared frame ring that the streamer writes frames into
+            frame_config (dict): the processing parameters (see _FrameProcessor)
+            max_pending_frames (int, optional): number of frames that can be submitted to the workers
+                before has_capacity is False. Defaults to None (2 frames per worker, limited by frame_ring_slots).
+            frame_ring_slots (int, optional): number of slots in the frame ring. Pending frames are limited to
+                frame_ring_slots - 1 so that the streamer does not overwrite slots the workers are reading.
+                Defaults to None (no limit).
+        """
+
+        self.num_workers = num_workers
+        if max_pending_frames is None:
+            max_pending_frames = 2 * num_workers
+            if frame_ring_slots is not None:
+                max_pending_frames = min(max_pending_frames, frame_ring_slots - 1)
+        self.max_pending_frames = max_pending_frames
+
+        self.frame_ring_name = frame_ring_name
+        self.frame_config = frame_config
+
+        # the products requested by the last set_products() call (sent to restarted workers)
+        self._products = None
+
+        self._conns: list = []
+        self._workers: list = []
+        for i in range(num_workers):
+            self._conns.append(None)
+            self._workers.append(None)
+            self._start_worker(i)
+
+        self._next_worker = 0
+
+        # sequence numbers of the submitted frames (in order) and their results
+        self._pending_seqs = deque()
+        self._results = {}
+
+        # sequence numbers of the frames submitted to each worker that have no results yet
+        self._worker_seqs = [deque() for _ in range(num_workers)]
+
+        # frames that were overwritten before a worker could read them
+        self.num_overwritten_frames = 0
+
+        # frames lost when a worker exited unexpectedly, and the (worker index, exit code) of
+        # the restarted workers that have not been reported yet (see pop_worker_failures())
+        self.num_dropped_frames = 0
+        self._worker_failures = []
+
+        return
+
+    def _start_worker(self, worker_idx: int):
+        """Start (or restart) a worker process
+
+        Args:
+            worker_idx (int): index of the worker to start
+        """
+        conn, conn_worker = Pipe()
+        worker = Process(
+            target=_run_frame_worker,
+            args=(conn_worker, self.frame_ring_name, self.frame_config),
+            daemon=True,
+        )
+        worker.start()
+        conn_worker.close()
+
+        self._conns[worker_idx] = conn
+        self._workers[worker_idx] = worker
+
+        if self._products is not None:
+            conn.send({"products": self._products})
+
+    def _restart_worker(self, worker_idx: int):
+        """Restart a worker that exited unexpectedly. The frames it was processing are dropped
+
+        Args:
+            worker_idx (int): index of the worker that exited
+        """
+        # keep the results the worker sent before it exited
+        self._recv_worker_results(worker_idx)
+
+        worker: Process = self._workers[worker_idx]
+        worker.join(1.0)
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+        self._conns[worker_idx].close()
+        self._worker_failures.append((worker_idx, worker.exitcode))
+
+        # release the frames in order without them
+        while self._worker_seqs[worker_idx]:
+            self._results[self._worker_seqs[worker_idx].popleft()] = False
+            self.num_dropped_frames += 1
+
+        self._start_worker(worker_idx)
+
+    def _recv_worker_results(self, worker_idx: int):
+        """Receive the results available from a worker
+
+        Args:
+            worker_idx (int): index of the worker
+
+        Returns:
+            bool: False if the worker exited (its connection was closed), True otherwise
+        """
+        conn: Connection = self._conns[worker_idx]
+        try:
+            while conn.poll():
+                seq, results = conn.recv()
+                self._worker_seqs[worker_idx].remove(seq)
+                self._results[seq] = results
+        except (EOFError, ConnectionResetError, OSError):
+            return False
+
+        return True
+
+    def pop_worker_failures(self):
+        """Get the workers that exited unexpectedly (and were restarted) since the last call
+
+        Returns:
+            list: (worker index, exit code) for each worker that was restarted
+        """
+        worker_failures = self._worker_failures
+        self._worker_failures = []
+        return worker_failures
+
+    @property
+    def result_conns(self):
+        """connections to wait on for new results (pass a ready connection to recv_results())"""
+        return self._conns
+
+    @property
+    def num_pending_frames(self):
+        return len(self._pending_seqs)
+
+    @property
+    def has_capacity(self):
+        """True if more frames can be submitted without exceeding max_pending_frames"""
+        return len(self._pending_seqs) < self.max_pending_frames
+
+    def set_products(self, products):
+        """Set the products that the workers compute for each frame submitted after this call
+
+        Args:
+            products (iterable): the FrameProducts.OUTPUTS to compute
+        """
+        self._products = list(products)
+        for worker_idx in range(self.num_workers):
+            try:
+                self._conns[worker_idx].send({"products": self._products})
+            except (BrokenPipeError, ConnectionResetError):
+                self._restart_worker(worker_idx)
+
+    def submit(self, slot_idx: int, seq: int):
+        """Send a new frame to the next worker (restarting the worker if it exited)
+
+        Args:
+            slot_idx (int): the frame ring slot containing the frame
+            seq (int): the sequence number of the frame
+        """
+        worker_idx = self._next_worker
+        if self._workers[worker_idx].exitcode is not None:
+            self._restart_worker(worker_idx)
+        try:
+            self._conns[worker_idx].send((slot_idx, seq))
+        except (BrokenPipeError, ConnectionResetError):
+            self._restart_worker(worker_idx)
+            self._conns[worker_idx].send((slot_idx, seq))
+
+        self._next_worker = (self._next_worker + 1) % self.num_workers
+        self._pending_seqs.append(seq)
+        self._worker_seqs[worker_idx].append(seq)
+
+    def recv_results(self, conn: Connection):
+        """Receive the results available on a worker connection. If the worker exited,
+        the frames it was processing are dropped and the worker is restarted
+
+        Args:
+            conn (Connection): the worker connection (from result_conns) with results available
+
+        Returns:
+            list: (seq, (adc data cube, range-azimuth response, range-doppler response, point cloud)) for each
+                frame that is now ready, in frame order (empty if earlier frames are still being processed)
+        """
+
+        # connections of restarted workers are no longer in result_conns
+        if conn in self._conns:
+            worker_idx = self._conns.index(conn)
+            if not self._recv_worker_results(worker_idx):
+                self._restart_worker(worker_idx)
+
+        # release the results in the order that the frames were submitted
+        # (None: overwritten before it was read, False: dropped by a worker that exited)
+        ready_results = []
+        while self._pending_seqs and self._pending_seqs[0] in self._results:
+            seq = self._pending_seqs.popleft()
+            results = self._results.pop(seq)
+            if results is None:
+                self.num_overwritten_frames += 1
+            elif results is not False:
+                ready_results.append((seq, results))
+
+        return ready_results
+
+    def close(self, timeout: float = 1.0):
+        """Stop the worker processes
+
+        Args:
+            timeout (float, optional): time to wait for each worker to exit before
+                terminating it. Defaults to 1.0.
+        """
+
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                pass
+
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+        for conn in self._conns:
+            conn.close()
+
+        self._conns = []
+        self._workers = []
+        self._pending_seqs.clear()
+        self._results.clear()
+        for worker_seqs in self._worker_seqs:
+            worker_seqs.clear()
@@ -0,0 +1,83 @@
+import numpy as np
+
+from CPSL_TI_Radar.Processors.DCA1000_Processors._CFAR import _CFARDetector
+
+
+class _PointCloudGenerator:
+    def __init__(
+        self, cfar: _CFARDetector, range_res: float, vel_res: float, num_angle_bins: int
+    ):
+        """Generates point clouds from raw DCA1000 frames using CFAR detection on the
+        range-doppler map followed by an angle FFT on the detected cells
+
+        Args:
+            cfar (_CFARDetector): CFAR detector (or a single _CFAR) for the [range bin, doppler bin] detection matrix
+            range_res (float): range resolution (m)
+            vel_res (float): velocity resolution (m/s)
+            num_angle_bins (int): number of angle bins for the angle FFT
+        """
+
+        self.cfar = cfar
+        self.range_res = range_res
+        self.vel_res = vel_res
+        self.num_angle_bins = num_angle_bins
+
+        return
+
+    def compute_detection_matrix(self, rng_dop_fft: np.ndarray):
+        """Compute the detection matrix (the mean log2 magnitude across the antennas, like the radar's
+        on-chip detection matrix)
+
+        Args:
+            rng_dop_fft (np.ndarray): num_antennas x num_range_bins x num_chirps range-doppler FFT
+                (zero velocity bin at index 0)
+
+        Returns:
+            np.ndarray: num_range_bins x num_chirps detection matrix (zero velocity bin at the center)
+        """
+
+        magnitude = np.abs(rng_dop_fft)
+        np.maximum(magnitude, np.finfo(np.float32).tiny, out=magnitude)
+        np.log2(magnitude, out=magnitude)
+
+        return np.fft.fftshift(np.mean(magnitude, axis=0), axes=1)
+
+    def generate(self, rng_dop_fft: np.ndarray):
+        """Detect the objects in a frame
+
+        Args:
+            rng_dop_fft (np.ndarray): num_antennas x num_range_bins x num_chirps range-doppler FFT
+                (zero velocity bin at index 0, see _ProcessingContext.compute_range_doppler_fft())
+
+        Returns:
+            np.ndarray: num_objects x 4 array of [x,y,z,vel] points (float32, same format as
+                _PointCloudTLVProcessor)
+        """
+
+        num_chirps = rng_dop_fft.shape[2]
+
+        range_idxs, vel_idxs = np.nonzero(
+            self.cfar.detect(self.compute_detection_matrix(rng_dop_fft))
+        )
+
+        # angle FFT of each detected cell (vel_idxs have the zero velocity bin at the center)
+        snapshots = rng_dop_fft[
+            :, range_idxs, np.fft.fftshift(np.arange(num_chirps))[vel_idxs]
+        ]
+        angle_fft = np.fft.fft(snapshots, n=self.num_angle_bins, axis=0)
+        angle_idxs = np.argmax(np.abs(angle_fft), axis=0)
+
+        # convert the peak spatial frequencies to angles (positive angles have negative phase shifts)
+        phase_shifts = 2 * np.pi * np.fft.fftfreq(self.num_angle_bins)[angle_idxs]
+        sin_thetas = np.clip(-phase_shifts / np.pi, -1, 1)
+
+        ranges = range_idxs * self.range_res
+        vels = (vel_idxs - num_chirps // 2) * self.vel_res
+
+        points = np.empty(shape=(range_idxs.size, 4), dtype=np.float32)
+        points[:, 0] = ranges * sin_thetas
+        points[:, 1] = ranges * np.sqrt(1 - sin_thetas**2)
+        points[:, 2] = 0  # only 2D (azimuth) configurations are supported
+        points[:, 3] = vels
+
+        return points
@@ -0,0 +1,253 @@
+import numpy as np
+import scipy.fft
+from scipy.signal import get_window
+
+# pyFFTW is optional, scipy.fft is used when it is not installed
+try:
+    import pyfftw
+except ImportError:
+    pyfftw = None
+
+
+class _FFTPlan:
+    def __init__(self, workspace: np.ndarray, axis: int, workers: int = 1):
+        """Reusable in-place forward FFT of a pre-allocated complex64 workspace along a single axis.
+        Uses a pyFFTW plan when pyFFTW is installed, otherwise scipy.fft (which caches its own plans
+        and transforms contiguous workspaces in place when overwrite_x is set)
+
+        Args:
+            workspace (np.ndarray): contiguous complex64 array that is transformed in place
+            axis (int): the axis to compute the FFT along
+            workers (int, optional): number of threads to use for the FFT. Defaults to 1.
+        """
+
+        self.workspace = workspace
+        self.axis = axis
+        self.workers = workers
+
+        if pyfftw:
+            self._fftw = pyfftw.FFTW(
+                workspace,
+                workspace,
+                axes=(axis,),
+                direction="FFTW_FORWARD",
+                threads=workers,
+            )
+        else:
+            self._fftw = None
+
+        return
+
+    def execute(self):
+        """Compute the FFT of the workspace (in place)
+
+        Returns:
+            np.ndarray: the transformed workspace
+        """
+
+        if self._fftw:
+            self._fftw()
+        else:
+            result = scipy.fft.fft(
+                self.workspace, axis=self.axis, overwrite_x=True, workers=self.workers
+            )
+            # scipy only transforms in place when it can, so copy the result back otherwise
+            if not np.shares_memory(result, self.workspace):
+                self.workspace[...] = result
+
+        return self.workspace
+
+
+class _ProcessingContext:
+    def __init__(
+        self,
+        num_antennas: int,
+        samples_per_chirp: int,
+        num_chirps: int,
+        num_chirps_to_save: int,
+        max_range_bin: int,
+        num_angle_bins: int,
+        range_window: str = None,
+    ):
+        """Pre-allocated workspaces, windows, fftshift index maps, and FFT plans for the
+        DCA1000 processing chain. A new context is created whenever a new radar config is
+        loaded so that processing each frame does not allocate any new arrays
+
+        Args:
+            num_antennas (int): number of (virtual) azimuth antennas in the ADC data cube
+            samples_per_chirp (int): number of ADC samples per chirp
+            num_chirps (int): number of chirps in the ADC data cube
+            num_chirps_to_save (int): number of chirps to compute range-azimuth responses for
+            max_range_bin (int): number of range bins that are kept
+            num_angle_bins (int): number of angle bins for the angle FFT
+            range_window (str, optional): scipy.signal window applied to the samples of each chirp
+                before the range FFT (ex: "hann"). Defaults to None (rectangular window).
+        """
+
+        self.num_antennas = num_antennas
+        self.samples_per_chirp = samples_per_chirp
+        self.num_chirps = num_chirps
+        self.num_chirps_to_save = num_chirps_to_save
+        self.max_range_bin = max_range_bin
+        self.num_angle_bins = num_angle_bins
+
+        # range window (indexed by sample)
+        if range_window:
+            self.range_window = get_window(range_window, samples_per_chirp).astype(
+                np.float32
+            )
+        else:
+            self.range_window = None
+
+        # range FFT of the [antenna, sample, chirp] ADC data cube
+        self._range_workspace = np.empty(
+            shape=(num_antennas, samples_per_chirp, num_chirps), dtype=np.complex64
+        )
+        self._range_plan = _FFTPlan(self._range_workspace, axis=1)
+
+        # zero padded [angle bin, range bin, chirp] workspace for the angle FFT
+        self._angle_workspace = np.zeros(
+            shape=(num_angle_bins, max_range_bin, num_chirps_to_save),
+            dtype=np.complex64,
+        )
+        self._angle_plan = _FFTPlan(self._angle_workspace, axis=0)
+        self._angle_shift_idx = np.fft.fftshift(np.arange(num_angle_bins))
+        self._rng_az_magnitude = np.empty(
+            shape=self._angle_workspace.shape, dtype=np.float32
+        )
+        self._rng_az_power_dB = np.empty(
+            shape=self._angle_workspace.shape, dtype=np.float32
+        )
+
+        # [range bin, chirp] workspace for the doppler FFT of a single antenna's range FFT
+        # (the doppler FFT is only computed for the range bins that are kept)
+        self._range_doppler_workspace = np.empty(
+            shape=(max_range_bin, num_chirps), dtype=np.complex64
+        )
+        self._range_doppler_plan = _FFTPlan(self._range_doppler_workspace, axis=1)
+        self._doppler_shift_idx = np.fft.fftshift(np.arange(num_chirps))
+        self._rng_dop_magnitude = np.empty(
+            shape=(max_range_bin, num_chirps), dtype=np.float32
+        )
+        self._rng_dop_power_dB = np.empty(
+            shape=(max_range_bin, num_chirps), dtype=np.float32
+        )
+
+        # [antenna, range bin, chirp] workspace for the doppler FFT of all antennas
+        # (allocated the first time it is needed, ex: for point cloud generation)
+        self._doppler_workspace = None
+        self._doppler_plan = None
+
+        return
+
+    def compute_range_fft(self, adc_data_cube: np.ndarray):
+        """Compute the (windowed) range FFT of an ADC data cube. The range FFT is computed
+        once per frame and shared by the range-azimuth and range-doppler responses
+
+        Args:
+            adc_data_cube (np.ndarray): num_antennas x samples_per_chirp x num_chirps ADC data cube
+
+        Returns:
+            np.ndarray: num_antennas x max_range_bin x num_chirps range FFT (a view of a workspace
+                that is re-used for each frame)
+        """
+
+        if self.range_window is not None:
+            np.multiply(
+                adc_data_cube,
+                self.range_window[np.newaxis, :, np.newaxis],
+                out=self._range_workspace,
+            )
+        else:
+            self._range_workspace[...] = adc_data_cube
+
+        return self._range_plan.execute()[:, : self.max_range_bin, :]
+
+    def compute_range_azimuth_power_dB(self, rng_fft: np.ndarray):
+        """Compute the range-azimuth power (in dB) of each chirp using an angle FFT
+
+        Args:
+            rng_fft (np.ndarray): num_antennas x max_range_bin x num_chirps range FFT (see compute_range_fft())
+
+        Returns:
+            np.ndarray: max_range_bin x num_angle_bins x num_chirps_to_save power in dB (a view of a
+                workspace that is re-used for each frame)
+        """
+
+        # the FFT is computed in place, so the padding must be re-zeroed for each frame
+        self._angle_workspace[: self.num_antennas] = rng_fft[
+            :, :, : self.num_chirps_to_save
+        ]
+        self._angle_workspace[self.num_antennas :] = 0
+        self._angle_plan.execute()
+
+        # shift the zero angle bin to the center
+        np.abs(self._angle_workspace, out=self._rng_az_magnitude)
+        np.take(
+            self._rng_az_magnitude,
+            self._angle_shift_idx,
+            axis=0,
+            out=self._rng_az_power_dB,
+        )
+        self._to_dB(self._rng_az_power_dB)
+
+        # index as [range bin, angle bin, chirp]
+        return np.transpose(self._rng_az_power_dB, axes=(1, 0, 2))
+
+    def compute_range_doppler_power_dB(self, rng_fft: np.ndarray, antenna: int = 0):
+        """Compute the range-doppler power (in dB) for a single antenna using a doppler FFT
+
+        Args:
+            rng_fft (np.ndarray): num_antennas x max_range_bin x num_chirps range FFT (see compute_range_fft())
+            antenna (int, optional): the antenna to use. Defaults to 0.
+
+        Returns:
+            np.ndarray: max_range_bin x num_chirps power in dB (a view of a workspace that is
+                re-used for each frame)
+        """
+
+        self._range_doppler_workspace[...] = rng_fft[antenna]
+        self._range_doppler_plan.execute()
+
+        # shift the zero velocity bin to the center
+        np.abs(self._range_doppler_workspace, out=self._rng_dop_magnitude)
+        np.take(
+            self._rng_dop_magnitude,
+            self._doppler_shift_idx,
+            axis=1,
+            out=self._rng_dop_power_dB,
+        )
+        self._to_dB(self._rng_dop_power_dB)
+
+        return self._rng_dop_power_dB
+
+    def compute_range_doppler_fft(self, rng_fft: np.ndarray):
+        """Compute the doppler FFT of every antenna's range FFT
+
+        Args:
+            rng_fft (np.ndarray): num_antennas x max_range_bin x num_chirps range FFT (see compute_range_fft())
+
+        Returns:
+            np.ndarray: num_antennas x max_range_bin x num_chirps range-doppler FFT with the zero
+                velocity bin at index 0 (a workspace that is re-used for each frame)
+        """
+
+        if self._doppler_workspace is None:
+            self._doppler_workspace = np.empty(
+                shape=(self.num_antennas, self.max_range_bin, self.num_chirps),
+                dtype=np.complex64,
+            )
+            self._doppler_plan = _FFTPlan(self._doppler_workspace, axis=2)
+
+        self._doppler_workspace[...] = rng_fft
+        return self._doppler_plan.execute()
+
+    @staticmethod
+    def _to_dB(magnitude: np.ndarray):
+        """Convert a magnitude array to dB (in place)
+
+        Args:
+            magnitude (np.ndarray): the magnitude array
+        """
+        np.log10(magnitude, out=magnitude)
+        magnitude *= 20
@@ -1,6 +1,7 @@
 from multiprocessing.connection import Connection
 from multiprocessing import connection, AuthenticationError
 
+from multiprocessing.connection import Listener
 from collections import OrderedDict
 import numpy as np
 
@@ -8,6 +9,7 @@ from CPSL_TI_Radar.Processors._Processor import _Processor
 from CPSL_TI_Radar._Message import _Message, _MessageTypes
 from CPSL_TI_Radar.Processors.TLV_Processors._PointCloud import _PointCloudTLVProcessor
 from CPSL_TI_Radar.Processors.TLV_Processors._TLVTags import TLVTags
+from CPSL_TI_Radar.Processors.TLV_Processors._TLV_Decoder import _TLVDecoder
 
 
 class IWRDemoProcessor(_Processor):
@@ -34,6 +36,18 @@ class IWRDemoProcessor(_Processor):
         self.magic_word = bytearray([0x02, 0x01, 0x04, 0x03, 0x06, 0x05, 0x08, 0x07])
         self.header = {}
 
+        # zero-copy decoding of the packet header and TLVs
+        self.tlv_decoder = _TLVDecoder(self.sdk_version)
+
+        # decoded TLVs of the current packet indexed by TLV tag
+        # (views into the current packet, reset for each packet)
+        self.TLV_data = {}
+
+        # listener that receives the decoded TLVs (profiles, heatmaps, stats) of each packet
+        self._listener_TLVData = None
+        self._conn_TLVData = None
+        self._conn_TLVData_enabled = False
+
         # import tlv processor classes
         self.enable_plotting = False
         self.save_plots_as_gifs = False
@@ -54,10 +68,10 @@ class IWRDemoProcessor(_Processor):
     def _load_new_config(self, config_info: dict):
         super()._load_new_config(config_info)
 
-        # TODO: Update this to support other TLV types
         self.tlv_processor_detected_objects.load_config(
             radar_performance=self.radar_performance, radar_config=self.radar_config
         )
+        self.tlv_decoder.load_config(self.radar_performance)
 
         return
 
@@ -90,6 +104,15 @@ class IWRDemoProcessor(_Processor):
             self.tlv_processor_detected_objects.init_conn_client(
                 detected_points_address, authkey
             )
+
+            if TLV_listener_info["TLVDataProcessor"]["enabled"]:
+                TLV_data_address = (
+                    "localhost",
+                    int(TLV_listener_info["TLVDataProcessor"]["addr"]),
+                )
+                self._listener_TLVData = Listener(TLV_data_address, authkey=authkey)
+                self._conn_TLVData = self._listener_TLVData.accept()
+                self._conn_TLVData_enabled = True
         except AuthenticationError:
             self._conn_send_message_to_print(
                 "IWR_Demo_Processor_init_TLV_listeners: experienced Authentication error when attempting to connect to Client"
@@ -98,107 +121,84 @@ class IWRDemoProcessor(_Processor):
 
     # processing packets
     def _process_new_packet(self):
-        # load the latest packet from the streamer into the current_packet buffer
-        super()._process_new_packet()
+        # load the next packet from the streamer into the current_packet buffer
+        if not super()._process_new_packet():
+            return
+
+        # the decoded TLVs of the previous packet are not carried over
+        self.TLV_data = {}
 
         self._process_header()
         
         self._process_TLVs()
 
+        self._conn_send_TLV_data()
+
         return
 
     def _process_header(self):
-        
-        if self.sdk_version == "3.5":
-            self._process_header_sdk_3_5()
-        elif self.sdk_version == "2.1":
-            self._process_header_sdk_2_1()
 
-    def _process_header_sdk_3_5(self):
+        # decode the header (the sub frame number is only included for SDK 3.5)
+        decoded_header = self.tlv_decoder.decode_header(self.current_packet)
+        self._decoded_header = decoded_header
 
-        # decode the header
-        decoded_header = np.frombuffer(self.current_packet[:40], dtype=np.uint32)
         # process the header fields
-        self.header["version"] = format(decoded_header[2], "x")
-        self.header["packet_length"] = decoded_header[3]
-        self.header["platform"] = format(decoded_header[4], "x")
-        self.header["frame_number"] = decoded_header[5]
-        self.header["time"] = decoded_header[6]
-        self.header["num_detected_objects"] = decoded_header[7]
-        self.header["num_data_structures"] = decoded_header[8]
-        self.header["sub_frame_number"] = decoded_header[9]
+        self.header["version"] = format(decoded_header["version"], "x")
+        self.header["packet_length"] = decoded_header["packet_length"]
+        self.header["platform"] = format(decoded_header["platform"], "x")
+        self.header["frame_number"] = decoded_header["frame_number"]
+        self.header["time"] = decoded_header["time"]
+        self.header["num_detected_objects"] = decoded_header["num_detected_objects"]
+        self.header["num_data_structures"] = decoded_header["num_data_structures"]
+        if self.sdk_version == "3.5":
+            self.header["sub_frame_number"] = decoded_header["sub_frame_number"]
         return
-    
-    def _process_header_sdk_2_1(self):
 
-        # decode the header
-        decoded_header = np.frombuffer(self.current_packet[:36], dtype=np.uint32)
-        # process the header fields
-        self.header["version"] = format(decoded_header[2], "x")
-        self.header["packet_length"] = decoded_header[3]
-        self.header["platform"] = format(decoded_header[4], "x")
-        self.header["frame_number"] = decoded_header[5]
-        self.header["time"] = decoded_header[6]
-        self.header["num_detected_objects"] = decoded_header[7]
-        self.header["num_data_structures"] = decoded_header[8]
-        return
-    
     def _process_TLVs(self):
-        
-        if self.sdk_version == "3.5":
-            self._process_TLVs_sdk_3_5()
-        elif self.sdk_version == "2.1":
-            self._process_TLVs_sdk_2_1()
 
-        return
-    
-    def _process_TLVs_sdk_3_5(self):
-
-        # first index is after the start of the packet
-        idx = 40
-        for i in range(self.header["num_data_structures"]):
-            TLV_info = np.frombuffer(
-                self.current_packet[idx : idx + 8], dtype=np.uint32
-            )
-            TLV_tag = TLV_info[0]
-            TLV_length = TLV_info[1]
-            # print("num_objects:{}".format(self.header["num_detected_objects"]))
-            # print("tag: {}, length: {}".format(TLV_tag,TLV_length))
-            # process the TLV data
-            self._process_TLV(TLV_tag, self.current_packet[idx : idx + TLV_length + 8])
-
-            # increment the index
-            idx += TLV_length + 8
-
-    def _process_TLVs_sdk_2_1(self):
-
-        # first index is after the start of the packet
-        idx = 36
-        for i in range(self.header["num_data_structures"]):
-            TLV_info = np.frombuffer(
-                self.current_packet[idx : idx + 8], dtype=np.uint32
-            )
-            TLV_tag = TLV_info[0]
-            TLV_length = TLV_info[1]
+        # each TLV is a view into the current packet
+        for TLV_tag, TLV in self.tlv_decoder.iter_TLVs(
+            self.current_packet, self._decoded_header
+        ):
+            self._process_TLV(TLV_tag, TLV)
 
-            # process the TLV data
-            self._process_TLV(TLV_tag, self.current_packet[idx : idx + TLV_length + 8])
-
-            # increment the index
-            idx += TLV_length + 8
+        return
 
     def _process_TLV(self, TLV_tag, data: bytearray):
-        # call the correct function to process to given TLV data
-        try:
-            match TLV_tag:
-                case TLVTags.DETECTED_POINTS:
+        # unknown TLVs are skipped
+        decoded_TLV = self.tlv_decoder.decode_TLV(TLV_tag, data)
+        if decoded_TLV is None:
+            return
+        self.TLV_data[TLV_tag] = decoded_TLV
 
-                    if self.sdk_version == "3.5":
-                        self.tlv_processor_detected_objects.process_new_data_sdk_3_5(data)
-                    elif self.sdk_version == "2.1":
-                        self.tlv_processor_detected_objects.process_new_data_sdk_2_1(data)
+        # the detected points are sent to their listener
+        try:
+            if TLV_tag == TLVTags.DETECTED_POINTS:
+                if self.sdk_version == "3.5":
+                    self.tlv_processor_detected_objects.process_points_sdk_3_5(decoded_TLV)
+                elif self.sdk_version == "2.1":
+                    descriptor = self.tlv_decoder.decode_points_descriptor_sdk_2_1(data)
+                    self.tlv_processor_detected_objects.process_points_sdk_2_1(
+                        decoded_TLV, int(descriptor["xyz_q_format"])
+                    )
         except BrokenPipeError:
             self._conn_send_message_to_print(
                 "IWR_Demo_Processor_process_TLV: attempted to send data to Listener, but Client process was already closed"
             )
             self._conn_send_parent_error_message()
+
+    def _conn_send_TLV_data(self):
+        """Send the decoded TLVs of the current packet to the TLVData listener (if enabled) as a
+        (frame number, {TLV tag: decoded TLV}) tuple"""
+
+        if not self._conn_TLVData_enabled:
+            return
+
+        try:
+            self._conn_TLVData.send((self.header["frame_number"], self.TLV_data))
+        except (BrokenPipeError, ConnectionResetError):
+            self._conn_send_message_to_print(
+                "IWR_Demo_Processor._conn_send_TLV_data: attempted to send data to Listener, but Client process was already closed"
+            )
+            self._conn_send_parent_error_message()
+            self._conn_TLVData_enabled = False
@@ -37,45 +37,37 @@ class _PointCloudTLVProcessor:
         self._conn_listener_enabled = True
 
     # processing data
-    def process_new_data_sdk_3_5(self,data:bytearray):
-        
-        #access the points as a float
-        points = np.frombuffer(data[8:],dtype=np.float32)
+    def process_points_sdk_3_5(self, points: np.ndarray):
+        """Send the detected points of an SDK 3.5 packet to the listener
 
-        #reshape so that each row corresponds to a specific object
-        points = points.reshape([-1,4])
+        Args:
+            points (np.ndarray): the decoded points (_TLVDecoder.POINTS_DTYPE_SDK_3_5)
+        """
 
-        self.detected_objects = points
+        # each row is an [x,y,z,vel] object (a view of the decoded points)
+        self.detected_objects = points.view(np.float32).reshape([-1, 4])
 
         if self._conn_listener_enabled:
             self._conn_listener.send(self.detected_objects)
 
         return
 
-    def process_new_data_sdk_2_1(self, data: bytearray):
-        descriptor = np.frombuffer(data[8:12], dtype=np.uint16)
-        num_objects = descriptor[0]
-        XYZQ_format = descriptor[1]
-        XYZQ_conversion = np.power(2, XYZQ_format)
+    def process_points_sdk_2_1(self, points: np.ndarray, xyz_q_format: int):
+        """Convert the detected points of an SDK 2.1 packet to [x,y,z,vel] objects and send them to the listener
 
-        # start forming the detected objects array
-        objects_struct = np.frombuffer(data[12:], dtype=np.int16)
-        # reshape so that each row corresponds to a specific object
-        objects_struct = objects_struct.reshape([-1, 6])
-
-        range_idxs = objects_struct[:, 0].astype(np.uint16)
-        ranges = np.float32(
-            range_idxs * self.radar_performance["range"]["range_idx_to_m"]
-        )
+        Args:
+            points (np.ndarray): the decoded points (_TLVDecoder.POINTS_DTYPE_SDK_2_1)
+            xyz_q_format (int): Q format of the point coordinates (from the points descriptor)
+        """
+        XYZQ_conversion = np.power(2, xyz_q_format)
 
-        vel_idxs = objects_struct[:, 1]
         vels = np.float32(
-            vel_idxs * self.radar_performance["velocity"]["vel_idx_to_m_per_s"]
+            points["doppler_idx"] * self.radar_performance["velocity"]["vel_idx_to_m_per_s"]
         )
 
-        peak_vals = (objects_struct[:, 2] / XYZQ_conversion).astype(np.float32)
-
-        XYZ_coordinates = (objects_struct[:, 3:] / XYZQ_conversion).astype(np.float32)
+        XYZ_coordinates = (
+            np.stack((points["x"], points["y"], points["z"]), axis=1) / XYZQ_conversion
+        ).astype(np.float32)
 
         self.detected_objects = np.concatenate(
             (
@@ -84,16 +76,6 @@ class _PointCloudTLVProcessor:
             ),
             axis=1,
         )
-        
-        # self.detected_objects = np.concatenate(
-        #     (
-        #         XYZ_coordinates,
-        #         vels[:, np.newaxis],
-        #         ranges[:, np.newaxis],
-        #         peak_vals[:, np.newaxis],
-        #     ),
-        #     axis=1,
-        # )
 
         if self._conn_listener_enabled:
             self._conn_listener.send(self.detected_objects)
@@ -0,0 +1,218 @@
+import numpy as np
+
+from CPSL_TI_Radar.Processors.TLV_Processors._TLVTags import TLVTags
+
+
+class _TLVDecoder:
+    # packet headers
+    HEADER_DTYPE_SDK_2_1 = np.dtype(
+        [
+            ("magic_word", "u1", (8,)),
+            ("version", "<u4"),
+            ("packet_length", "<u4"),
+            ("platform", "<u4"),
+            ("frame_number", "<u4"),
+            ("time", "<u4"),
+            ("num_detected_objects", "<u4"),
+            ("num_data_structures", "<u4"),
+        ]
+    )
+    HEADER_DTYPE_SDK_3_5 = np.dtype(
+        HEADER_DTYPE_SDK_2_1.descr + [("sub_frame_number", "<u4")]
+    )
+
+    # header at the start of each TLV (the length does not include the TLV header)
+    TLV_HEADER_DTYPE = np.dtype([("tag", "<u4"), ("length", "<u4")])
+
+    # detected points
+    POINTS_DTYPE_SDK_3_5 = np.dtype(
+        [("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("velocity", "<f4")]
+    )
+    POINTS_DESCRIPTOR_DTYPE_SDK_2_1 = np.dtype(
+        [("num_objects", "<u2"), ("xyz_q_format", "<u2")]
+    )
+    POINTS_DTYPE_SDK_2_1 = np.dtype(
+        [
+            ("range_idx", "<u2"),
+            ("doppler_idx", "<i2"),
+            ("peak_val", "<u2"),
+            ("x", "<i2"),
+            ("y", "<i2"),
+            ("z", "<i2"),
+        ]
+    )
+
+    # log magnitude profiles and heatmaps (Q9 format)
+    PROFILE_DTYPE = np.dtype("<u2")
+
+    # complex range-azimuth samples
+    AZIMUTH_HEAT_MAP_DTYPE = np.dtype([("imag", "<i2"), ("real", "<i2")])
+
+    STATS_DTYPE = np.dtype(
+        [
+            ("inter_frame_processing_time", "<u4"),
+            ("transmit_output_time", "<u4"),
+            ("inter_frame_processing_margin", "<u4"),
+            ("inter_chirp_processing_margin", "<u4"),
+            ("active_frame_CPU_load", "<u4"),
+            ("inter_frame_CPU_load", "<u4"),
+        ]
+    )
+
+    def __init__(self, sdk_version: str):
+        """Decodes IWR demo packets into numpy structured arrays. Every decoded array is a view into
+        the packet buffer, so no data is copied (the views are only valid while the packet is)
+
+        Args:
+            sdk_version (str): the SDK version of the packets ("3.5" or "2.1")
+        """
+
+        self.sdk_version = sdk_version
+
+        match sdk_version:
+            case "3.5":
+                self.header_dtype = self.HEADER_DTYPE_SDK_3_5
+                points_dtype = self.POINTS_DTYPE_SDK_3_5
+            case "2.1":
+                self.header_dtype = self.HEADER_DTYPE_SDK_2_1
+                points_dtype = self.POINTS_DTYPE_SDK_2_1
+            case _:
+                raise ValueError(
+                    "_TLVDecoder: SDK version ({}) is invalid".format(sdk_version)
+                )
+
+        # dtype of each TLV's payload
+        self.TLV_dtypes = {
+            TLVTags.DETECTED_POINTS: points_dtype,
+            TLVTags.RANGE_PROFILE: self.PROFILE_DTYPE,
+            TLVTags.NOISE_PROFILE: self.PROFILE_DTYPE,
+            TLVTags.AZIMUTH_STATIC_HEAT_MAP: self.AZIMUTH_HEAT_MAP_DTYPE,
+            TLVTags.RANGE_DOPPLER_HEAT_MAP: self.PROFILE_DTYPE,
+            TLVTags.STATS: self.STATS_DTYPE,
+        }
+
+        # shape of each TLV's payload (set from the radar performance, see load_config())
+        self.TLV_shapes = {}
+
+        return
+
+    def load_config(self, radar_performance: dict):
+        """Set the shapes of the profiles and heatmaps for a new radar config
+
+        Args:
+            radar_performance (dict): the radar performance (see ConfigManager)
+        """
+
+        num_range_bins = int(radar_performance["range"]["num_range_bins"])
+        num_doppler_bins = int(radar_performance["velocity"]["num_doppler_bins"])
+        num_virtual_antennas = int(radar_performance["angle"]["num_az_antennas"])
+
+        self.TLV_shapes = {
+            TLVTags.RANGE_PROFILE: (num_range_bins,),
+            TLVTags.NOISE_PROFILE: (num_range_bins,),
+            TLVTags.AZIMUTH_STATIC_HEAT_MAP: (num_range_bins, num_virtual_antennas),
+            TLVTags.RANGE_DOPPLER_HEAT_MAP: (num_range_bins, num_doppler_bins),
+        }
+
+    def decode_header(self, packet):
+        """Decode the header of a packet
+
+        Args:
+            packet (bytes-like): the packet (starting with the magic word)
+
+        Returns:
+            np.void: structured record with the header fields (ex: header["frame_number"])
+        """
+        return np.frombuffer(packet, dtype=self.header_dtype, count=1)[0]
+
+    def iter_TLVs(self, packet, header=None):
+        """Iterate over the TLVs in a packet
+
+        Args:
+            packet (bytes-like): the packet (starting with the magic word)
+            header (np.void, optional): the decoded header. Defaults to None (decode the header).
+
+        Yields:
+            tuple(int,memoryview): the tag and a view of each TLV (TLV header included)
+        """
+
+        if header is None:
+            header = self.decode_header(packet)
+
+        packet = memoryview(packet).cast("B")
+        idx = self.header_dtype.itemsize
+        for i in range(int(header["num_data_structures"])):
+            TLV_tag, TLV_length = np.frombuffer(
+                packet, dtype=self.TLV_HEADER_DTYPE, count=1, offset=idx
+            )[0].tolist()
+            num_bytes = self.TLV_HEADER_DTYPE.itemsize + TLV_length
+            yield TLV_tag, packet[idx : idx + num_bytes]
+
+            idx += num_bytes
+
+    def decode_TLV(self, TLV_tag: int, TLV):
+        """Decode the payload of a TLV
+
+        Args:
+            TLV_tag (int): the TLV tag (see TLVTags)
+            TLV (bytes-like): the TLV (TLV header included, see iter_TLVs())
+
+        Returns:
+            np.ndarray: view of the payload (structured for detected points, heatmaps, and stats, with
+                stats decoded as a single np.void record),
+                profiles and heatmaps are reshaped once load_config() is called. None for unknown tags
+        """
+
+        dtype = self.TLV_dtypes.get(TLV_tag)
+        if dtype is None:
+            return None
+
+        offset = self.TLV_HEADER_DTYPE.itemsize
+        if TLV_tag == TLVTags.DETECTED_POINTS and self.sdk_version == "2.1":
+            offset += self.POINTS_DESCRIPTOR_DTYPE_SDK_2_1.itemsize
+
+        num_items = (len(TLV) - offset) // dtype.itemsize
+        data = np.frombuffer(TLV, dtype=dtype, count=num_items, offset=offset)
+
+        if TLV_tag == TLVTags.STATS:
+            return data[0]
+
+        shape = self.TLV_shapes.get(TLV_tag)
+        if shape and np.prod(shape) == data.size:
+            data = data.reshape(shape)
+
+        return data
+
+    def decode_points_descriptor_sdk_2_1(self, TLV):
+        """Decode the descriptor at the start of an SDK 2.1 detected points TLV
+
+        Args:
+            TLV (bytes-like): the detected points TLV (TLV header included)
+
+        Returns:
+            np.void: structured record with num_objects and xyz_q_format
+        """
+        return np.frombuffer(
+            TLV,
+            dtype=self.POINTS_DESCRIPTOR_DTYPE_SDK_2_1,
+            count=1,
+            offset=self.TLV_HEADER_DTYPE.itemsize,
+        )[0]
+
+    def decode(self, packet):
+        """Decode a packet's header and all of its TLVs
+
+        Args:
+            packet (bytes-like): the packet (starting with the magic word)
+
+        Returns:
+            tuple(np.void,dict): the decoded header and a dictionary of the decoded TLVs
+                indexed by TLV tag
+        """
+
+        header = self.decode_header(packet)
+        TLVs = {}
+        for TLV_tag, TLV in self.iter_TLVs(packet, header):
+            TLVs[TLV_tag] = self.decode_TLV(TLV_tag, TLV)
+
+        return header, TLVs
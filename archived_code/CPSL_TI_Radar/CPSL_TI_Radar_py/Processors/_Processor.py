@@ -1,9 +1,10 @@
 from multiprocessing.connection import Connection
 from multiprocessing import connection, AuthenticationError
 
-from collections import OrderedDict
+from collections import OrderedDict, deque
 import numpy as np
 import sys
+import time
 
 from CPSL_TI_Radar._Background_Process import _BackgroundProcess
 from CPSL_TI_Radar._Message import _Message, _MessageTypes
@@ -19,6 +20,15 @@ class TLVTags:
     STATS = 6
 
 
+class FrameQueuePolicies:
+    # drop the oldest queued frame to make room for a new frame (always process the newest frames)
+    DROP_OLDEST = "drop_oldest"
+    # drop new frames while the queue is full
+    DROP_NEWEST = "drop_newest"
+    # stop receiving frames while the queue is full (frames back up in the Streamer)
+    BLOCK = "block"
+
+
 class _Processor(_BackgroundProcess):
     def __init__(
         self,
@@ -61,6 +71,32 @@ class _Processor(_BackgroundProcess):
         # set the verbose status
         self.verbose = self._settings["Processor"]["verbose"]
 
+        # bounded queue of frames received from the Streamer
+        self.frame_queue_policy = self._settings["Processor"]["frame_queue_policy"]
+        self.frame_queue_size = self._settings["Processor"]["frame_queue_size"]
+        if self.frame_queue_policy not in [
+            FrameQueuePolicies.DROP_OLDEST,
+            FrameQueuePolicies.DROP_NEWEST,
+            FrameQueuePolicies.BLOCK,
+        ]:
+            self._conn_send_message_to_print(
+                "Processor.__init__: frame_queue_policy ({}) is invalid".format(
+                    self.frame_queue_policy
+                )
+            )
+            self._conn_send_init_status(init_success=False)
+            self.init_success = False
+            sys.exit()
+        self._frame_queue = deque()
+
+        # frame statistics (reset each time streaming is started and
+        # periodically sent to the Radar)
+        self.num_frames_received = 0
+        self.num_frames_processed = 0
+        self.num_frames_dropped = 0
+        self.frame_stats_period_s = 1.0
+        self._last_frame_stats_time = 0
+
         return
 
     def init_SDK_version(self):
@@ -88,14 +124,25 @@ class _Processor(_BackgroundProcess):
                 # process new messages from either the Radar or the
                 if self.streaming_enabled:
                     # wait until either the Radar or the Processor sends data
+                    # (only check for new data if there are queued frames to process)
                     ready_conns = connection.wait(
-                        [self._conn_parent, self._conn_processor_data], timeout=None
+                        [self._conn_parent] + self._get_data_conns(),
+                        timeout=0 if self._frames_ready() else None,
                     )
                     for conn in ready_conns:
                         if conn == self._conn_parent:
                             self._conn_process_Radar_command()
                         else:  # must be new data available
-                            self._process_new_packet()
+                            self._process_data_conn(conn)
+                    if not ready_conns:
+                        self._process_new_packet()
+
+                    # periodically report the frame statistics to the Radar
+                    if (
+                        time.time() - self._last_frame_stats_time
+                        >= self.frame_stats_period_s
+                    ):
+                        self._conn_send_frame_stats()
                 else:
                     self._conn_process_Radar_command()
 
@@ -127,12 +174,48 @@ class _Processor(_BackgroundProcess):
         pass
 
     # processing packets
-    def _process_new_packet(self):
-        # receive the latest packet from the processor
-        # TODO: currently a risk of the processor dropping packets here
-        while self._conn_processor_data.poll():
+    def _get_data_conns(self):
+        """Get the connections (other than the Radar) to wait on while streaming
+
+        Returns:
+            list: the data connections (the Streamer connection by default, which is
+                skipped while the frame queue is full with the block policy)
+        """
+        if self._frame_queue_accepting_frames():
+            return [self._conn_processor_data]
+        else:
+            return []
+
+    def _process_data_conn(self, conn: Connection):
+        """Process new data on one of the connections from _get_data_conns()
+
+        Args:
+            conn (Connection): the connection with new data available
+        """
+        self._process_new_packet()
+
+    def _frames_ready(self):
+        """Check if there are queued frames that can be processed without waiting for new data
+
+        Returns:
+            bool: True if there are frames ready to process
+        """
+        return len(self._frame_queue) > 0
+
+    def _frame_queue_accepting_frames(self):
+        return (
+            self.frame_queue_policy != FrameQueuePolicies.BLOCK
+            or len(self._frame_queue) < self.frame_queue_size
+        )
+
+    def _receive_new_frames(self):
+        """Move all of the frames available from the Streamer into the frame queue,
+        dropping frames when the queue is full according to the frame_queue_policy
+        """
+
+        while self._frame_queue_accepting_frames() and self._conn_processor_data.poll():
             try:
-                self.current_packet = self._conn_processor_data.recv_bytes()
+                frame = self._conn_processor_data.recv_bytes()
             except EOFError:
                 self._conn_send_message_to_print(
                     "Processor._process_new_packet: attempted to receive new packet from Streamer, but streamer was closed"
@@ -140,11 +223,59 @@ class _Processor(_BackgroundProcess):
                 self._conn_send_parent_error_message()
                 self.streaming_enabled = False
                 return
+            self.num_frames_received += 1
 
-        # TODO: Define remaining custom behavior to actually process the packet
+            if len(self._frame_queue) >= self.frame_queue_size:
+                self.num_frames_dropped += 1
+                if self.frame_queue_policy == FrameQueuePolicies.DROP_NEWEST:
+                    continue
+                self._frame_queue.popleft()
+
+            self._frame_queue.append(frame)
 
         return
 
+    def _process_new_packet(self):
+        """Receive new frames from the Streamer and load the next queued frame into current_packet
+
+        Returns:
+            bool: True if a new frame was loaded into current_packet
+        """
+
+        self._receive_new_frames()
+
+        if not self._frame_queue:
+            return False
+
+        self.current_packet = self._frame_queue.popleft()
+        self.num_frames_processed += 1
+
+        # TODO: Define remaining custom behavior to actually process the packet
+
+        return True
+
+    def _get_frame_stats(self):
+        """Get the current frame statistics
+
+        Returns:
+            dict: frame statistics with entries for num_frames_received, num_frames_processed,
+                num_frames_dropped, and num_frames_queued
+        """
+        return {
+            "num_frames_received": self.num_frames_received,
+            "num_frames_processed": self.num_frames_processed,
+            "num_frames_dropped": self.num_frames_dropped,
+            "num_frames_queued": len(self._frame_queue),
+        }
+
+    def _conn_send_frame_stats(self):
+        """Send the current frame statistics to the Radar"""
+
+        self._last_frame_stats_time = time.time()
+        self._conn_parent.send(
+            _Message(_MessageTypes.FRAME_STATS, self._get_frame_stats())
+        )
+
     # Loading new radar configurations
     def _load_new_config(self, config_info: dict):
         """Load a new set of radar performance and radar configuration dictionaries into the processor class
@@ -170,6 +301,13 @@ class _Processor(_BackgroundProcess):
         else:
             self.streaming_enabled = True
 
+            # reset the frame statistics
+            self._frame_queue.clear()
+            self.num_frames_received = 0
+            self.num_frames_processed = 0
+            self.num_frames_dropped = 0
+            self._last_frame_stats_time = time.time()
+
         return
 
     def _conn_process_Radar_command(self):
@@ -185,6 +323,7 @@ class _Processor(_BackgroundProcess):
                 self._start_streaming()
             case _MessageTypes.STOP_STREAMING:
                 self.streaming_enabled = False
+                self._conn_send_frame_stats()
             case _MessageTypes.CONFIG_LISTENERS:
                 self._init_listeners()
                 self._conn_send_command_executed_message(_MessageTypes.CONFIG_LISTENERS)
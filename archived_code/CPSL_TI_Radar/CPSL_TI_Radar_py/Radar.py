@@ -77,6 +77,9 @@ class Radar:
         # list of background process connections to simplify initialization, starting, and closing of background processes
         self.background_process_connections: list(Connection) = []
 
+        # latest frame statistics reported by each background process (see _MessageTypes.FRAME_STATS)
+        self.frame_stats = {}
+
         self._prepare_background_processes()
 
         self.listeners_enabled = bool(self._settings["ROS/Listeners"]["enabled"])
@@ -165,6 +168,10 @@ class Radar:
         # collect any remaining messages
         self._conn_recv_background_process_updates()
 
+        # report the final frame statistics
+        for process_name, frame_stats in self.frame_stats.items():
+            print("Radar.close: {} frame stats: {}".format(process_name, frame_stats))
+
         # join the processes
         self._join_processes()
 
@@ -320,14 +327,19 @@ class Radar:
                 CLIController,
                 DCA1000Streamer,
                 DCA1000Processor,
-                DCA1000Handler,
             ]
             self.background_process_names = [
                 "CLIController",
                 "DCA1000Streamer",
                 "DCA1000Processor",
-                "DCA1000Handler",
             ]
+
+            # the DCA1000Streamer runs the handler in a receive thread when in_process_handler is enabled
+            if not self._settings["Streamer"]["DCA1000_streaming"][
+                "in_process_handler"
+            ]:
+                self.background_process_classes.append(DCA1000Handler)
+                self.background_process_names.append("DCA1000Handler")
             return True
         else:
             return False
@@ -551,6 +563,10 @@ class Radar:
                                     self.background_process_names[i]
                                 )
                             )
+                        case _MessageTypes.FRAME_STATS:
+                            self._process_frame_stats(
+                                self.background_process_names[i], msg.value
+                            )
                         case _:
                             continue
             except EOFError:
@@ -560,6 +576,30 @@ class Radar:
                     )
                 )
 
+    def _process_frame_stats(self, process_name: str, frame_stats: dict):
+        """Save the latest frame statistics from a background process and report any new dropped frames
+
+        Args:
+            process_name (str): name of the background process
+            frame_stats (dict): the frame statistics (see _Processor._get_frame_stats())
+        """
+
+        prev_frame_stats = self.frame_stats.get(process_name, {})
+        self.frame_stats[process_name] = frame_stats
+
+        num_new_dropped_frames = frame_stats["num_frames_dropped"] - prev_frame_stats.get(
+            "num_frames_dropped", 0
+        )
+        if num_new_dropped_frames > 0:
+            print(
+                "Radar._process_frame_stats: {} dropped {} frames ({} received, {} processed)".format(
+                    process_name,
+                    num_new_dropped_frames,
+                    frame_stats["num_frames_received"],
+                    frame_stats["num_frames_processed"],
+                )
+            )
+
     def _conn_send_EXIT_commands(self):
         """Send Exit commands to each of the background
         processes so that they close
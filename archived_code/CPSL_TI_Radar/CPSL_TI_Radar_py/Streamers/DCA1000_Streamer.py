@@ -2,13 +2,21 @@ import socket
 import numpy as np
 import sys
 import struct
+import threading
 
 # helper classes
 from multiprocessing.connection import Connection
 from multiprocessing import Process, Pipe
 from CPSL_TI_Radar._Message import _Message, _MessageTypes
+from CPSL_TI_Radar._Shared_Frame_Ring import _SharedFrameRing
 from CPSL_TI_Radar.Streamers._Streamer import _Streamer
-from CPSL_TI_Radar.Streamers.Handlers.DCA1000 import DCA1000Handler
+from CPSL_TI_Radar.Streamers._Frame_Assembler import _FrameAssembler
+from CPSL_TI_Radar.Streamers.Handlers.DCA1000 import (
+    DCA1000DataPacket,
+    DCA1000Handler,
+    DCA1000PacketBatch,
+    DCA1000PacketRing,
+)
 
 
 class DCA1000Streamer(_Streamer):
@@ -25,7 +33,7 @@ class DCA1000Streamer(_Streamer):
             conn_parent (Connection): connection to the Radar class
             conn_processor_data (Connection): connection to the Processor Class
             conn_handler_data (Connection, optional): connection to a Handler Class (in event of DCA1000).
-                Defaults to None
+                Defaults to None (ex: when the DCA1000Handler is run in the same process)
             settings_file_path (str, optional): Path to the radar settings json file. Defaults to 'config_Radar.json'.
         """
 
@@ -41,15 +49,71 @@ class DCA1000Streamer(_Streamer):
         self.udp_byte_count = 0
         self.dropped_udp_packets = 0
 
+        # batch of packets received from the DCA1000Handler
+        self.packet_batch = DCA1000PacketBatch(
+            self._settings["Streamer"]["DCA1000_streaming"]["packet_batch_size"]
+        )
+
         # radar frame detection
         self.num_detected_frames = 0
         self.num_bytes_per_frame = 0
 
+        # shared memory ring used to pass frames to the processor
+        self.frame_ring: _SharedFrameRing = None
+        self.frame_ring_slots = int(
+            self._settings["Streamer"]["DCA1000_streaming"]["frame_ring_slots"]
+        )
+
+        # assembles UDP payloads into frames (initialized when a config is loaded)
+        self.frame_assembler: _FrameAssembler = None
+
+        # DCA1000Handler run in a receive thread in this process (instead of a separate process)
+        self.in_process_handler = self._settings["Streamer"]["DCA1000_streaming"][
+            "in_process_handler"
+        ]
+        self.packet_ring: DCA1000PacketRing = None
+        self._conn_handler: Connection = None
+        self._handler_thread: threading.Thread = None
+        if self.in_process_handler and self.init_success:
+            self._init_in_process_handler(settings_file_path)
+
         self._conn_send_init_status(self.init_success)
         self.run()
 
         return
 
+    def _init_in_process_handler(self, settings_file_path):
+        """Start a DCA1000Handler in a receive thread that writes UDP packets
+        directly into a packet ring shared with this streamer
+
+        Args:
+            settings_file_path (str): Path to the radar settings json file
+        """
+
+        self.packet_ring = DCA1000PacketRing(
+            self._settings["Streamer"]["DCA1000_streaming"]["packet_ring_slots"]
+        )
+
+        # control messages to/from the handler thread
+        self._conn_handler, conn_handler_child = Pipe()
+
+        self._handler_thread = threading.Thread(
+            target=DCA1000Handler,
+            kwargs={
+                "conn_parent": conn_handler_child,
+                "conn_handler_data": None,
+                "settings_file_path": settings_file_path,
+                "packet_ring": self.packet_ring,
+            },
+            name="DCA1000Handler",
+            daemon=True,
+        )
+        self._handler_thread.start()
+
+        # wait for the handler to finish initializing the DCA1000
+        if not self._conn_recv_handler_init_status():
+            self.init_success = False
+
     # loading new configurations
     def _load_new_config(self, config_info: dict):
         """Over-rided version of _load_new_config to do additional processing for the DCA1000. Load a new set of radar performance and radar configuration dictionaries into the processor class
@@ -83,9 +147,45 @@ class DCA1000Streamer(_Streamer):
             * loops_per_frame
         )
 
+        self._init_frame_ring()
+
+    def _init_frame_ring(self):
+        """(Re)create the shared memory ring used to pass frames to the processor
+        and the frame assembler that writes frames directly into the ring slots"""
+
+        if self.frame_ring:
+            self.frame_assembler = None
+            self.frame_ring.close()
+
+        self.frame_ring = _SharedFrameRing(
+            name=_SharedFrameRing.name_from_settings(
+                self._settings["Streamer"]["DCA1000_streaming"]
+            ),
+            num_slots=self.frame_ring_slots,
+            num_bytes_per_frame=self.num_bytes_per_frame,
+            create=True,
+        )
+
+        self.frame_assembler = _FrameAssembler(
+            num_bytes_per_frame=self.num_bytes_per_frame,
+            frame_complete_callback=self._on_new_frame,
+        )
+        self.frame_assembler.reset(self._begin_next_frame_slot())
+
     def close(self):
         """End the streamer process"""
 
+        if self._handler_thread:
+            if self._handler_thread.is_alive():
+                self._conn_send_handler_command(_MessageTypes.EXIT)
+            self._handler_thread.join()
+            self._handler_thread = None
+
+        if self.frame_ring:
+            self.frame_assembler = None
+            self.frame_ring.close()
+            self.frame_ring = None
+
         return
 
     # start and stop streaming
@@ -94,18 +194,52 @@ class DCA1000Streamer(_Streamer):
 
         self.streaming_enabled = True
 
+        # the DCA1000 byte count restarts at 0 each time recording is started
+        if self.frame_assembler:
+            self.frame_assembler.reset()
+
+        # start recording on the in-process handler
+        if self._handler_thread:
+            self.packet_ring.reset()
+            self._conn_send_handler_command(_MessageTypes.START_STREAMING)
+
     def _stop_streaming(self):
         """Stop Streaming on DCA1000"""
 
         self.streaming_enabled = False
 
+        # stop recording on the in-process handler
+        if self._handler_thread:
+            self._conn_send_handler_command(_MessageTypes.STOP_STREAMING)
+
     # process new packets
     def _get_next_frame_packet(self):
-        """Get the next UDP packet and send to the processor"""
+        """Get the next UDP packets (from the packet ring or the DCA1000Handler process)
+        and write them into the frame assembler"""
+
+        if self.packet_ring:
+            self._get_next_ring_packets()
+        else:
+            self._get_next_batch_packets()
+
+    def _get_next_ring_packets(self):
+        """Assemble all packets written into the packet ring by the in-process handler"""
+
+        if self.packet_ring.wait_for_packets(timeout=1):
+            for _ in range(self.packet_ring.num_available()):
+                self._process_packet(self.packet_ring.get_packet())
+                self.packet_ring.release()
 
-        # get the next packet of data from the DCA1000
+        # relay any messages from the handler thread
+        while self._conn_handler.poll():
+            self._conn_relay_handler_message(self._conn_handler.recv())
+
+    def _get_next_batch_packets(self):
+        """Get the next batch of UDP packets from the DCA1000Handler process"""
+
+        # get the next batch of packets from the DCA1000 (received directly into the pre-allocated batch)
         try:
-            msg = self._conn_handler_data.recv_bytes()
+            self._conn_handler_data.recv_bytes_into(self.packet_batch.buffer)
         except EOFError:
             self._conn_send_message_to_print(
                 "DCA1000_Streamer._get_next_frame_packet: DCA1000Handler closed, unable to read data"
@@ -115,98 +249,153 @@ class DCA1000Streamer(_Streamer):
             self.streaming_enabled = False
             return
 
-        # get sequence number
-        packet_seq_num = struct.unpack("<I", msg[0:4])[0]
+        for packet_idx in range(self.packet_batch.num_packets):
+            self._process_packet(self.packet_batch.get_packet(packet_idx))
 
-        # get the byte count
-        byte_data = bytearray(msg[4:10])
-        byte_data.extend([0x00, 0x00])
-        packet_byte_count = struct.unpack("<Q", byte_data)[0]
+        return
 
-        # check for dropped packets
-        self._check_for_dropped_packets(
-            packet_seq_num=packet_seq_num, packet_byte_count=packet_byte_count
-        )
+    def _process_packet(self, packet: memoryview):
+        """Write a single UDP packet into the frame assembler
 
-        # increment the number of udp packets received
-        self.udp_packet_num = packet_seq_num
+        Args:
+            packet (memoryview): the UDP packet (including the 10 byte header)
+        """
 
-        # increment the udp byte count by the number of samples already received
-        self.udp_byte_count += len(msg[10:])
+        # get sequence number and byte count (48 bit value stored as 32 bit low + 16 bit high)
+        (
+            packet_seq_num,
+            byte_count_low,
+            byte_count_high,
+        ) = DCA1000DataPacket.HEADER.unpack_from(packet)
+        packet_byte_count = byte_count_low | (byte_count_high << 32)
 
-        # add the newly recorded samples to the byte buffer
-        self.byte_buffer.extend(msg[10:])
+        # check for dropped packets
+        self._check_for_dropped_packets(packet_seq_num=packet_seq_num)
 
-        # check for new frames
-        self._check_for_new_frame()
+        # increment the number of udp packets received (late packets don't move the counters backwards)
+        self.udp_packet_num = max(self.udp_packet_num, packet_seq_num)
 
-        return
+        # write the newly recorded samples into the current frame (completed frames are sent by _on_new_frame)
+        payload = packet[DCA1000DataPacket.HEADER.size :]
+        self.udp_byte_count = max(self.udp_byte_count, packet_byte_count + len(payload))
+        self.frame_assembler.add_packet(packet_byte_count, payload)
 
-    def _check_for_dropped_packets(self, packet_seq_num, packet_byte_count):
-        """Check for dropped packets and missing samples
+    def _check_for_dropped_packets(self, packet_seq_num):
+        """Check for dropped packets (missing samples are zero filled by the frame assembler)
 
         Args:
             packet_seq_num (int): the packet sequence number from the most recently received UDP packet
-            packet_byte_count (int): the packet byte count listed in the most recently received UDP packet
         """
         # check for dropped packets
-        if packet_seq_num != (self.udp_packet_num + 1):
+        if packet_seq_num > (self.udp_packet_num + 1):
             # log the dropped packets
             self.dropped_udp_packets += packet_seq_num - self.udp_packet_num - 1
+        elif packet_seq_num < self.udp_packet_num and self.dropped_udp_packets > 0:
+            # a late packet filled one of the gaps logged as dropped
+            self.dropped_udp_packets -= 1
 
-        # check for dropped samples
-        if packet_byte_count > self.udp_byte_count:
-            # zero padd the byte_buffer to correct the error
-            zero_padding = bytearray(packet_byte_count - self.udp_byte_count)
-
-            self.byte_buffer.extend(zero_padding)
-
-            # update the upp_byte_count
-            self.udp_byte_count += len(zero_padding)
-
-    def _check_for_new_frame(self):
-        # check to see if there are now enough samples for a new frame detection
-
-        if len(self.byte_buffer) >= self.num_bytes_per_frame:
-            # save the bytes associated with the new frame
-            self.current_packet = self.byte_buffer[: self.num_bytes_per_frame]
-
-            # remove the current packet's bytes from the byte buffer
-            if len(self.byte_buffer) == self.num_bytes_per_frame:
-                self.byte_buffer = bytearray()
-            else:
-                self.byte_buffer = self.byte_buffer[self.num_bytes_per_frame :]
-
-            # send to the processor
-            try:
-                self._conn_processor_data.send_bytes(self.current_packet)
-            except BrokenPipeError:
-                self._conn_send_message_to_print(
-                    "DCA1000Streamer._check_for_new_frame: attempted to send new packet to Processor, but processor was closed"
-                )
-                self._conn_send_parent_error_message()
-                self._stop_streaming()
-                self.streaming_enabled = False
-
-            self.num_detected_frames += 1
-
-            # print if verbose is enabled
-            if self.verbose:
-                # clear the terminal screen
-                self._conn_send_clear_terminal()
-
-                # print out the current packet/frame detection results
-                self._conn_send_message_to_print(
-                    "detected frames: {}".format(self.num_detected_frames)
-                )
-                self._conn_send_message_to_print(
-                    "\t Total UDP Packets: {}".format(self.udp_packet_num)
-                )
-                self._conn_send_message_to_print(
-                    "\t Total UDP Bytes: {}".format(self.udp_byte_count)
-                )
-                self._conn_send_message_to_print(
-                    "\t Dropped Packets: {}".format(self.dropped_udp_packets)
-                )
+    def _on_new_frame(self, frame: np.ndarray):
+        """Called by the frame assembler when a frame has been completed. Publishes the
+        current ring slot to the processor and returns the next slot to assemble into
 
-            return
+        Args:
+            frame (np.ndarray): the completed frame (view of the current ring slot)
+
+        Returns:
+            np.ndarray: view of the next ring slot
+        """
+
+        # send the slot index and sequence number to the processor
+        try:
+            self._conn_processor_data.send_bytes(
+                self.frame_ring.publish(self.frame_slot_idx, self.frame_slot_seq)
+            )
+        except BrokenPipeError:
+            self._conn_send_message_to_print(
+                "DCA1000Streamer._on_new_frame: attempted to send new packet to Processor, but processor was closed"
+            )
+            self._conn_send_parent_error_message()
+            self._stop_streaming()
+            self.streaming_enabled = False
+
+        self.num_detected_frames += 1
+
+        # print if verbose is enabled
+        if self.verbose:
+            # clear the terminal screen
+            self._conn_send_clear_terminal()
+
+            # print out the current packet/frame detection results
+            self._conn_send_message_to_print(
+                "detected frames: {}".format(self.num_detected_frames)
+            )
+            self._conn_send_message_to_print(
+                "\t Total UDP Packets: {}".format(self.udp_packet_num)
+            )
+            self._conn_send_message_to_print(
+                "\t Total UDP Bytes: {}".format(self.udp_byte_count)
+            )
+            self._conn_send_message_to_print(
+                "\t Dropped Packets: {}".format(self.dropped_udp_packets)
+            )
+            self._conn_send_message_to_print(
+                "\t Dropped Frames: {}".format(self.frame_assembler.num_dropped_frames)
+            )
+
+        return self._begin_next_frame_slot()
+
+    def _begin_next_frame_slot(self):
+        """Mark the next ring slot as being written
+
+        Returns:
+            np.ndarray: view of the ring slot to assemble the next frame into
+        """
+        self.frame_slot_idx, self.frame_slot_seq = self.frame_ring.get_next_write_slot()
+        return self.frame_ring.begin_write(self.frame_slot_idx)
+
+    # Handle communication with the in-process handler
+    def _conn_relay_handler_message(self, msg: _Message):
+        """Relay print and error messages from the handler thread to the Radar class
+
+        Args:
+            msg (_Message): message received from the handler thread
+        """
+        match msg.type:
+            case (
+                _MessageTypes.PRINT_TO_TERMINAL
+                | _MessageTypes.PRINT_CLEAR_TERMINAL
+                | _MessageTypes.ERROR
+            ):
+                self._conn_parent.send(msg)
+            case _:
+                pass
+
+    def _conn_recv_handler_init_status(self):
+        """Wait for the handler thread to send its initialization status
+
+        Returns:
+            bool: True on init success, False on init fail
+        """
+        while True:
+            msg: _Message = self._conn_handler.recv()
+            match msg.type:
+                case _MessageTypes.INIT_SUCCESS:
+                    return True
+                case _MessageTypes.INIT_FAIL:
+                    return False
+                case _:
+                    self._conn_relay_handler_message(msg)
+
+    def _conn_send_handler_command(self, command: _MessageTypes):
+        """Send a command to the handler thread and wait for it to be executed
+
+        Args:
+            command (_MessageTypes): the command to send
+        """
+        self._conn_handler.send(_Message(command))
+
+        while True:
+            msg: _Message = self._conn_handler.recv()
+            if msg.type == _MessageTypes.COMMAND_EXECUTED and msg.value == command:
+                return
+            self._conn_relay_handler_message(msg)
@@ -1,9 +1,12 @@
 import socket
+import select
 import struct
+import numpy as np
 from CPSL_TI_Radar._Message import _Message
 from CPSL_TI_Radar._Message import _MessageTypes
 from CPSL_TI_Radar._Background_Process import _BackgroundProcess
 import sys
+import threading
 
 from multiprocessing.connection import Connection
 
@@ -25,12 +28,264 @@ class DCA1000CommandCodes:
     READ_FPGA_VERSION = 0x0E
 
 
+class DCA1000DataPacket:
+    # UDP data packet header (sequence number, byte count low 32 bits, byte count high 16 bits)
+    HEADER = struct.Struct("<IIH")
+
+    # number of ADC bytes in each UDP data packet sent by the DCA1000
+    PAYLOAD_BYTES = 1456
+
+    @staticmethod
+    def packetize(
+        stream: memoryview,
+        byte_count: int,
+        stop_byte: int,
+        seq_num: int,
+        header: bytearray = None,
+    ):
+        """Split part of a DCA1000 data stream into UDP packets (ex: to replay or emulate a DCA1000).
+        Packets are generated until the byte count reaches stop_byte, and the last packet can extend
+        past stop_byte (packets span frame boundaries like the DCA1000's)
+
+        Args:
+            stream (memoryview): the stream bytes starting at byte_count (the last packet is
+                shortened if the stream ends before a full payload)
+            byte_count (int): the stream byte count of the first byte in stream
+            stop_byte (int): the stream byte count to generate packets up to
+            seq_num (int): the sequence number of the first packet
+            header (bytearray, optional): buffer to pack the headers into (re-used for every packet).
+                Defaults to None (a new buffer is allocated).
+
+        Yields:
+            tuple(bytearray,memoryview): the header and payload of each packet (the header is only
+                valid until the next packet is generated)
+        """
+
+        if header is None:
+            header = bytearray(DCA1000DataPacket.HEADER.size)
+
+        offset = 0
+        while byte_count + offset < stop_byte and offset < len(stream):
+            payload = stream[offset : offset + DCA1000DataPacket.PAYLOAD_BYTES]
+            packet_byte_count = byte_count + offset
+            DCA1000DataPacket.HEADER.pack_into(
+                header,
+                0,
+                seq_num,
+                packet_byte_count & 0xFFFFFFFF,
+                packet_byte_count >> 32,
+            )
+            yield header, payload
+
+            offset += len(payload)
+            seq_num += 1
+
+
+class DCA1000PacketBatch:
+    # maximum size of a UDP packet from the DCA1000 (bytes)
+    MAX_PACKET_BYTES = 1472
+
+    def __init__(self, batch_size: int):
+        """Pre-allocated batch of DCA1000 UDP packets that is sent from the
+        DCA1000Handler to the DCA1000Streamer as a single message
+
+        Message layout:
+            num_packets: uint16
+            packet lengths: batch_size x uint16
+            packets: batch_size x MAX_PACKET_BYTES (only the first num_packets rows are sent)
+
+        Args:
+            batch_size (int): maximum number of packets in a batch
+        """
+
+        self.batch_size = int(batch_size)
+        self.header_bytes = 2 * (1 + self.batch_size)
+
+        self.buffer = bytearray(
+            self.header_bytes + self.batch_size * DCA1000PacketBatch.MAX_PACKET_BYTES
+        )
+        self._view = memoryview(self.buffer)
+        self._num_packets = self._view[0:2].cast("H")
+        self._lengths = self._view[2 : self.header_bytes].cast("H")
+
+        # packet matrix (view into the buffer)
+        self.packets = np.ndarray(
+            shape=(self.batch_size, DCA1000PacketBatch.MAX_PACKET_BYTES),
+            dtype=np.uint8,
+            buffer=self.buffer,
+            offset=self.header_bytes,
+        )
+
+        return
+
+    @property
+    def num_packets(self):
+        return self._num_packets[0]
+
+    @num_packets.setter
+    def num_packets(self, value: int):
+        self._num_packets[0] = value
+
+    def _packet_offset(self, idx: int):
+        return self.header_bytes + idx * DCA1000PacketBatch.MAX_PACKET_BYTES
+
+    def packet_buffer(self, idx: int):
+        """Get a writable view of a packet row (used with socket.recv_into)
+
+        Args:
+            idx (int): packet index
+
+        Returns:
+            memoryview: view of the full packet row
+        """
+        offset = self._packet_offset(idx)
+        return self._view[offset : offset + DCA1000PacketBatch.MAX_PACKET_BYTES]
+
+    def set_packet_length(self, idx: int, num_bytes: int):
+        self._lengths[idx] = num_bytes
+
+    def get_packet(self, idx: int):
+        """Get a view of a received packet (no copies are performed)
+
+        Args:
+            idx (int): packet index
+
+        Returns:
+            memoryview: view of the packet
+        """
+        offset = self._packet_offset(idx)
+        return self._view[offset : offset + self._lengths[idx]]
+
+    def message_size(self):
+        """
+        Returns:
+            int: the number of bytes of the buffer to send for the current batch
+        """
+        return self._packet_offset(self.num_packets)
+
+
+class DCA1000PacketRing:
+    def __init__(self, num_slots: int):
+        """Ring of pre-allocated packet slots used to pass UDP packets from a
+        DCA1000Handler running in a receive thread to the DCA1000Streamer in the
+        same process. There is a single writer (receive thread) and a single
+        reader (streamer), so the head and tail counters are only ever updated
+        by one thread each and no locks are required. When the ring is full,
+        new packets are received into a scratch buffer and dropped
+
+        Args:
+            num_slots (int): number of packet slots in the ring
+        """
+
+        self.num_slots = int(num_slots)
+
+        # packet slots
+        self.packets = np.zeros(
+            shape=(self.num_slots, DCA1000PacketBatch.MAX_PACKET_BYTES),
+            dtype=np.uint8,
+        )
+        self._view = memoryview(self.packets).cast("B")
+        self._lengths = [0] * self.num_slots
+
+        # number of packets written (head) and read (tail)
+        self.head = 0
+        self.tail = 0
+
+        # set by the writer when new packets are available
+        self.data_available = threading.Event()
+
+        # buffer used to receive (and drop) packets when the ring is full
+        self._overrun_buffer = memoryview(
+            bytearray(DCA1000PacketBatch.MAX_PACKET_BYTES)
+        )
+        self._overrun = False
+        self.num_overrun_packets = 0
+
+        return
+
+    def reset(self):
+        """Empty the ring (only call when the writer is stopped)"""
+        self.head = 0
+        self.tail = 0
+        self.num_overrun_packets = 0
+        self.data_available.clear()
+
+    def _slot_view(self, idx: int):
+        offset = idx * DCA1000PacketBatch.MAX_PACKET_BYTES
+        return self._view[offset : offset + DCA1000PacketBatch.MAX_PACKET_BYTES]
+
+    # writing packets
+    def get_write_buffer(self):
+        """Get the buffer to receive the next packet into (used with socket.recv_into)
+
+        Returns:
+            memoryview: view of the next free slot (or of a scratch buffer if the ring is full)
+        """
+        self._overrun = (self.head - self.tail) >= self.num_slots
+        if self._overrun:
+            return self._overrun_buffer
+        return self._slot_view(self.head % self.num_slots)
+
+    def commit(self, num_bytes: int):
+        """Make the packet received into the write buffer available to the reader
+
+        Args:
+            num_bytes (int): number of bytes received
+        """
+        if self._overrun:
+            self.num_overrun_packets += 1
+        else:
+            self._lengths[self.head % self.num_slots] = num_bytes
+            self.head += 1
+
+    def notify(self):
+        """Wake up the reader"""
+        self.data_available.set()
+
+    # reading packets
+    def num_available(self):
+        return self.head - self.tail
+
+    def wait_for_packets(self, timeout: float):
+        """Wait until packets are available to be read
+
+        Args:
+            timeout (float): maximum time to wait (seconds)
+
+        Returns:
+            bool: True if packets are available
+        """
+        if self.head != self.tail:
+            return True
+
+        self.data_available.clear()
+        if self.head != self.tail:
+            return True
+
+        return self.data_available.wait(timeout)
+
+    def get_packet(self):
+        """Get a view of the oldest packet in the ring (no copies are performed).
+        Call release() once finished with the packet
+
+        Returns:
+            memoryview: view of the packet
+        """
+        idx = self.tail % self.num_slots
+        return self._slot_view(idx)[: self._lengths[idx]]
+
+    def release(self):
+        """Release the oldest packet so that its slot can be re-used"""
+        self.tail += 1
+
+
 class DCA1000Handler(_BackgroundProcess):
     def __init__(
         self,
         conn_parent: Connection,
         conn_handler_data: Connection,
         settings_file_path="config_RADAR.json",
+        packet_ring: DCA1000PacketRing = None,
     ):
         """Initialize the DCA1000 handler for given ip address, command port, and data port
 
@@ -38,6 +293,9 @@ class DCA1000Handler(_BackgroundProcess):
             ip_address (str, optional): IP address of DCA1000 FPGA. Defaults to '1.9.168.33.180'.
             cmd_port (int, optional): Port for DCA1000 command interfaces. Defaults to 4096.
             data_port (int, optional): Port for DCA1000 raw data streaming. Defaults to 4098.
+            packet_ring (DCA1000PacketRing, optional): when running in the same process as the
+                DCA1000Streamer, packets are written into this ring instead of being sent
+                over conn_handler_data. Defaults to None.
         Returns:
             bool: True if DCA1000 initialized correctly, False if not
         """
@@ -71,6 +329,16 @@ class DCA1000Handler(_BackgroundProcess):
         self.data_socket_bound = False
         self.streaming_enabled = False
 
+        # batched packet receive
+        self.packet_batch: DCA1000PacketBatch = None
+        self.packet_ring = packet_ring
+        self.socket_rcvbuf_bytes = 0
+
+        # packets per wakeup statistics (histogram indexed by the number of packets received per wakeup)
+        self.num_wakeups = 0
+        self.num_received_packets = 0
+        self.packets_per_wakeup = None
+
         # initialize connection information
         self._init_DCA1000_connection_information()
 
@@ -102,6 +370,17 @@ class DCA1000Handler(_BackgroundProcess):
         self.data_port = self._settings["Streamer"]["DCA1000_streaming"]["data_port"]
         self.cmd_port = self._settings["Streamer"]["DCA1000_streaming"]["cmd_port"]
 
+        # batched receive settings
+        self.packet_batch = DCA1000PacketBatch(
+            self._settings["Streamer"]["DCA1000_streaming"]["packet_batch_size"]
+        )
+        self.packets_per_wakeup = np.zeros(
+            self.packet_batch.batch_size + 1, dtype=np.int64
+        )
+        self.socket_rcvbuf_bytes = int(
+            self._settings["Streamer"]["DCA1000_streaming"]["socket_rcvbuf_bytes"]
+        )
+
     def _init_ethernet_sockets(self):
         """Bind to the cmd and data ethernet ports. Handle errors accordingly"""
 
@@ -126,13 +405,34 @@ class DCA1000Handler(_BackgroundProcess):
             # Default, set the socket to send/receive from ("192.168.33.30",4098)
             self.data_socket.bind((self.system_IP, self.data_port))
             self.data_socket_bound = True
-            self.data_socket.settimeout(1)
+
+            # non-blocking so that all available packets can be drained per wakeup (see get_next_udp_packet)
+            self.data_socket.setblocking(False)
+            self._set_data_socket_rcvbuf()
         except socket.error:
             self._conn_send_message_to_print(
                 "DCA1000._init_ethernet_sockets: Failed to connect to data socket"
             )
             self.init_success = False
 
+    def _set_data_socket_rcvbuf(self):
+        """Increase the receive buffer of the data socket so that bursts of packets
+        are not dropped by the kernel while the handler is busy"""
+
+        self.data_socket.setsockopt(
+            socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_rcvbuf_bytes
+        )
+        actual_rcvbuf_bytes = self.data_socket.getsockopt(
+            socket.SOL_SOCKET, socket.SO_RCVBUF
+        )
+
+        if actual_rcvbuf_bytes < self.socket_rcvbuf_bytes:
+            self._conn_send_message_to_print(
+                "DCA1000._set_data_socket_rcvbuf: requested {} byte receive buffer, but only {} bytes were allocated (check net.core.rmem_max)".format(
+                    self.socket_rcvbuf_bytes, actual_rcvbuf_bytes
+                )
+            )
+
     def close(self):
         """Close all sockets if they are currently open"""
         if self.streaming_enabled:
@@ -330,8 +630,26 @@ class DCA1000Handler(_BackgroundProcess):
 
     # obtaining packets from the DCA1000 FPGA
     def get_next_udp_packet(self):
+        """Wait for the next UDP packet, drain all other available packets
+        (up to the batch size) and forward them to the streamer"""
+
         try:
-            msg, server = self.data_socket.recvfrom(1472)
+            # wait for the next packet
+            readable, _, _ = select.select([self.data_socket], [], [], 1)
+            if not readable:
+                raise socket.timeout("timed out")
+
+            # receive all available packets
+            num_packets = 0
+            while num_packets < self.packet_batch.batch_size:
+                try:
+                    num_bytes = self.data_socket.recv_into(
+                        self._get_packet_buffer(num_packets)
+                    )
+                except BlockingIOError:
+                    break
+                self._commit_packet(num_packets, num_bytes)
+                num_packets += 1
         except socket.error as e:
             self._conn_send_message_to_print(
                 "DCA1000Handler.get_next_udp_packet: experienced the following socket error when attempting to get next packet:{}".format(
@@ -343,9 +661,54 @@ class DCA1000Handler(_BackgroundProcess):
             self.streaming_enabled = False
             return
 
-        # send the message to the streamer class
+        if num_packets == 0:
+            return
+
+        # update packets per wakeup statistics
+        self.num_wakeups += 1
+        self.num_received_packets += num_packets
+        self.packets_per_wakeup[num_packets] += 1
+
+        self._forward_packets(num_packets)
+
+    def _get_packet_buffer(self, idx: int):
+        """Get the buffer to receive the next packet into
+
+        Args:
+            idx (int): index of the packet in the current wakeup
+
+        Returns:
+            memoryview: buffer for socket.recv_into
+        """
+        if self.packet_ring:
+            return self.packet_ring.get_write_buffer()
+        else:
+            return self.packet_batch.packet_buffer(idx)
+
+    def _commit_packet(self, idx: int, num_bytes: int):
+        if self.packet_ring:
+            self.packet_ring.commit(num_bytes)
+        else:
+            self.packet_batch.set_packet_length(idx, num_bytes)
+
+    def _forward_packets(self, num_packets: int):
+        """Forward the packets received in the current wakeup to the streamer
+
+        Args:
+            num_packets (int): the number of packets received
+        """
+
+        # packets were written directly into the streamer's ring
+        if self.packet_ring:
+            self.packet_ring.notify()
+            return
+
+        # send the batch to the streamer class
+        self.packet_batch.num_packets = num_packets
         try:
-            self._conn_handler_data.send_bytes(msg)
+            self._conn_handler_data.send_bytes(
+                self.packet_batch.buffer, 0, self.packet_batch.message_size()
+            )
         except BrokenPipeError:
             self._conn_send_message_to_print(
                 "DCA1000Handler.get_next_udp_packet: attempted to send new udp packet to Streamer, but streamer was closed"
@@ -354,6 +717,34 @@ class DCA1000Handler(_BackgroundProcess):
             self._stop_streaming()
             self.streaming_enabled = False
 
+    def _print_batch_statistics(self):
+        """Print the packets per wakeup statistics for the last streaming session"""
+
+        if self.num_wakeups == 0:
+            return
+
+        self._conn_send_message_to_print(
+            "DCA1000Handler: received {} packets in {} wakeups (avg: {:.1f}, max: {} packets per wakeup, full batches: {})".format(
+                self.num_received_packets,
+                self.num_wakeups,
+                self.num_received_packets / self.num_wakeups,
+                int(np.flatnonzero(self.packets_per_wakeup)[-1]),
+                int(self.packets_per_wakeup[-1]),
+            )
+        )
+
+        if self.packet_ring and self.packet_ring.num_overrun_packets > 0:
+            self._conn_send_message_to_print(
+                "DCA1000Handler: dropped {} packets due to a full packet ring (increase packet_ring_slots)".format(
+                    self.packet_ring.num_overrun_packets
+                )
+            )
+
+    def _reset_batch_statistics(self):
+        self.num_wakeups = 0
+        self.num_received_packets = 0
+        self.packets_per_wakeup[:] = 0
+
     # Handle starting and stopping streaming
     def _start_streaming(self):
         """Start streaming on DCA1000"""
@@ -379,6 +770,7 @@ class DCA1000Handler(_BackgroundProcess):
 
         if success:
             self.streaming_enabled = True
+            self._reset_batch_statistics()
         else:
             self.streaming_enabled = False
             self._conn_send_message_to_print(
@@ -416,6 +808,8 @@ class DCA1000Handler(_BackgroundProcess):
 
         if success:
             self.streaming_enabled = False
+            self._print_batch_statistics()
+            self._reset_batch_statistics()
         else:
             self.streaming_enabled = False  # disable streaming due to error
             self._conn_send_message_to_print(
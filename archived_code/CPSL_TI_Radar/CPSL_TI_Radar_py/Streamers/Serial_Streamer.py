@@ -6,6 +6,7 @@ import sys
 from multiprocessing.connection import Connection
 from CPSL_TI_Radar._Message import _Message, _MessageTypes
 from CPSL_TI_Radar.Streamers._Streamer import _Streamer
+from CPSL_TI_Radar.Streamers._TLV_Packet_Parser import _TLVPacketParser
 
 
 class SerialStreamer(_Streamer):
@@ -38,9 +39,12 @@ class SerialStreamer(_Streamer):
 
         # initialize the serial packet detector
         self.detected_packets = 0
-        self.magic_word = bytearray([0x02, 0x01, 0x04, 0x03, 0x06, 0x05, 0x08, 0x07])
+        self.magic_word = bytearray(_TLVPacketParser.MAGIC_WORD)
         self.header = {}
 
+        # splits the serial byte stream into packets
+        self.packet_parser = _TLVPacketParser()
+
         self._conn_send_init_status(self.init_success)
         self.run()
 
@@ -63,11 +67,9 @@ class SerialStreamer(_Streamer):
         )
 
     def _get_next_frame_packet(self):
-        # read the new packet (strip off the magic word)
+        # read all of the available bytes (waits for new data if none are available)
         try:
-            self.byte_buffer = self.serial_port.read_until(expected=self.magic_word)[
-                :-8
-            ]
+            self.packet_parser.read_from(self.serial_port)
         except serial.SerialTimeoutException:
             self._conn_send_message_to_print(
                 "Streamer._get_next_packet_serial: Timed out waiting for new data. serial port closed"
@@ -77,30 +79,30 @@ class SerialStreamer(_Streamer):
             self.streaming_enabled = False
             return
 
-        # store the new packet in a bytearray
-        self.current_packet = bytearray(self.magic_word)
-        self.current_packet.extend(self.byte_buffer)
+        for packet in self.packet_parser.get_packets():
+            # packets are views into the parser's buffer (no copies)
+            self.current_packet = packet
 
-        # increment the packet count
-        self.detected_packets += 1
+            # increment the packet count
+            self.detected_packets += 1
 
-        # decode the header
-        if len(self.current_packet) <= 36:
-            return 
-        else:
+            # decode the header
             self._serial_decode_header(self.current_packet[:36])
 
-        # check packet validity
-        packet_valid = self._serial_check_packet_valid()
+            # check packet validity
+            packet_valid = self._serial_check_packet_valid()
+
+            if packet_valid:
+                try:
+                    self._conn_processor_data.send_bytes(self.current_packet)
+                except BrokenPipeError:
+                    self._conn_send_message_to_print(
+                        "SerialStreamer._serial_get_next_packet: attempted to send new packet to Processor, but processor was closed"
+                    )
+                    self._conn_send_parent_error_message()
 
-        if packet_valid:
-            try:
-                self._conn_processor_data.send_bytes(self.current_packet)
-            except BrokenPipeError:
-                self._conn_send_message_to_print(
-                    "SerialStreamer._serial_get_next_packet: attempted to send new packet to Processor, but processor was closed"
-                )
-                self._conn_send_parent_error_message()
+        # release the view into the parser's buffer
+        self.current_packet = bytearray()
 
         return
 
@@ -184,7 +186,6 @@ class SerialStreamer(_Streamer):
         # flush the input buffer
         self.serial_port.reset_input_buffer()
 
-        # find the first magic word in the buffer
-        # NOTE: the first packet received is not likely to be complete,
-        # and is thus thrown out
-        self.serial_port.read_until(expected=self.magic_word)
+        # NOTE: the packet parser discards the bytes before the first magic word
+        # (the first packet received is not likely to be complete)
+        self.packet_parser.reset()
@@ -0,0 +1,181 @@
+import numpy as np
+
+
+class _FrameAssembler:
+    def __init__(self, num_bytes_per_frame: int, frame_complete_callback=None):
+        """Assemble DCA1000 UDP payloads into frames. Each payload is written
+        directly into its position in a pre-allocated frame buffer (determined
+        by the byte count field of the UDP packet) so that no intermediate
+        buffers are allocated while streaming.
+
+        Args:
+            num_bytes_per_frame (int): the number of bytes in a single frame
+            frame_complete_callback (function, optional): called with the frame buffer
+                (np.ndarray of uint8) each time a frame is completed. The frame buffer is only valid
+                for the duration of the call. The callback may return a new np.ndarray to
+                assemble the next frame into (ex: a shared memory slot), or None to re-use
+                the current frame buffer. Defaults to None.
+        """
+
+        self.num_bytes_per_frame = int(num_bytes_per_frame)
+        self.frame_complete_callback = frame_complete_callback
+
+        # buffer that the current frame is assembled in
+        self.frame_buffer: np.ndarray = None
+        self._frame_view: memoryview = None
+
+        # stream position (in bytes) of the start of the current frame and
+        # of the next byte expected from the DCA1000
+        self.frame_start_byte = 0
+        self.next_byte = 0
+
+        # (start byte, end byte) stream positions of the zero filled bytes in the current frame
+        self._zero_filled_ranges = []
+
+        # status counters
+        self.num_frames = 0
+        self.num_dropped_frames = 0
+        self.num_zero_filled_bytes = 0
+        self.num_late_packets = 0
+
+        self.reset(np.zeros(self.num_bytes_per_frame, dtype=np.uint8))
+
+        return
+
+    def reset(self, frame_buffer: np.ndarray = None):
+        """Reset the assembler to the start of a new stream (byte count of 0)
+
+        Args:
+            frame_buffer (np.ndarray, optional): uint8 buffer to assemble the next frame into.
+                Defaults to None (continue using the current frame buffer).
+        """
+
+        if frame_buffer is not None:
+            self._set_frame_buffer(frame_buffer)
+
+        self.frame_start_byte = 0
+        self.next_byte = 0
+        self._zero_filled_ranges = []
+
+    def _set_frame_buffer(self, frame_buffer: np.ndarray):
+        self.frame_buffer = frame_buffer
+        self._frame_view = memoryview(frame_buffer).cast("B")
+
+    def add_packet(self, byte_count: int, payload):
+        """Write the payload of a DCA1000 UDP packet into the frame buffer
+
+        Args:
+            byte_count (int): the byte count field of the UDP packet (number of
+                bytes streamed before this packet)
+            payload (bytes-like): the ADC data in the UDP packet (header removed). Use a
+                memoryview to avoid copies.
+        """
+
+        num_bytes = len(payload)
+
+        # packet arrived after later packets were already received
+        if byte_count < self.next_byte:
+            self._add_late_packet(byte_count, payload)
+            return
+
+        # zero fill any missing bytes
+        if byte_count > self.next_byte:
+            self._zero_fill(byte_count)
+
+        # copy the payload into the frame buffer, completing frames as required
+        payload_idx = 0
+        while payload_idx < num_bytes:
+            frame_idx = self.next_byte - self.frame_start_byte
+            num_to_copy = min(
+                num_bytes - payload_idx, self.num_bytes_per_frame - frame_idx
+            )
+
+            self._frame_view[frame_idx : frame_idx + num_to_copy] = payload[
+                payload_idx : payload_idx + num_to_copy
+            ]
+
+            payload_idx += num_to_copy
+            self.next_byte += num_to_copy
+
+            if frame_idx + num_to_copy == self.num_bytes_per_frame:
+                self._complete_frame()
+
+    def _add_late_packet(self, byte_count: int, payload):
+        """Write a packet that arrived out of order into the zero filled bytes of
+        the current frame (bytes that were already received, ex: from a duplicate
+        packet, are left unchanged)
+
+        Args:
+            byte_count (int): the byte count field of the UDP packet
+            payload (bytes-like): the ADC data in the UDP packet
+        """
+        self.num_late_packets += 1
+
+        packet_end_byte = byte_count + len(payload)
+
+        remaining_ranges = []
+        for fill_start_byte, fill_end_byte in self._zero_filled_ranges:
+            start_byte = max(byte_count, fill_start_byte)
+            end_byte = min(packet_end_byte, fill_end_byte)
+
+            if start_byte >= end_byte:
+                remaining_ranges.append((fill_start_byte, fill_end_byte))
+                continue
+
+            self._frame_view[
+                start_byte - self.frame_start_byte : end_byte - self.frame_start_byte
+            ] = payload[start_byte - byte_count : end_byte - byte_count]
+            self.num_zero_filled_bytes -= end_byte - start_byte
+
+            # keep the parts of the range that are still zero filled
+            if fill_start_byte < start_byte:
+                remaining_ranges.append((fill_start_byte, start_byte))
+            if end_byte < fill_end_byte:
+                remaining_ranges.append((end_byte, fill_end_byte))
+
+        self._zero_filled_ranges = remaining_ranges
+
+    def _zero_fill(self, byte_count: int):
+        """Zero fill the frame buffer up to the given stream position. Frames that
+        would be entirely zero are dropped instead of being sent
+
+        Args:
+            byte_count (int): the stream position of the next received byte
+        """
+
+        while self.next_byte < byte_count:
+            frame_end_byte = self.frame_start_byte + self.num_bytes_per_frame
+
+            if byte_count >= frame_end_byte and self.next_byte == self.frame_start_byte:
+                # the entire frame was missed
+                num_missed_frames = (
+                    byte_count - self.frame_start_byte
+                ) // self.num_bytes_per_frame
+                self.num_dropped_frames += num_missed_frames
+                self.frame_start_byte += num_missed_frames * self.num_bytes_per_frame
+                self.next_byte = self.frame_start_byte
+            else:
+                fill_end_byte = min(byte_count, frame_end_byte)
+                self.frame_buffer[
+                    self.next_byte
+                    - self.frame_start_byte : fill_end_byte
+                    - self.frame_start_byte
+                ] = 0
+                self.num_zero_filled_bytes += fill_end_byte - self.next_byte
+                self._zero_filled_ranges.append((self.next_byte, fill_end_byte))
+                self.next_byte = fill_end_byte
+
+                if fill_end_byte == frame_end_byte:
+                    self._complete_frame()
+
+    def _complete_frame(self):
+        """Send the completed frame to the callback and start the next frame"""
+
+        self.num_frames += 1
+        self.frame_start_byte += self.num_bytes_per_frame
+        self._zero_filled_ranges = []
+
+        if self.frame_complete_callback:
+            next_frame_buffer = self.frame_complete_callback(self.frame_buffer)
+            if next_frame_buffer is not None:
+                self._set_frame_buffer(next_frame_buffer)
@@ -0,0 +1,153 @@
+class _TLVPacketParser:
+    MAGIC_WORD = bytes([0x02, 0x01, 0x04, 0x03, 0x06, 0x05, 0x08, 0x07])
+
+    # bytes needed to read the packet length from the header
+    # (magic word, version, total packet length)
+    PACKET_LENGTH_OFFSET = 12
+    MIN_HEADER_BYTES = 16
+
+    # smallest valid packet (the SDK 2.1 header, the SDK 3.5 header is 40 bytes)
+    MIN_PACKET_LENGTH = 36
+
+    def __init__(self, buffer_size: int = 2**20):
+        """Streaming parser that splits the TLV packets sent by the IWR demos out of a byte stream.
+        Bytes are read in large chunks directly into a pre-allocated buffer, magic words are found
+        with bytearray.find(), and each packet is validated using the packet length in its header.
+
+        Args:
+            buffer_size (int, optional): size of the buffer (in bytes), must be larger than the
+                largest packet. Defaults to 2**20.
+        """
+
+        self.buffer_size = int(buffer_size)
+        self._buffer = bytearray(self.buffer_size)
+        self._view = memoryview(self._buffer)
+
+        # unparsed bytes are stored in _buffer[_start:_end]
+        self._start = 0
+        self._end = 0
+
+        # status counters
+        self.num_packets = 0
+        self.num_discarded_bytes = 0
+        self.num_invalid_headers = 0
+
+        return
+
+    def reset(self):
+        """Discard all unparsed bytes (ex: after flushing the serial port)"""
+        self._start = 0
+        self._end = 0
+
+    @property
+    def num_buffered_bytes(self):
+        return self._end - self._start
+
+    def read_from(self, serial_port):
+        """Read all of the bytes waiting on a serial port into the buffer (waits for at least
+        one byte or until the serial port times out)
+
+        Args:
+            serial_port (serial.Serial): the serial port to read from
+
+        Returns:
+            int: the number of bytes read
+        """
+
+        write_view = self._get_write_view(max(serial_port.in_waiting, 1))
+        num_bytes = serial_port.readinto(write_view)
+        write_view.release()
+
+        self._end += num_bytes
+        return num_bytes
+
+    def write(self, data):
+        """Add bytes from another source (ex: a recorded serial stream) to the buffer
+
+        Args:
+            data (bytes-like): the bytes to add (must fit in the buffer)
+        """
+
+        num_bytes = len(data)
+        write_view = self._get_write_view(num_bytes)
+        if len(write_view) < num_bytes:
+            raise ValueError(
+                "_TLVPacketParser.write: {} bytes do not fit in the buffer".format(
+                    num_bytes
+                )
+            )
+        write_view[:] = data
+        write_view.release()
+
+        self._end += num_bytes
+
+    def _get_write_view(self, num_bytes: int):
+        """Get a view of the free space at the end of the buffer, moving the unparsed bytes
+        to the start of the buffer when there is not enough space left
+
+        Args:
+            num_bytes (int): the number of bytes to write
+
+        Returns:
+            memoryview: view of up to num_bytes of free space
+        """
+
+        if self.buffer_size - self._end < num_bytes and self._start > 0:
+            num_buffered_bytes = self._end - self._start
+            self._view[:num_buffered_bytes] = self._view[self._start : self._end]
+            self._start = 0
+            self._end = num_buffered_bytes
+
+        # discard the buffer if it is full without a complete packet
+        if self._end == self.buffer_size:
+            self.num_discarded_bytes += self._end - self._start
+            self.reset()
+
+        return self._view[self._end : min(self._end + num_bytes, self.buffer_size)]
+
+    def get_packets(self):
+        """Get the complete packets in the buffer. Bytes before a magic word and packets
+        with invalid headers are discarded
+
+        Yields:
+            memoryview: each complete packet (magic word included). The views are only valid
+                until the next read_from() or write() call
+        """
+
+        while True:
+            idx = self._buffer.find(self.MAGIC_WORD, self._start, self._end)
+            if idx < 0:
+                # keep the bytes that could be the start of a magic word
+                start = max(self._start, self._end - len(self.MAGIC_WORD) + 1)
+                self.num_discarded_bytes += start - self._start
+                self._start = start
+                return
+
+            self.num_discarded_bytes += idx - self._start
+            self._start = idx
+
+            if self._end - idx < self.MIN_HEADER_BYTES:
+                return
+
+            packet_length = int.from_bytes(
+                self._view[
+                    idx + self.PACKET_LENGTH_OFFSET : idx + self.MIN_HEADER_BYTES
+                ],
+                "little",
+            )
+            if (
+                packet_length < self.MIN_PACKET_LENGTH
+                or packet_length > self.buffer_size
+            ):
+                # not a valid header, search for the next magic word
+                self.num_invalid_headers += 1
+                self.num_discarded_bytes += 1
+                self._start = idx + 1
+                continue
+
+            if self._end - idx < packet_length:
+                return
+
+            self._start = idx + packet_length
+            self.num_packets += 1
+            yield self._view[idx : idx + packet_length]
@@ -76,12 +76,8 @@ class _BackgroundProcess:
             _type_: json
         """
 
-        # open the JSON file
-        f = open(json_file_path)
-        content = ""
-        for line in f:
-            content += line
-        return json.loads(content)
+        with open(json_file_path) as f:
+            return json.load(f)
 
     ## Initialize a serial port if required
 
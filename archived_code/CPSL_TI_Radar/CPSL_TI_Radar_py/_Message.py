@@ -1,6 +1,6 @@
 class _MessageTypes:
     # largest hex value corresponding to a message
-    _LARGEST_MESSAGE_VALUE = 0x0E
+    _LARGEST_MESSAGE_VALUE = 0x0F
 
     # init messages
     INIT_SUCCESS = 0x00
@@ -36,6 +36,9 @@ class _MessageTypes:
     # Other Errors
     ERROR = 0x0E
 
+    # Processor frame statistics (value is a dict of frame counters)
+    FRAME_STATS = 0x0F
+
 
 class _Message:
     def __init__(self, type, value=None):
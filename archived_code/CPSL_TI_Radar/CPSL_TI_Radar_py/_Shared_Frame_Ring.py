@@ -0,0 +1,274 @@
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+import os
+import struct
+import sys
+import threading
+
+def create_segment(name: str, size: int):
+    """Create a new shared memory segment, replacing any stale segment with the same name
+
+    Args:
+        name (str): name of the shared memory segment
+        size (int): size of the segment in bytes
+
+    Returns:
+        shared_memory.SharedMemory: the new segment (unlink it when it is no longer needed)
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        # remove a stale segment left over from a previous run
+        stale_shm = shared_memory.SharedMemory(name=name, create=False)
+        stale_shm.close()
+        stale_shm.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+# serializes attach_segment() while the resource tracker registration is disabled
+_attach_lock = threading.Lock()
+
+
+def attach_segment(name: str):
+    """Attach to an existing shared memory segment without registering it with the resource tracker.
+    Only the creator manages the lifetime of a segment (the attaching process's resource tracker would
+    otherwise unlink it when the process exits, or report an error when the creator unlinks it)
+
+    Args:
+        name (str): name of the shared memory segment
+
+    Returns:
+        shared_memory.SharedMemory: the attached segment
+    """
+    if os.name != "posix":
+        return shared_memory.SharedMemory(name=name, create=False)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=False, track=False)
+
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name, create=False)
+        finally:
+            resource_tracker.register = register
+
+
+class _SharedFrameRing:
+    """Ring of pre-allocated frame slots stored in shared memory. The writer
+    (Streamer) copies each new frame into the next slot and only sends the
+    slot index and sequence number over the data Pipe, the reader (Processor)
+    then accesses the frame directly from the slot without any additional copies
+
+    Shared memory layout:
+        header: _HEADER_FIELDS x uint64 (num_slots, num_bytes_per_frame, latest sequence number)
+        slot sequence numbers: num_slots x uint64 (0 while a slot is being written)
+        slots: num_slots x num_bytes_per_frame bytes (each slot 64 byte aligned)
+    """
+
+    # header fields
+    _HEADER_FIELDS = 8
+    _HEADER_NUM_SLOTS = 0
+    _HEADER_NUM_BYTES_PER_FRAME = 1
+    _HEADER_LATEST_SEQ = 2
+
+    # alignment of each frame slot in bytes
+    _SLOT_ALIGNMENT = 64
+
+    # format of the messages sent over the data Pipe (slot index, sequence number)
+    _MESSAGE_FORMAT = "<IQ"
+
+    def __init__(
+        self,
+        name: str,
+        num_slots: int = 0,
+        num_bytes_per_frame: int = 0,
+        create: bool = False,
+    ):
+        """Create a new shared frame ring or attach to an existing one
+
+        Args:
+            name (str): name of the shared memory segment
+            num_slots (int, optional): number of frame slots (only used when create is True). Defaults to 0.
+            num_bytes_per_frame (int, optional): number of bytes in each frame (only used when create is True). Defaults to 0.
+            create (bool, optional): on True, creates a new segment (replacing any stale segment
+                with the same name). On False, attaches to an existing segment. Defaults to False.
+        """
+
+        self.name = name
+        self._created = create
+
+        if create:
+            self.num_slots = int(num_slots)
+            self.num_bytes_per_frame = int(num_bytes_per_frame)
+            self._shm = create_segment(
+                name, self._compute_segment_size(self.num_slots, self.num_bytes_per_frame)
+            )
+            self._map_segment()
+            self._header[:] = 0
+            self._slot_seqs[:] = 0
+            self._header[_SharedFrameRing._HEADER_NUM_SLOTS] = self.num_slots
+            self._header[
+                _SharedFrameRing._HEADER_NUM_BYTES_PER_FRAME
+            ] = self.num_bytes_per_frame
+        else:
+            self._shm = attach_segment(name)
+
+            # read the ring geometry from the header
+            header = np.ndarray(
+                shape=(_SharedFrameRing._HEADER_FIELDS,),
+                dtype=np.uint64,
+                buffer=self._shm.buf,
+            )
+            self.num_slots = int(header[_SharedFrameRing._HEADER_NUM_SLOTS])
+            self.num_bytes_per_frame = int(
+                header[_SharedFrameRing._HEADER_NUM_BYTES_PER_FRAME]
+            )
+            del header
+            self._map_segment()
+
+        return
+
+    @staticmethod
+    def name_from_settings(DCA1000_settings: dict):
+        """Generate a unique segment name for a given DCA1000 so that multiple
+        radars can be run on the same machine
+
+        Args:
+            DCA1000_settings (dict): the ["Streamer"]["DCA1000_streaming"] settings
+
+        Returns:
+            str: the name of the shared memory segment
+        """
+        return "cpsl_frames_{}_{}".format(
+            DCA1000_settings["system_IP"].replace(".", "_"),
+            DCA1000_settings["data_port"],
+        )
+
+    @staticmethod
+    def _compute_slot_stride(num_bytes_per_frame: int):
+        alignment = _SharedFrameRing._SLOT_ALIGNMENT
+        return ((num_bytes_per_frame + alignment - 1) // alignment) * alignment
+
+    @staticmethod
+    def _compute_segment_size(num_slots: int, num_bytes_per_frame: int):
+        header_bytes = 8 * (_SharedFrameRing._HEADER_FIELDS + num_slots)
+        header_bytes = _SharedFrameRing._compute_slot_stride(header_bytes)
+        return header_bytes + num_slots * _SharedFrameRing._compute_slot_stride(
+            num_bytes_per_frame
+        )
+
+    def _map_segment(self):
+        """Create numpy views into the header, slot sequence numbers, and frame slots"""
+
+        self._header = np.ndarray(
+            shape=(_SharedFrameRing._HEADER_FIELDS,),
+            dtype=np.uint64,
+            buffer=self._shm.buf,
+        )
+        self._slot_seqs = np.ndarray(
+            shape=(self.num_slots,),
+            dtype=np.uint64,
+            buffer=self._shm.buf,
+            offset=8 * _SharedFrameRing._HEADER_FIELDS,
+        )
+
+        slot_stride = _SharedFrameRing._compute_slot_stride(self.num_bytes_per_frame)
+        slots_offset = _SharedFrameRing._compute_slot_stride(
+            8 * (_SharedFrameRing._HEADER_FIELDS + self.num_slots)
+        )
+        self._slots = np.ndarray(
+            shape=(self.num_slots, self.num_bytes_per_frame),
+            dtype=np.uint8,
+            buffer=self._shm.buf,
+            offset=slots_offset,
+            strides=(slot_stride, 1),
+        )
+
+    # writing frames
+    def get_next_write_slot(self):
+        """Get the index and sequence number of the next slot to be written
+
+        Returns:
+            tuple(int,int): slot index and sequence number for the next frame
+        """
+        seq = int(self._header[_SharedFrameRing._HEADER_LATEST_SEQ]) + 1
+        return (seq - 1) % self.num_slots, seq
+
+    def begin_write(self, slot_idx: int):
+        """Mark a slot as being written so that readers can detect an overwritten frame
+
+        Args:
+            slot_idx (int): the slot to be written
+
+        Returns:
+            np.ndarray: uint8 view of the slot to write the frame into
+        """
+        self._slot_seqs[slot_idx] = 0
+        return self._slots[slot_idx]
+
+    def publish(self, slot_idx: int, seq: int):
+        """Mark a slot as containing a complete frame
+
+        Args:
+            slot_idx (int): the slot that was written
+            seq (int): the sequence number of the frame in the slot
+
+        Returns:
+            bytes: the message to send over the data Pipe
+        """
+        self._slot_seqs[slot_idx] = seq
+        self._header[_SharedFrameRing._HEADER_LATEST_SEQ] = seq
+        return struct.pack(_SharedFrameRing._MESSAGE_FORMAT, slot_idx, seq)
+
+    # reading frames
+    @staticmethod
+    def decode_message(msg: bytes):
+        """Decode a message received over the data Pipe
+
+        Args:
+            msg (bytes): the message sent by publish()
+
+        Returns:
+            tuple(int,int): the slot index and sequence number of the new frame
+        """
+        return struct.unpack(_SharedFrameRing._MESSAGE_FORMAT, msg)
+
+    def get_slot(self, slot_idx: int):
+        """Get a view of a frame slot (no copies are performed)
+
+        Args:
+            slot_idx (int): the slot index
+
+        Returns:
+            np.ndarray: uint8 view of the slot
+        """
+        return self._slots[slot_idx]
+
+    def slot_valid(self, slot_idx: int, seq: int):
+        """Check that a slot still holds the frame with the given sequence number.
+        Call after reading a slot to confirm the frame was not overwritten while being read
+
+        Args:
+            slot_idx (int): the slot index
+            seq (int): expected sequence number
+
+        Returns:
+            bool: True if the slot still holds the expected frame
+        """
+        return int(self._slot_seqs[slot_idx]) == seq
+
+    def close(self):
+        """Close access to the shared memory (and unlink it if this instance created it)"""
+
+        # release the numpy views before closing the segment
+        self._header = None
+        self._slot_seqs = None
+        self._slots = None
+
+        self._shm.close()
+        if self._created:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,189 @@
+import numpy as np
+
+from CPSL_TI_Radar.ConfigManager import ConfigManager, ConfigNotLoaded
+from CPSL_TI_Radar.utilities.ADC_Decoder import ADCDecoder
+
+
+class ADCCapture:
+    def __init__(
+        self,
+        capture_path: str,
+        config_manager: ConfigManager,
+        data_format: str = ADCDecoder.IQ_PAIRS,
+    ):
+        """Lazy reader for ADC data captures (adc_data.bin or LVDS_Raw_0.bin files). The
+        capture is memory mapped and only the frames that are indexed are read and decoded,
+        so captures larger than the available memory can be opened instantly
+
+        Indexing follows the [frame, rx channel, sample, chirp] ADC data cube convention:
+            capture[10] -> rx x samples x chirps cube for frame 10
+            capture[10:20] -> 10 x rx x samples x chirps cube
+            capture[[1, 5, 9]] -> 3 x rx x samples x chirps cube
+            capture[10, 0, :, 0] -> samples from rx 0, chirp 0 of frame 10
+
+        Args:
+            capture_path (str): path to the capture file
+            config_manager (ConfigManager): config manager with the radar configuration used for the capture
+            data_format (str, optional): the raw data format (use ADCDecoder.data_format_from_board() for
+                LVDS_Raw files). Defaults to ADCDecoder.IQ_PAIRS (adc_data.bin files).
+        """
+
+        if not config_manager.config_loaded:
+            raise ConfigNotLoaded(
+                "ADCCapture.__init__: a radar configuration must be loaded to determine the frame geometry"
+            )
+        if "angle" not in config_manager.radar_performance:
+            config_manager.compute_radar_perforance()
+
+        radar_config = config_manager.radar_config
+        chirps_per_loop = (
+            int(radar_config["frameCfg"]["endIndex"])
+            - int(radar_config["frameCfg"]["startIndex"])
+            + 1
+        )
+
+        self.decoder = ADCDecoder(
+            num_rx=config_manager.radar_performance["angle"]["num_rx_antennas"],
+            samples_per_chirp=int(radar_config["profileCfg"]["adcSamples"]),
+            chirps_per_frame=chirps_per_loop * int(radar_config["frameCfg"]["loops"]),
+            data_format=data_format,
+        )
+
+        self.capture_path = capture_path
+        self._raw = np.memmap(capture_path, dtype=np.uint8, mode="r")
+
+        # only complete frames can be read
+        self.num_frames = self._raw.size // self.decoder.num_bytes_per_frame
+        self.num_trailing_bytes = self._raw.size % self.decoder.num_bytes_per_frame
+
+        self.shape = (
+            self.num_frames,
+            self.decoder.num_rx,
+            self.decoder.samples_per_chirp,
+            self.decoder.chirps_per_frame,
+        )
+
+        return
+
+    def __len__(self):
+        return self.num_frames
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the memory map of the capture file"""
+        if self._raw is not None:
+            self._raw._mmap.close()
+            self._raw = None
+
+    def __getitem__(self, key):
+        # split the frame index from the indicies into each frame
+        if isinstance(key, tuple):
+            frame_key, cube_key = key[0], key[1:]
+        else:
+            frame_key, cube_key = key, ()
+
+        if isinstance(frame_key, (int, np.integer)):
+            frames = self.read(self._normalize_frame_idx(frame_key))[0]
+        elif isinstance(frame_key, slice):
+            start, stop, step = frame_key.indices(self.num_frames)
+            if step == 1:
+                frames = self.read(start, max(stop - start, 0))
+            else:
+                frames = self.read_frames(range(start, stop, step))
+            cube_key = (slice(None),) + cube_key
+        else:
+            frames = self.read_frames(frame_key)
+            cube_key = (slice(None),) + cube_key
+
+        return frames[cube_key] if cube_key else frames
+
+    def _normalize_frame_idx(self, frame_idx: int):
+        frame_idx = int(frame_idx)
+        if frame_idx < 0:
+            frame_idx += self.num_frames
+        if frame_idx < 0 or frame_idx >= self.num_frames:
+            raise IndexError(
+                "ADCCapture: frame {} out of range for a capture with {} frames".format(
+                    frame_idx, self.num_frames
+                )
+            )
+        return frame_idx
+
+    def read(self, start_frame: int, num_frames: int = 1, out: np.ndarray = None):
+        """Read and decode a contiguous range of frames
+
+        Args:
+            start_frame (int): the first frame to read
+            num_frames (int, optional): the number of frames to read. Defaults to 1.
+            out (np.ndarray, optional): complex64 output buffer (see ADCDecoder.allocate()). Defaults to None.
+
+        Returns:
+            np.ndarray: num_frames x rx x samples x chirps complex64 ADC data cube
+        """
+
+        if start_frame < 0 or start_frame + num_frames > self.num_frames:
+            raise IndexError(
+                "ADCCapture.read: frames [{},{}) out of range for a capture with {} frames".format(
+                    start_frame, start_frame + num_frames, self.num_frames
+                )
+            )
+
+        if out is None:
+            out = self.decoder.allocate(num_frames)
+
+        num_bytes_per_frame = self.decoder.num_bytes_per_frame
+        return self.decoder.decode(
+            self._raw[
+                start_frame
+                * num_bytes_per_frame : (start_frame + num_frames)
+                * num_bytes_per_frame
+            ],
+            out=out,
+        )
+
+    def read_frames(self, frame_indicies):
+        """Read and decode an arbitrary set of frames
+
+        Args:
+            frame_indicies (iterable of int): the frames to read (negative indicies are supported)
+
+        Returns:
+            np.ndarray: len(frame_indicies) x rx x samples x chirps complex64 ADC data cube
+        """
+
+        frame_indicies = [self._normalize_frame_idx(idx) for idx in frame_indicies]
+
+        out = self.decoder.allocate(len(frame_indicies))
+        for i, frame_idx in enumerate(frame_indicies):
+            self.read(frame_idx, out=out[i : i + 1])
+
+        return out
+
+    def iter_frames(
+        self, batch_size: int = 1, start_frame: int = 0, stop_frame: int = None
+    ):
+        """Iterate over the capture in batches of frames. The same output buffer
+        is re-used for each batch (copy a batch to keep it)
+
+        Args:
+            batch_size (int, optional): number of frames in each batch. Defaults to 1.
+            start_frame (int, optional): the first frame. Defaults to 0.
+            stop_frame (int, optional): the frame to stop at (exclusive). Defaults to None (end of the capture).
+
+        Yields:
+            tuple(int,np.ndarray): the index of the first frame in the batch and the
+                batch_size x rx x samples x chirps ADC data cube (smaller for the last batch)
+        """
+
+        if stop_frame is None:
+            stop_frame = self.num_frames
+
+        out = self.decoder.allocate(batch_size)
+        for frame_idx in range(start_frame, stop_frame, batch_size):
+            num_frames = min(batch_size, stop_frame - frame_idx)
+            yield frame_idx, self.read(frame_idx, num_frames, out=out)
@@ -0,0 +1,289 @@
+import numpy as np
+
+
+class ADCDecoder:
+    # supported raw data formats
+    INTERLEAVED = "interleaved"  # SDK 2 LVDS data (IWR1443)
+    NON_INTERLEAVED = "non_interleaved"  # SDK 3 LVDS data (IWR1843, IWR6843)
+    IQ_PAIRS = "iq_pairs"  # adc_data.bin files saved by the C++ DCA1000Handler
+
+    def __init__(
+        self,
+        num_rx: int,
+        samples_per_chirp: int,
+        chirps_per_frame: int,
+        data_format: str = INTERLEAVED,
+    ):
+        """Decode raw DCA1000 frames (int16 LVDS data) into complex64 ADC data cubes
+        indexed by [frame, rx channel, sample, chirp]. Frames are decoded directly
+        into the output cube without any complex intermediates
+
+        Raw data formats (int16 values for a single frame):
+            interleaved: reshaped (in column-major order) to 2*num_rx rows, rows [0,num_rx) are the real
+                parts and rows [num_rx,2*num_rx) are the imaginary parts of each rx channel. Columns are
+                ordered by chirp then sample
+            non_interleaved: each group of 4 values [I0, I1, Q0, Q1] forms two complex samples
+                (Q0 + jI0, Q1 + jI1). Samples are ordered by chirp, rx channel, then sample
+            iq_pairs: (real, imaginary) pairs ordered by chirp, rx channel, then sample
+
+        Args:
+            num_rx (int): number of rx channels
+            samples_per_chirp (int): number of ADC samples per chirp
+            chirps_per_frame (int): number of chirps in each frame
+            data_format (str, optional): the raw data format. Defaults to ADCDecoder.INTERLEAVED.
+        """
+
+        self.num_rx = int(num_rx)
+        self.samples_per_chirp = int(samples_per_chirp)
+        self.chirps_per_frame = int(chirps_per_frame)
+
+        if data_format not in (
+            ADCDecoder.INTERLEAVED,
+            ADCDecoder.NON_INTERLEAVED,
+            ADCDecoder.IQ_PAIRS,
+        ):
+            raise ValueError(
+                "ADCDecoder: data format {} not recognized".format(data_format)
+            )
+        if data_format == ADCDecoder.NON_INTERLEAVED and self.samples_per_chirp % 2:
+            raise ValueError(
+                "ADCDecoder: non_interleaved data requires an even number of samples per chirp"
+            )
+        self.data_format = data_format
+
+        self.num_ints_per_frame = (
+            2 * self.num_rx * self.samples_per_chirp * self.chirps_per_frame
+        )
+        self.num_bytes_per_frame = 2 * self.num_ints_per_frame
+
+        return
+
+    @staticmethod
+    def data_format_from_board(board_type: str):
+        """Get the raw data format used by a given radar board (same mapping as the C++ ADCCubeConverter)
+
+        Args:
+            board_type (str): the radar board (ex: "IWR1443")
+
+        Returns:
+            str: the raw data format
+        """
+        match board_type:
+            case "IWR1443":
+                return ADCDecoder.INTERLEAVED
+            case "IWR1843" | "IWR6843":
+                return ADCDecoder.NON_INTERLEAVED
+            case _:
+                raise ValueError(
+                    "ADCDecoder.data_format_from_board: board type {} not recognized".format(
+                        board_type
+                    )
+                )
+
+    @staticmethod
+    def deinterleave_lanes(adc_data, num_lanes: int = 4):
+        """Decode raw interleaved LVDS data into a stream of complex64 samples (without a frame layout).
+        Each group of 2*num_lanes int16 values holds the real parts and then the imaginary parts of
+        one sample from each lane
+
+        Args:
+            adc_data (bytes-like or np.ndarray): the raw int16 data (a whole number of sample groups)
+            num_lanes (int, optional): number of LVDS lanes. Defaults to 4.
+
+        Returns:
+            np.ndarray: complex64 samples ordered by sample group then lane
+        """
+
+        adc_data = np.frombuffer(adc_data, dtype=np.int16)
+
+        if adc_data.size % (2 * num_lanes):
+            raise ValueError(
+                "ADCDecoder.deinterleave_lanes: received {} values, which is not a multiple of the {} values per sample group".format(
+                    adc_data.size, 2 * num_lanes
+                )
+            )
+
+        # index as [sample group, real/imag, lane]
+        adc_data = adc_data.reshape(-1, 2, num_lanes)
+
+        samples = np.empty(adc_data.shape[0] * num_lanes, dtype=np.complex64)
+        samples.real = adc_data[:, 0, :].reshape(-1)
+        samples.imag = adc_data[:, 1, :].reshape(-1)
+
+        return samples
+
+    def allocate(self, num_frames: int = 1):
+        """Allocate an output buffer for the decode function
+
+        Args:
+            num_frames (int, optional): number of frames. Defaults to 1.
+
+        Returns:
+            np.ndarray: num_frames x num_rx x samples_per_chirp x chirps_per_frame complex64 array
+        """
+        return np.empty(
+            shape=(
+                num_frames,
+                self.num_rx,
+                self.samples_per_chirp,
+                self.chirps_per_frame,
+            ),
+            dtype=np.complex64,
+        )
+
+    def decode(self, frame_bytes, out: np.ndarray = None):
+        """Decode one or more raw frames into an ADC data cube
+
+        Args:
+            frame_bytes (bytes-like or np.ndarray): the raw frame data (a whole number of frames)
+            out (np.ndarray, optional): complex64 output buffer with at least as many frames as in
+                frame_bytes (see allocate()). Defaults to None (a new buffer is allocated).
+
+        Returns:
+            np.ndarray: num_frames x num_rx x samples_per_chirp x chirps_per_frame complex64 ADC data cube
+                (a view of out when provided)
+        """
+
+        adc_data = np.frombuffer(frame_bytes, dtype=np.int16)
+
+        if adc_data.size % self.num_ints_per_frame:
+            raise ValueError(
+                "ADCDecoder.decode: received {} bytes, which is not a multiple of the {} bytes per frame".format(
+                    2 * adc_data.size, self.num_bytes_per_frame
+                )
+            )
+        num_frames = adc_data.size // self.num_ints_per_frame
+
+        if out is None:
+            out = self.allocate(num_frames)
+        elif (
+            out.dtype != np.complex64
+            or out.shape[1:] != self.allocate(0).shape[1:]
+            or out.shape[0] < num_frames
+        ):
+            raise ValueError(
+                "ADCDecoder.decode: out must be a complex64 array of shape ({},{},{},{})".format(
+                    num_frames,
+                    self.num_rx,
+                    self.samples_per_chirp,
+                    self.chirps_per_frame,
+                )
+            )
+        out = out[:num_frames]
+
+        real, imag = self._get_real_imag(adc_data, num_frames)
+
+        # write the real and imaginary parts directly into the output cube
+        out_real, out_imag = self._get_out_real_imag(out, num_frames)
+        out_real[...] = real
+        out_imag[...] = imag
+
+        return out
+
+    def encode(self, adc_data_cube: np.ndarray):
+        """Encode an ADC data cube back into raw frame data (inverse of decode)
+
+        Args:
+            adc_data_cube (np.ndarray): num_frames x num_rx x samples_per_chirp x chirps_per_frame ADC data cube
+                (values are truncated to int16)
+
+        Returns:
+            bytes: the raw frame data
+        """
+
+        adc_data_cube = np.asarray(adc_data_cube)
+        num_frames = adc_data_cube.shape[0]
+
+        adc_data = np.empty(num_frames * self.num_ints_per_frame, dtype=np.int16)
+
+        real, imag = self._get_real_imag(adc_data, num_frames)
+        cube_real, cube_imag = self._get_out_real_imag(adc_data_cube, num_frames)
+        real[...] = cube_real
+        imag[...] = cube_imag
+
+        return adc_data.tobytes()
+
+    def _get_real_imag(self, adc_data: np.ndarray, num_frames: int):
+        """Get views of the real and imaginary values in raw int16 data, ordered to
+        match the views returned by _get_out_real_imag
+
+        Args:
+            adc_data (np.ndarray): raw int16 data
+            num_frames (int): number of frames in the data
+
+        Returns:
+            tuple(np.ndarray,np.ndarray): views of the real and imaginary values
+        """
+
+        match self.data_format:
+            case ADCDecoder.INTERLEAVED:
+                # index as [frame, chirp, sample, real/imag, rx]
+                adc_data = adc_data.reshape(
+                    num_frames,
+                    self.chirps_per_frame,
+                    self.samples_per_chirp,
+                    2,
+                    self.num_rx,
+                )
+                # reorder as [frame, rx, sample, chirp]
+                return (
+                    adc_data[:, :, :, 0, :].transpose(0, 3, 2, 1),
+                    adc_data[:, :, :, 1, :].transpose(0, 3, 2, 1),
+                )
+            case ADCDecoder.NON_INTERLEAVED:
+                # index as [frame, chirp, rx, sample pair, imag/real, sample in pair]
+                adc_data = adc_data.reshape(
+                    num_frames,
+                    self.chirps_per_frame,
+                    self.num_rx,
+                    self.samples_per_chirp // 2,
+                    2,
+                    2,
+                )
+                # reorder as [frame, rx, sample pair, sample in pair, chirp]
+                return (
+                    adc_data[:, :, :, :, 1, :].transpose(0, 2, 3, 4, 1),
+                    adc_data[:, :, :, :, 0, :].transpose(0, 2, 3, 4, 1),
+                )
+            case ADCDecoder.IQ_PAIRS:
+                # index as [frame, chirp, rx, sample, real/imag]
+                adc_data = adc_data.reshape(
+                    num_frames,
+                    self.chirps_per_frame,
+                    self.num_rx,
+                    self.samples_per_chirp,
+                    2,
+                )
+                # reorder as [frame, rx, sample, chirp]
+                return (
+                    adc_data[:, :, :, :, 0].transpose(0, 2, 3, 1),
+                    adc_data[:, :, :, :, 1].transpose(0, 2, 3, 1),
+                )
+
+    def _get_out_real_imag(self, adc_data_cube: np.ndarray, num_frames: int):
+        """Get views of the real and imaginary parts of an ADC data cube
+
+        Args:
+            adc_data_cube (np.ndarray): num_frames x num_rx x samples_per_chirp x chirps_per_frame ADC data cube
+            num_frames (int): number of frames in the cube
+
+        Returns:
+            tuple(np.ndarray,np.ndarray): views of the real and imaginary parts
+        """
+
+        cube_real = adc_data_cube.real
+        cube_imag = adc_data_cube.imag
+
+        # split the samples into pairs for the non-interleaved format
+        if self.data_format == ADCDecoder.NON_INTERLEAVED:
+            pairs_shape = (
+                num_frames,
+                self.num_rx,
+                self.samples_per_chirp // 2,
+                2,
+                self.chirps_per_frame,
+            )
+            cube_real = cube_real.reshape(pairs_shape)
+            cube_imag = cube_imag.reshape(pairs_shape)
+
+        return cube_real, cube_imag
@@ -0,0 +1,329 @@
+import numpy as np
+import os
+import socket
+import threading
+import time
+from multiprocessing.connection import Connection
+
+from CPSL_TI_Radar.ConfigManager import ConfigManager, ConfigNotLoaded
+from CPSL_TI_Radar._Shared_Frame_Ring import _SharedFrameRing
+from CPSL_TI_Radar.Streamers._TLV_Packet_Parser import _TLVPacketParser
+from CPSL_TI_Radar.Streamers.Handlers.DCA1000 import DCA1000DataPacket
+from CPSL_TI_Radar.utilities.ADC_Decoder import ADCDecoder
+
+
+class CaptureReplay:
+    # capture types
+    DCA1000 = "DCA1000"  # raw ADC captures (LVDS_Raw_0.bin or adc_data.bin files)
+    SERIAL = "serial"  # raw serial streams from the IWR demos (.dat files)
+
+    # number of bytes read from serial captures at a time
+    SERIAL_CHUNK_BYTES = 2**16
+
+    def __init__(
+        self,
+        capture_path: str,
+        config_manager: ConfigManager,
+        capture_type: str = None,
+        speed: float = 1.0,
+    ):
+        """Replays a recorded capture through the live pipeline (without any hardware) by sending
+        its frames to a Processor over the data Pipe or by emulating the DCA1000 UDP data stream.
+        Frames are paced using the frame periodicity of the radar config
+
+        Args:
+            capture_path (str): path to the capture file
+            config_manager (ConfigManager): config manager with the radar configuration used for the capture
+            capture_type (str, optional): DCA1000 or SERIAL. Defaults to None (.dat files are SERIAL captures,
+                all other files are DCA1000 captures).
+            speed (float, optional): replay speed relative to real time (ex: 2.0 replays twice as fast).
+                Use 0 or None to replay as fast as possible. Defaults to 1.0.
+        """
+
+        if not config_manager.config_loaded:
+            raise ConfigNotLoaded(
+                "CaptureReplay.__init__: a radar configuration must be loaded to determine the frame rate"
+            )
+
+        if capture_type is None:
+            if os.path.splitext(capture_path)[1] == ".dat":
+                capture_type = CaptureReplay.SERIAL
+            else:
+                capture_type = CaptureReplay.DCA1000
+        if capture_type not in (CaptureReplay.DCA1000, CaptureReplay.SERIAL):
+            raise ValueError(
+                "CaptureReplay: {} is not a valid capture type".format(capture_type)
+            )
+
+        self.capture_path = capture_path
+        self.capture_type = capture_type
+        self.speed = speed
+
+        radar_config = config_manager.radar_config
+        self.frame_period_s = float(radar_config["frameCfg"]["periodicity"]) * 1e-3
+
+        self._raw = np.memmap(capture_path, dtype=np.uint8, mode="r")
+
+        if self.capture_type == CaptureReplay.DCA1000:
+            if "angle" not in config_manager.radar_performance:
+                config_manager.compute_radar_perforance()
+
+            chirps_per_loop = (
+                int(radar_config["frameCfg"]["endIndex"])
+                - int(radar_config["frameCfg"]["startIndex"])
+                + 1
+            )
+            decoder = ADCDecoder(
+                num_rx=config_manager.radar_performance["angle"]["num_rx_antennas"],
+                samples_per_chirp=int(radar_config["profileCfg"]["adcSamples"]),
+                chirps_per_frame=chirps_per_loop * int(radar_config["frameCfg"]["loops"]),
+            )
+
+            # only complete frames are replayed
+            self.num_bytes_per_frame = decoder.num_bytes_per_frame
+            self.num_frames = self._raw.size // self.num_bytes_per_frame
+        else:
+            # serial packets vary in length (the number of packets is only known after replaying)
+            self.num_bytes_per_frame = None
+            self.num_frames = None
+
+        # replay status
+        self.num_frames_sent = 0
+        self.num_bytes_sent = 0
+        self.num_packets_sent = 0
+        self.elapsed_s = 0.0
+
+        # shared memory ring used to pass DCA1000 frames to the processor (created by replay_to_processor())
+        self.frame_ring: _SharedFrameRing = None
+
+        # set by stop() to end a replay running in another thread
+        self._stop_event = threading.Event()
+
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the memory map of the capture file and the shared frame ring"""
+        if self.frame_ring:
+            self.frame_ring.close()
+            self.frame_ring = None
+
+        if self._raw is not None:
+            self._raw._mmap.close()
+            self._raw = None
+
+    def stop(self):
+        """Stop a replay running in another thread (after the current frame is sent)"""
+        self._stop_event.set()
+
+    @property
+    def frame_rate(self):
+        """The achieved frame rate (Hz) of the last replay"""
+        if self.elapsed_s == 0:
+            return 0.0
+        return self.num_frames_sent / self.elapsed_s
+
+    @property
+    def throughput_MBps(self):
+        """The achieved throughput (MB/s) of the last replay"""
+        if self.elapsed_s == 0:
+            return 0.0
+        return self.num_bytes_sent / self.elapsed_s * 1e-6
+
+    # iterating over frames
+    def iter_frames(self, start_frame: int = 0, num_frames: int = None):
+        """Iterate over the frames in the capture, waiting until each frame is due
+
+        Args:
+            start_frame (int, optional): the first frame to replay. Defaults to 0.
+            num_frames (int, optional): the number of frames to replay. Defaults to None (all frames).
+
+        Yields:
+            tuple(int,memoryview): the frame index and the frame bytes (an ADC frame for DCA1000 captures,
+                a complete TLV packet for SERIAL captures). Views are only valid until the next frame
+        """
+
+        if self.capture_type == CaptureReplay.DCA1000:
+            frames = self._iter_ADC_frames(start_frame, num_frames)
+        else:
+            frames = self._iter_serial_packets(start_frame, num_frames)
+
+        self._stop_event.clear()
+        self.num_frames_sent = 0
+        self.num_bytes_sent = 0
+        self.num_packets_sent = 0
+        self.elapsed_s = 0.0
+
+        start_time = time.perf_counter()
+        try:
+            for i, (frame_idx, frame) in enumerate(frames):
+                if self._stop_event.is_set():
+                    break
+
+                # frames are due at fixed times from the start so that delays do not accumulate
+                if self.speed:
+                    self._wait_until(start_time + i * self.frame_period_s / self.speed)
+
+                yield frame_idx, frame
+
+                self.num_frames_sent += 1
+                self.num_bytes_sent += len(frame)
+                self.elapsed_s = time.perf_counter() - start_time
+        finally:
+            frames.close()
+
+    def _wait_until(self, due_time: float):
+        """Sleep until a frame is due (returns immediately for late frames)"""
+        delay = due_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _get_stop_frame(self, start_frame: int, num_frames: int):
+        """Get the frame to stop a DCA1000 replay at (exclusive)"""
+        if num_frames is None:
+            return self.num_frames
+        return min(start_frame + num_frames, self.num_frames)
+
+    def _iter_ADC_frames(self, start_frame: int, num_frames: int):
+
+        raw = memoryview(self._raw)
+        for frame_idx in range(start_frame, self._get_stop_frame(start_frame, num_frames)):
+            yield frame_idx, raw[
+                frame_idx * self.num_bytes_per_frame : (frame_idx + 1) * self.num_bytes_per_frame
+            ]
+
+    def _iter_serial_packets(self, start_frame: int, num_frames: int):
+
+        parser = _TLVPacketParser()
+        raw = memoryview(self._raw)
+
+        packet_idx = 0
+        for offset in range(0, len(raw), CaptureReplay.SERIAL_CHUNK_BYTES):
+            parser.write(raw[offset : offset + CaptureReplay.SERIAL_CHUNK_BYTES])
+
+            for packet in parser.get_packets():
+                if num_frames is not None and packet_idx >= start_frame + num_frames:
+                    return
+                if packet_idx >= start_frame:
+                    yield packet_idx, packet
+                packet_idx += 1
+
+    # replaying into the pipeline
+    def replay_to_processor(
+        self,
+        conn_processor_data: Connection,
+        DCA1000_settings: dict = None,
+        start_frame: int = 0,
+        num_frames: int = None,
+    ):
+        """Replay the capture into a Processor's data Pipe (in place of the Streamer). DCA1000 frames
+        are written into a shared frame ring (like the DCA1000Streamer) and serial packets are sent
+        directly (like the SerialStreamer)
+
+        Args:
+            conn_processor_data (Connection): the Streamer end of the Processor's data Pipe
+            DCA1000_settings (dict, optional): the ["Streamer"]["DCA1000_streaming"] radar settings,
+                used to create the shared frame ring that the DCA1000Processor attaches to (kept until
+                close() is called). Required for DCA1000 captures. Defaults to None.
+            start_frame (int, optional): the first frame to replay. Defaults to 0.
+            num_frames (int, optional): the number of frames to replay. Defaults to None (all frames).
+
+        Returns:
+            int: the number of frames sent
+        """
+
+        if self.capture_type == CaptureReplay.SERIAL:
+            for _, packet in self.iter_frames(start_frame, num_frames):
+                conn_processor_data.send_bytes(packet)
+                self.num_packets_sent += 1
+            return self.num_frames_sent
+
+        if DCA1000_settings is None:
+            raise ValueError(
+                "CaptureReplay.replay_to_processor: DCA1000_settings are required to replay DCA1000 captures"
+            )
+
+        # the ring is kept until close() so that the processor can finish reading the last frames
+        if self.frame_ring is None:
+            self.frame_ring = _SharedFrameRing(
+                name=_SharedFrameRing.name_from_settings(DCA1000_settings),
+                num_slots=int(DCA1000_settings["frame_ring_slots"]),
+                num_bytes_per_frame=self.num_bytes_per_frame,
+                create=True,
+            )
+
+        for _, frame in self.iter_frames(start_frame, num_frames):
+            slot_idx, seq = self.frame_ring.get_next_write_slot()
+            self.frame_ring.begin_write(slot_idx)[:] = frame
+            conn_processor_data.send_bytes(self.frame_ring.publish(slot_idx, seq))
+            self.num_packets_sent += 1
+
+        return self.num_frames_sent
+
+    def replay_to_udp(
+        self,
+        address: tuple,
+        start_frame: int = 0,
+        num_frames: int = None,
+        source_address: tuple = None,
+    ):
+        """Replay a DCA1000 capture as a DCA1000 UDP data stream (ex: to a DCA1000Handler listening
+        on a local address). Packets carry the same sequence number and byte count headers as the
+        DCA1000 and are sent as each frame is due
+
+        Args:
+            address (tuple): address the DCA1000Handler is receiving data on (ex: ("127.0.0.1", 4098))
+            start_frame (int, optional): the first frame to replay. Defaults to 0.
+            num_frames (int, optional): the number of frames to replay. Defaults to None (all frames).
+            source_address (tuple, optional): address to send the packets from (ex: the DCA1000's FPGA_IP).
+                Defaults to None (any address).
+
+        Returns:
+            int: the number of frames sent
+        """
+
+        if self.capture_type != CaptureReplay.DCA1000:
+            raise ValueError(
+                "CaptureReplay.replay_to_udp: only DCA1000 captures can be replayed over UDP"
+            )
+
+        data_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if source_address:
+            data_socket.bind(source_address)
+
+        header = bytearray(DCA1000DataPacket.HEADER.size)
+        raw = memoryview(self._raw)
+
+        # the stream starts at a byte count of 0 and packets span frame boundaries (like the DCA1000's),
+        # the packets containing each frame are sent when the frame is due
+        stream_start = start_frame * self.num_bytes_per_frame
+        stream_end = (
+            self._get_stop_frame(start_frame, num_frames) * self.num_bytes_per_frame
+            - stream_start
+        )
+        byte_count = 0
+        seq_num = 1
+        try:
+            for frame_idx, _ in self.iter_frames(start_frame, num_frames):
+                frame_end = (frame_idx + 1) * self.num_bytes_per_frame - stream_start
+                for header, payload in DCA1000DataPacket.packetize(
+                    raw[stream_start + byte_count : stream_start + stream_end],
+                    byte_count,
+                    frame_end,
+                    seq_num,
+                    header,
+                ):
+                    data_socket.sendmsg([header, payload], [], 0, address)
+
+                    byte_count += len(payload)
+                    seq_num += 1
+                    self.num_packets_sent += 1
+        finally:
+            data_socket.close()
+
+        return self.num_frames_sent
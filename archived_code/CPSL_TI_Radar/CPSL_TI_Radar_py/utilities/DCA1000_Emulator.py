@@ -0,0 +1,335 @@
+import numpy as np
+import socket
+import struct
+import threading
+import time
+
+from CPSL_TI_Radar.Streamers.Handlers.DCA1000 import (
+    DCA1000CommandCodes,
+    DCA1000DataPacket,
+)
+
+
+class DCA1000Emulator:
+    # command packets (header, command code, data length/status, ..., footer)
+    CMD_HEADER = 0xA55A
+    CMD_FOOTER = 0xEEAA
+    _CMD_PREFIX = struct.Struct("<HHH")
+    _CMD_RESPONSE = struct.Struct("<HHHH")
+
+    # command status
+    STATUS_SUCCESS = 0
+    STATUS_FAIL = 1
+
+    # each complex sample is a 16 bit I and a 16 bit Q value
+    NUM_BYTES_PER_SAMPLE = 4
+
+    def __init__(
+        self,
+        FPGA_IP: str = "127.0.0.2",
+        system_IP: str = "127.0.0.1",
+        cmd_port: int = 4096,
+        data_port: int = 4098,
+        frames: np.ndarray = None,
+        num_bytes_per_frame: int = 2**17,
+        frame_rate: float = 20.0,
+        num_frames_to_send: int = None,
+        drop_probability: float = 0.0,
+        reorder_probability: float = 0.0,
+        FPGA_version: tuple = (2, 9),
+        seed: int = 0,
+    ):
+        """Emulates a DCA1000 on the local machine so that the DCA1000Handler/DCA1000Streamer receive
+        path can be tested and benchmarked without hardware. Commands are answered on the cmd port and,
+        while recording, ADC frames are streamed to the data port as DCA1000 UDP packets (sequence
+        number and byte count headers) with optional injected drops and reordering
+
+        Args:
+            FPGA_IP (str, optional): the emulated DCA1000's IP address (the FPGA_IP radar setting).
+                Defaults to "127.0.0.2".
+            system_IP (str, optional): the address of the DCA1000Handler (the system_IP radar setting).
+                Defaults to "127.0.0.1".
+            cmd_port (int, optional): port for DCA1000 commands. Defaults to 4096.
+            data_port (int, optional): port for DCA1000 raw data streaming. Defaults to 4098.
+            frames (np.ndarray, optional): num_frames x num_bytes_per_frame uint8 frames to stream
+                (repeated for as long as recording continues, ex: frames from a capture).
+                Defaults to None (4 frames of random 12 bit ADC samples).
+            num_bytes_per_frame (int, optional): frame size when frames is None. Defaults to 2**17.
+            frame_rate (float, optional): frames per second to stream. Use 0 or None to stream as
+                fast as possible. Defaults to 20.0.
+            num_frames_to_send (int, optional): stop streaming after this many frames (like the
+                DCA1000's recording timer). Defaults to None (stream until RECORD_STOP).
+            drop_probability (float, optional): probability that each packet is dropped (the
+                sequence number and byte count still advance). Defaults to 0.0.
+            reorder_probability (float, optional): probability that each packet is held and sent
+                after the following packet. Defaults to 0.0.
+            FPGA_version (tuple, optional): (major, minor) version returned by READ_FPGA_VERSION.
+                Defaults to (2, 9).
+            seed (int, optional): seed for the synthetic frames and injected drops/reordering. Defaults to 0.
+        """
+
+        self.FPGA_IP = FPGA_IP
+        self.system_IP = system_IP
+        self.cmd_port = cmd_port
+        self.data_port = data_port
+
+        self.frame_rate = frame_rate
+        self.num_frames_to_send = num_frames_to_send
+        self.drop_probability = drop_probability
+        self.reorder_probability = reorder_probability
+        self.FPGA_version = FPGA_version
+
+        self._rng = np.random.default_rng(seed)
+
+        if frames is None:
+            frames = self._rng.integers(
+                -2048, 2048, size=(4, num_bytes_per_frame // 2), dtype=np.int16
+            ).view(np.uint8)
+        self.num_frames = frames.shape[0]
+        self.num_bytes_per_frame = frames.shape[1]
+
+        # the frames followed by the start of the stream again so that the packets of a frame
+        # (including packets wrapping around to the first frame) can be sent from a single view
+        num_stream_bytes = self.num_frames * self.num_bytes_per_frame
+        num_wrap_bytes = self.num_bytes_per_frame + DCA1000DataPacket.PAYLOAD_BYTES
+        self._stream = np.resize(frames.reshape(-1), num_stream_bytes + num_wrap_bytes)
+        self._stream_view = memoryview(self._stream)
+
+        # FPGA configuration received from the handler
+        self.packet_size = None
+        self.packet_delay_us = None
+        self.FPGA_config = None
+
+        # status counters (reset each time recording starts)
+        self.num_commands = 0
+        self.num_frames_sent = 0
+        self.num_packets_sent = 0
+        self.num_bytes_sent = 0
+        self.num_dropped_packets = 0
+        self.num_reordered_packets = 0
+        self.elapsed_s = 0.0
+
+        # sockets
+        self.cmd_socket: socket.socket = None
+        self.data_socket: socket.socket = None
+
+        # threads
+        self._cmd_thread: threading.Thread = None
+        self._data_thread: threading.Thread = None
+        self._exit_event = threading.Event()
+        self._recording = threading.Event()
+
+        return
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def recording(self):
+        """True while frames are being streamed"""
+        return self._recording.is_set()
+
+    @property
+    def sample_rate_Msps(self):
+        """The streamed sample rate (complex samples across all channels, Msps) while recording"""
+        if self.elapsed_s == 0:
+            return 0.0
+        return (
+            self.num_bytes_sent / DCA1000Emulator.NUM_BYTES_PER_SAMPLE / self.elapsed_s * 1e-6
+        )
+
+    def start(self):
+        """Bind the cmd and data sockets and start answering commands"""
+
+        self.cmd_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.cmd_socket.bind((self.FPGA_IP, self.cmd_port))
+        self.cmd_socket.settimeout(0.1)
+
+        self.data_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.data_socket.bind((self.FPGA_IP, self.data_port))
+
+        self._exit_event.clear()
+        self._cmd_thread = threading.Thread(
+            target=self._run_cmd_thread, name="DCA1000Emulator", daemon=True
+        )
+        self._cmd_thread.start()
+
+    def close(self):
+        """Stop recording and close the sockets"""
+
+        self._stop_recording()
+
+        self._exit_event.set()
+        if self._cmd_thread:
+            self._cmd_thread.join()
+            self._cmd_thread = None
+
+        if self.cmd_socket:
+            self.cmd_socket.close()
+            self.cmd_socket = None
+        if self.data_socket:
+            self.data_socket.close()
+            self.data_socket = None
+
+    # commands
+    def _run_cmd_thread(self):
+        while not self._exit_event.is_set():
+            try:
+                msg, address = self.cmd_socket.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+            self._process_command(msg, address)
+
+    def _process_command(self, msg: bytes, address: tuple):
+        """Execute a command and send the response
+
+        Args:
+            msg (bytes): the command packet
+            address (tuple): the address the command was sent from
+        """
+
+        if len(msg) < DCA1000Emulator._CMD_PREFIX.size + 2:
+            return
+
+        header, command_code, data_length = DCA1000Emulator._CMD_PREFIX.unpack_from(msg)
+        footer = struct.unpack_from("<H", msg, len(msg) - 2)[0]
+        if header != DCA1000Emulator.CMD_HEADER or footer != DCA1000Emulator.CMD_FOOTER:
+            return
+
+        data = msg[DCA1000Emulator._CMD_PREFIX.size : DCA1000Emulator._CMD_PREFIX.size + data_length]
+        self.num_commands += 1
+
+        status = DCA1000Emulator.STATUS_SUCCESS
+        match command_code:
+            case DCA1000CommandCodes.SYSTEM_CONNECT:
+                pass
+            case DCA1000CommandCodes.RESET_FPGA:
+                self._stop_recording()
+            case DCA1000CommandCodes.CONFIG_PACKET_DATA:
+                self.packet_size, self.packet_delay_us = struct.unpack_from("<HH", data)
+            case DCA1000CommandCodes.CONFIG_FPGA_GEN:
+                self.FPGA_config = bytes(data)
+            case DCA1000CommandCodes.READ_FPGA_VERSION:
+                major_version, minor_version = self.FPGA_version
+                status = (minor_version << 7) | major_version
+            case DCA1000CommandCodes.RECORD_START:
+                # respond before the first data packet is sent
+                self._send_response(command_code, status, address)
+                self._start_recording()
+                return
+            case DCA1000CommandCodes.RECORD_STOP:
+                self._stop_recording()
+            case _:
+                # unsupported command
+                status = DCA1000Emulator.STATUS_FAIL
+
+        self._send_response(command_code, status, address)
+
+    def _send_response(self, command_code: int, status: int, address: tuple):
+        self.cmd_socket.sendto(
+            DCA1000Emulator._CMD_RESPONSE.pack(
+                DCA1000Emulator.CMD_HEADER,
+                command_code,
+                status,
+                DCA1000Emulator.CMD_FOOTER,
+            ),
+            address,
+        )
+
+    # streaming
+    def _start_recording(self):
+        if self._recording.is_set():
+            return
+
+        self.num_frames_sent = 0
+        self.num_packets_sent = 0
+        self.num_bytes_sent = 0
+        self.num_dropped_packets = 0
+        self.num_reordered_packets = 0
+        self.elapsed_s = 0.0
+
+        self._recording.set()
+        self._data_thread = threading.Thread(
+            target=self._run_data_thread, name="DCA1000EmulatorData", daemon=True
+        )
+        self._data_thread.start()
+
+    def _stop_recording(self):
+        self._recording.clear()
+        if self._data_thread:
+            self._data_thread.join()
+            self._data_thread = None
+
+    def _run_data_thread(self):
+
+        address = (self.system_IP, self.data_port)
+        num_stream_bytes = self.num_frames * self.num_bytes_per_frame
+        inject_errors = self.drop_probability > 0 or self.reorder_probability > 0
+
+        header = bytearray(DCA1000DataPacket.HEADER.size)
+        held_packet = None
+
+        # the byte count restarts at 0 each time recording is started
+        seq_num = 1
+        byte_count = 0
+        start_time = time.perf_counter()
+        while self._recording.is_set():
+            if self.num_frames_sent == self.num_frames_to_send:
+                break
+
+            # frames are due at fixed times from the start so that delays do not accumulate
+            if self.frame_rate:
+                delay = start_time + self.num_frames_sent / self.frame_rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            # packets span frame boundaries (like the DCA1000's)
+            frame_end = (self.num_frames_sent + 1) * self.num_bytes_per_frame
+            for header, payload in DCA1000DataPacket.packetize(
+                self._stream_view[byte_count % num_stream_bytes :],
+                byte_count,
+                frame_end,
+                seq_num,
+                header,
+            ):
+                seq_num += 1
+                byte_count += len(payload)
+
+                if inject_errors:
+                    if self._rng.random() < self.drop_probability:
+                        self.num_dropped_packets += 1
+                        continue
+                    if held_packet is None and self._rng.random() < self.reorder_probability:
+                        held_packet = (bytes(header), payload)
+                        self.num_reordered_packets += 1
+                        continue
+
+                self._send_packet(header, payload, address)
+
+                if held_packet is not None:
+                    self._send_packet(*held_packet, address)
+                    held_packet = None
+
+            self.num_frames_sent += 1
+            self.elapsed_s = time.perf_counter() - start_time
+
+        if held_packet is not None:
+            self._send_packet(*held_packet, address)
+
+        self._recording.clear()
+
+    def _send_packet(self, header, payload, address: tuple):
+        try:
+            self.data_socket.sendmsg([header, payload], [], 0, address)
+        except OSError:
+            # the handler is not listening (ex: it was closed while recording)
+            return
+        self.num_packets_sent += 1
+        self.num_bytes_sent += len(payload)
@@ -0,0 +1,298 @@
+import numpy as np
+import time
+
+from CPSL_TI_Radar._Shared_Frame_Ring import attach_segment, create_segment
+
+
+class _Header:
+    """Layout of the uint64 header at the start of each shared memory segment.
+    The sequence number is used as a seqlock: it is odd while a new array is being
+    written and even once the array is complete"""
+
+    NUM_FIELDS = 16
+    SEQ = 0
+    FRAME_NUMBER = 1
+    NBYTES = 2
+    NDIM = 3
+    SHAPE = 4  # MAX_DIMS fields
+    DTYPE = 12  # 2 fields (16 byte dtype string)
+    CAPACITY = 14
+    CLOSED = 15
+
+    MAX_DIMS = 8
+    DTYPE_BYTES = 16
+
+    # arrays start after the (cache line aligned) header
+    NUM_BYTES = 8 * NUM_FIELDS
+
+
+class SharedMemoryPublisher:
+    def __init__(self, name: str, capacity: int):
+        """Publish numpy arrays to a named shared memory segment that any number of
+        SharedMemorySubscribers can read from. Only the latest array is kept
+
+        Args:
+            name (str): name of the shared memory segment (replaces any stale segment with the same name)
+            capacity (int): the largest array (in bytes) that can be published
+        """
+
+        self.name = name
+        self.capacity = int(capacity)
+
+        self._shm = create_segment(
+            name, _Header.NUM_BYTES + self.capacity
+        )
+        self._header = np.ndarray(
+            shape=(_Header.NUM_FIELDS,), dtype=np.uint64, buffer=self._shm.buf
+        )
+        self._header[:] = 0
+        self._header[_Header.CAPACITY] = self.capacity
+        self._data = np.ndarray(
+            shape=(self.capacity,),
+            dtype=np.uint8,
+            buffer=self._shm.buf,
+            offset=_Header.NUM_BYTES,
+        )
+
+        return
+
+    def publish(self, array: np.ndarray, frame_number: int = 0):
+        """Copy a new array into the shared memory segment
+
+        Args:
+            array (np.ndarray): the array to publish (at most capacity bytes and MAX_DIMS dimensions)
+            frame_number (int, optional): frame number to publish with the array. Defaults to 0.
+        """
+
+        if array.nbytes > self.capacity or array.ndim > _Header.MAX_DIMS:
+            raise ValueError(
+                "SharedMemoryPublisher.publish: {} array with shape {} does not fit in {} ({} bytes)".format(
+                    array.dtype, array.shape, self.name, self.capacity
+                )
+            )
+
+        # mark the array as being written
+        seq = int(self._header[_Header.SEQ]) + 1
+        self._header[_Header.SEQ] = seq
+
+        self._header[_Header.FRAME_NUMBER] = frame_number
+        self._header[_Header.NBYTES] = array.nbytes
+        self._header[_Header.NDIM] = array.ndim
+        self._header[_Header.SHAPE : _Header.SHAPE + array.ndim] = array.shape
+        self._header[_Header.DTYPE : _Header.DTYPE + 2] = np.frombuffer(
+            array.dtype.str.encode().ljust(_Header.DTYPE_BYTES, b"\0"), dtype=np.uint64
+        )
+
+        # copy the array (in its memory order) directly into the segment
+        np.copyto(
+            self._data[: array.nbytes].view(array.dtype).reshape(array.shape),
+            array,
+        )
+
+        # mark the array as complete
+        self._header[_Header.SEQ] = seq + 1
+
+    def close(self):
+        """Notify the subscribers that the segment is closed and remove it"""
+
+        self._header[_Header.CLOSED] = 1
+
+        # release the numpy views before closing the segment
+        self._header = None
+        self._data = None
+
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedMemorySubscriber:
+    def __init__(self, name: str, timeout: float = None):
+        """Read the arrays published by a SharedMemoryPublisher
+
+        Args:
+            name (str): name of the shared memory segment
+            timeout (float, optional): time (in seconds) to wait for the publisher to create
+                the segment. Defaults to None (wait forever).
+        """
+
+        self.name = name
+
+        # sequence number of the last array that was read
+        self.last_seq = 0
+
+        self._shm = None
+        self._header = None
+        self._data = None
+        self._attach(timeout)
+
+        return
+
+    def _attach(self, timeout: float = None):
+        """Attach to the shared memory segment (waiting until it is created)
+
+        Args:
+            timeout (float, optional): time (in seconds) to wait for the segment.
+                Defaults to None (wait forever).
+
+        Raises:
+            FileNotFoundError: the segment was not created before the timeout
+        """
+
+        start_time = time.time()
+        while True:
+            try:
+                # only the publisher manages the lifetime of the segment
+                shm = attach_segment(self.name)
+                break
+            except FileNotFoundError:
+                if timeout is not None and time.time() - start_time >= timeout:
+                    raise
+                time.sleep(10e-3)
+
+        self._shm = shm
+        self._header = np.ndarray(
+            shape=(_Header.NUM_FIELDS,), dtype=np.uint64, buffer=shm.buf
+        )
+        # the header may not be initialized yet, so use the size of the segment
+        self._data = np.ndarray(
+            shape=(shm.size - _Header.NUM_BYTES,),
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=_Header.NUM_BYTES,
+        )
+        self.last_seq = 0
+
+    @property
+    def closed(self):
+        """True if the publisher closed the segment (call reattach() to attach to a new segment)"""
+        return bool(self._header[_Header.CLOSED])
+
+    def reattach(self, timeout: float = None):
+        """Attach to the new segment after the publisher re-created it
+
+        Args:
+            timeout (float, optional): time (in seconds) to wait for the segment.
+                Defaults to None (wait forever).
+        """
+        self.close()
+        self._attach(timeout)
+
+    def has_new_array(self):
+        """Check if a new array has been published since the last read
+
+        Returns:
+            bool: True if a new (complete) array is available
+        """
+        seq = int(self._header[_Header.SEQ])
+        return seq != self.last_seq and seq % 2 == 0
+
+    def wait_for_new_array(self, timeout: float = None, poll_interval: float = 1e-3):
+        """Wait for a new array to be published
+
+        Args:
+            timeout (float, optional): time (in seconds) to wait. Defaults to None (wait forever).
+            poll_interval (float, optional): time (in seconds) between checks. Defaults to 1e-3.
+
+        Returns:
+            bool: True if a new array is available, False on a timeout or if the segment was closed
+        """
+
+        start_time = time.time()
+        while not self.has_new_array():
+            if self.closed or (
+                timeout is not None and time.time() - start_time >= timeout
+            ):
+                return False
+            time.sleep(poll_interval)
+
+        return True
+
+    def read_view(self):
+        """Get a view of the latest array without copying it. The publisher may overwrite the
+        array at any time, so call view_valid() with the returned sequence number after
+        using the view to check that it was not modified
+
+        Returns:
+            tuple(int,int,np.ndarray): the sequence number, frame number, and a read-only view
+                of the array (None if no array has been published)
+        """
+
+        while True:
+            seq = int(self._header[_Header.SEQ])
+            if seq % 2:
+                continue  # array is being written
+
+            if seq == 0:
+                return seq, 0, None
+
+            frame_number = int(self._header[_Header.FRAME_NUMBER])
+            nbytes = int(self._header[_Header.NBYTES])
+            ndim = int(self._header[_Header.NDIM])
+            shape = tuple(
+                int(dim) for dim in self._header[_Header.SHAPE : _Header.SHAPE + ndim]
+            )
+            dtype = np.dtype(
+                self._header[_Header.DTYPE : _Header.DTYPE + 2]
+                .tobytes()
+                .rstrip(b"\0")
+                .decode()
+            )
+
+            # retry if the header was modified while it was being read
+            if int(self._header[_Header.SEQ]) != seq:
+                continue
+
+            view = self._data[:nbytes].view(dtype).reshape(shape)
+            view.flags.writeable = False
+            self.last_seq = seq
+            return seq, frame_number, view
+
+    def view_valid(self, seq: int):
+        """Check that a view returned by read_view() was not overwritten
+
+        Args:
+            seq (int): the sequence number returned by read_view()
+
+        Returns:
+            bool: True if the array has not been modified since it was read
+        """
+        return int(self._header[_Header.SEQ]) == seq
+
+    def read(self, out: np.ndarray = None):
+        """Copy the latest array out of the shared memory segment
+
+        Args:
+            out (np.ndarray, optional): array to copy into (must match the published
+                shape and dtype). Defaults to None (a new array is allocated).
+
+        Returns:
+            tuple(int,np.ndarray): the frame number and the array (None if no array has been published)
+        """
+
+        while True:
+            seq, frame_number, view = self.read_view()
+            if view is None:
+                return frame_number, None
+
+            if out is None:
+                array = view.copy()
+            else:
+                np.copyto(out, view)
+                array = out
+
+            if self.view_valid(seq):
+                return frame_number, array
+
+    def close(self):
+        """Detach from the shared memory segment"""
+
+        # release the numpy views before closing the segment
+        self._header = None
+        self._data = None
+
+        if self._shm:
+            self._shm.close()
+            self._shm = None
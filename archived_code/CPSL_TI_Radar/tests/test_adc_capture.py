@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import pytest
+
+ADC_Capture = pytest.importorskip("CPSL_TI_Radar.utilities.ADC_Capture")
+from CPSL_TI_Radar.ConfigManager import ConfigManager
+
+config_path = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "generated_config_custom_CFAR.cfg",
+)
+
+
+@pytest.fixture
+def capture(tmp_path):
+    config_manager = ConfigManager()
+    config_manager.load_config_from_cfg(config_path)
+
+    # start with an empty file to get the frame geometry from the capture's decoder
+    capture_path = tmp_path / "adc_data.bin"
+    capture_path.write_bytes(bytes(1))
+    with ADC_Capture.ADCCapture(str(capture_path), config_manager) as capture:
+        decoder = capture.decoder
+
+    # write 5 frames followed by a partial frame
+    rng = np.random.default_rng(0)
+    adc_data = rng.integers(
+        -2048, 2048, size=5 * decoder.num_ints_per_frame + 3, dtype=np.int16
+    )
+    capture_path.write_bytes(adc_data.tobytes())
+
+    capture = ADC_Capture.ADCCapture(str(capture_path), config_manager)
+    yield capture, decoder.decode(adc_data[: 5 * decoder.num_ints_per_frame])
+    capture.close()
+
+def test_capture_geometry(capture):
+    capture, expected = capture
+
+    assert len(capture) == 5
+    assert capture.shape == expected.shape
+    assert capture.num_trailing_bytes == 6
+
+def test_capture_indexing(capture):
+    capture, expected = capture
+
+    assert np.array_equal(capture[2], expected[2])
+    assert np.array_equal(capture[-1], expected[-1])
+    assert np.array_equal(capture[1:4], expected[1:4])
+    assert np.array_equal(capture[::2], expected[::2])
+    assert np.array_equal(capture[[4, 0]], expected[[4, 0]])
+    assert np.array_equal(capture[3, 1, :, 0], expected[3, 1, :, 0])
+
+    with pytest.raises(IndexError):
+        capture[5]
+
+def test_capture_iter_frames(capture):
+    capture, expected = capture
+
+    start_frames = []
+    for start_frame, frames in capture.iter_frames(batch_size=2):
+        start_frames.append(start_frame)
+        assert np.array_equal(frames, expected[start_frame : start_frame + 2])
+
+    assert start_frames == [0, 2, 4]
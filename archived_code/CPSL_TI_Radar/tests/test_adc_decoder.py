@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+ADC_Decoder = pytest.importorskip("CPSL_TI_Radar.utilities.ADC_Decoder")
+ADCDecoder = ADC_Decoder.ADCDecoder
+
+num_rx = 4
+samples_per_chirp = 8
+chirps_per_frame = 6
+num_frames = 3
+
+
+def random_frames(decoder):
+    rng = np.random.default_rng(0)
+    return rng.integers(
+        -2048, 2048, size=num_frames * decoder.num_ints_per_frame, dtype=np.int16
+    )
+
+def test_interleaved_matches_reshape():
+
+    decoder = ADCDecoder(num_rx, samples_per_chirp, chirps_per_frame)
+    adc_data = random_frames(decoder)
+
+    cube = decoder.decode(adc_data.tobytes())
+
+    assert cube.dtype == np.complex64
+    assert cube.shape == (num_frames, num_rx, samples_per_chirp, chirps_per_frame)
+    for frame in range(num_frames):
+        frame_data = adc_data[
+            frame * decoder.num_ints_per_frame : (frame + 1) * decoder.num_ints_per_frame
+        ]
+        frame_data = np.reshape(frame_data, (2 * num_rx, -1), order="F")
+        frame_data = frame_data[0:num_rx] + 1j * frame_data[num_rx:]
+        expected = np.reshape(
+            frame_data, (num_rx, samples_per_chirp, chirps_per_frame), order="F"
+        )
+        assert np.array_equal(cube[frame], expected)
+
+def test_deinterleave_lanes():
+
+    adc_data = random_frames(ADCDecoder(num_rx, samples_per_chirp, chirps_per_frame))
+
+    samples = ADCDecoder.deinterleave_lanes(adc_data, num_lanes=4)
+
+    groups = adc_data.reshape(-1, 8)
+    expected = (groups[:, :4] + 1j * groups[:, 4:]).reshape(-1)
+    assert samples.dtype == np.complex64
+    assert np.array_equal(samples, expected)
+
+    # a 1 sample, 1 chirp frame holds one sample per lane
+    lane_decoder = ADCDecoder(num_rx=2, samples_per_chirp=1, chirps_per_frame=1)
+    assert np.array_equal(
+        ADCDecoder.deinterleave_lanes(adc_data.tobytes(), num_lanes=2),
+        lane_decoder.decode(adc_data).reshape(-1),
+    )
+
+    with pytest.raises(ValueError):
+        ADCDecoder.deinterleave_lanes(adc_data[:-1], num_lanes=4)
+
+def test_non_interleaved_matches_ADCCubeConverter():
+
+    decoder = ADCDecoder(
+        num_rx, samples_per_chirp, chirps_per_frame, ADCDecoder.NON_INTERLEAVED
+    )
+    adc_data = random_frames(decoder)
+
+    cube = decoder.decode(adc_data)
+
+    # groups of [I0, I1, Q0, Q1] ordered by chirp, rx, sample
+    groups = adc_data.reshape(num_frames, chirps_per_frame, num_rx, -1, 4)
+    assert cube[1, 2, 0, 3] == groups[1, 3, 2, 0, 2] + 1j * groups[1, 3, 2, 0, 0]
+    assert cube[1, 2, 1, 3] == groups[1, 3, 2, 0, 3] + 1j * groups[1, 3, 2, 0, 1]
+    assert cube[2, 3, 7, 5] == groups[2, 5, 3, 3, 3] + 1j * groups[2, 5, 3, 3, 1]
+
+def test_decode_into_out_buffer():
+
+    decoder = ADCDecoder(num_rx, samples_per_chirp, chirps_per_frame)
+    adc_data = random_frames(decoder)
+    out = decoder.allocate(num_frames + 2)
+
+    cube = decoder.decode(adc_data, out=out)
+
+    assert np.shares_memory(cube, out)
+    assert cube.shape[0] == num_frames
+
+    with pytest.raises(ValueError):
+        decoder.decode(adc_data, out=decoder.allocate(num_frames - 1))
+
+@pytest.mark.parametrize(
+    "data_format",
+    [ADCDecoder.INTERLEAVED, ADCDecoder.NON_INTERLEAVED, ADCDecoder.IQ_PAIRS],
+)
+def test_encode_inverts_decode(data_format):
+
+    decoder = ADCDecoder(num_rx, samples_per_chirp, chirps_per_frame, data_format)
+    adc_data = random_frames(decoder)
+
+    assert decoder.encode(decoder.decode(adc_data)) == adc_data.tobytes()
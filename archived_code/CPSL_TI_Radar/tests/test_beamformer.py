@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+_Beamformer = pytest.importorskip(
+    "CPSL_TI_Radar.Processors.DCA1000_Processors._Beamformer"
+)._Beamformer
+
+num_antennas = 8
+angle_bins = np.deg2rad(np.arange(-90, 90, 180 / 64))
+
+
+def reference_response(rng_fft, method):
+    """Per range bin bartlet/capon response (no diagonal loading)"""
+    a_phi = np.exp(1j * np.pi * np.outer(np.sin(angle_bins), np.arange(num_antennas)))
+    p = np.zeros((rng_fft.shape[1], angle_bins.size), dtype=complex)
+    for l in range(rng_fft.shape[1]):
+        x = rng_fft[:, l, :]
+        Rxx = x @ np.conj(x.T) / x.shape[1]
+        if method == _Beamformer.CAPON:
+            Rxx = np.linalg.inv(Rxx)
+        p[l, :] = np.einsum("am,mk,ak->a", np.conj(a_phi), Rxx, a_phi)
+    return p if method == _Beamformer.BARTLET else 1.0 / p
+
+@pytest.fixture
+def rng_fft():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(num_antennas, 32, 16)) + 1j * rng.normal(
+        size=(num_antennas, 32, 16)
+    )
+
+@pytest.mark.parametrize("method", [_Beamformer.BARTLET, _Beamformer.CAPON])
+def test_matches_per_bin_response(rng_fft, method):
+
+    beamformer = _Beamformer(num_antennas, angle_bins, method, diagonal_loading=0)
+
+    assert np.allclose(
+        beamformer.compute_response(rng_fft), reference_response(rng_fft, method)
+    )
+
+def test_capon_singular_covariance():
+
+    # a single chirp gives rank 1 covariances that can only be inverted with loading
+    rng_fft = np.ones((num_antennas, 4, 1), dtype=complex)
+    beamformer = _Beamformer(num_antennas, angle_bins, _Beamformer.CAPON)
+
+    assert np.all(np.isfinite(beamformer.compute_response(rng_fft)))
@@ -0,0 +1,153 @@
+import os
+import socket
+import struct
+import numpy as np
+import pytest
+from multiprocessing import Pipe
+
+Capture_Replay = pytest.importorskip("CPSL_TI_Radar.utilities.Capture_Replay")
+from CPSL_TI_Radar.ConfigManager import ConfigManager
+from CPSL_TI_Radar._Shared_Frame_Ring import _SharedFrameRing
+from CPSL_TI_Radar.Streamers.Handlers.DCA1000 import DCA1000DataPacket
+
+CaptureReplay = Capture_Replay.CaptureReplay
+
+config_path = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "generated_config_custom_CFAR.cfg",
+)
+
+MAGIC_WORD = bytes([0x02, 0x01, 0x04, 0x03, 0x06, 0x05, 0x08, 0x07])
+
+
+@pytest.fixture
+def config_manager():
+    config_manager = ConfigManager()
+    config_manager.load_config_from_cfg(config_path)
+    return config_manager
+
+def write_ADC_capture(capture_path, config_manager, num_frames):
+    """Write a capture with num_frames random frames followed by a partial frame"""
+
+    # start with a single byte to get the frame size
+    capture_path.write_bytes(bytes(1))
+    with CaptureReplay(str(capture_path), config_manager) as replay:
+        num_bytes_per_frame = replay.num_bytes_per_frame
+
+    rng = np.random.default_rng(0)
+    data = rng.integers(
+        0, 256, size=num_frames * num_bytes_per_frame + 100, dtype=np.uint8
+    ).tobytes()
+    capture_path.write_bytes(data)
+    return data, num_bytes_per_frame
+
+def test_replay_DCA1000_to_processor(tmp_path, config_manager):
+
+    capture_path = tmp_path / "adc_data.bin"
+    data, num_bytes_per_frame = write_ADC_capture(capture_path, config_manager, 4)
+
+    DCA1000_settings = {
+        "system_IP": "127.0.0.1",
+        "data_port": 14098,
+        "frame_ring_slots": 8,
+    }
+    conn_processor_data, conn_streamer_data = Pipe(duplex=False)
+
+    with CaptureReplay(str(capture_path), config_manager, speed=None) as replay:
+        assert replay.num_frames == 4
+        assert replay.replay_to_processor(conn_streamer_data, DCA1000_settings) == 4
+        assert replay.num_bytes_sent == 4 * num_bytes_per_frame
+
+        # the ring is available until the replay is closed
+        frame_ring = _SharedFrameRing(_SharedFrameRing.name_from_settings(DCA1000_settings))
+        for frame_idx in range(4):
+            slot_idx, seq = _SharedFrameRing.decode_message(conn_processor_data.recv_bytes())
+            assert seq == frame_idx + 1
+            assert (
+                frame_ring.get_slot(slot_idx).tobytes()
+                == data[frame_idx * num_bytes_per_frame : (frame_idx + 1) * num_bytes_per_frame]
+            )
+        frame_ring.close()
+
+def test_replay_DCA1000_to_udp(tmp_path, config_manager):
+
+    capture_path = tmp_path / "LVDS_Raw_0.bin"
+    data, num_bytes_per_frame = write_ADC_capture(capture_path, config_manager, 3)
+
+    data_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    data_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2**23)
+    data_socket.bind(("127.0.0.1", 0))
+    data_socket.settimeout(1)
+
+    with CaptureReplay(str(capture_path), config_manager, speed=None) as replay:
+        replay.replay_to_udp(data_socket.getsockname(), start_frame=1, num_frames=2)
+        num_packets = replay.num_packets_sent
+
+    stream = bytearray(2 * num_bytes_per_frame)
+    for seq_num in range(1, num_packets + 1):
+        packet = data_socket.recv(2048)
+        packet_seq_num, byte_count_low, byte_count_high = struct.unpack_from("<IIH", packet)
+        byte_count = byte_count_low | (byte_count_high << 32)
+        payload = packet[10:]
+
+        assert packet_seq_num == seq_num
+        assert len(payload) <= DCA1000DataPacket.PAYLOAD_BYTES
+        stream[byte_count : byte_count + len(payload)] = payload
+    data_socket.close()
+
+    assert num_packets == -(-2 * num_bytes_per_frame // DCA1000DataPacket.PAYLOAD_BYTES)
+    assert stream == data[num_bytes_per_frame : 3 * num_bytes_per_frame]
+
+def test_replay_serial_to_processor(tmp_path, config_manager):
+
+    packets = []
+    for frame_number in range(5):
+        payload = bytes([frame_number]) * (8 * frame_number)
+        packet_length = 40 + len(payload)
+        packets.append(
+            MAGIC_WORD
+            + struct.pack("<8I", 0x03050004, packet_length, 0x6843, frame_number, 0, 0, 0, 0)
+            + payload
+        )
+
+    # start in the middle of a packet
+    capture_path = tmp_path / "serial_stream.dat"
+    capture_path.write_bytes(packets[0][20:] + b"".join(packets[1:]))
+
+    conn_processor_data, conn_streamer_data = Pipe(duplex=False)
+    with CaptureReplay(str(capture_path), config_manager, speed=None) as replay:
+        assert replay.capture_type == CaptureReplay.SERIAL
+        assert replay.replay_to_processor(conn_streamer_data, start_frame=1) == 3
+
+    assert [conn_processor_data.recv_bytes() for _ in range(3)] == packets[2:]
+    assert not conn_processor_data.poll()
+
+def test_replay_speed(tmp_path, config_manager):
+
+    capture_path = tmp_path / "adc_data.bin"
+    write_ADC_capture(capture_path, config_manager, 5)
+
+    # 50 ms frames at 5x speed are sent every 10 ms
+    with CaptureReplay(str(capture_path), config_manager, speed=5) as replay:
+        for frame_idx, frame in replay.iter_frames():
+            pass
+        assert replay.num_frames_sent == 5
+        assert replay.elapsed_s >= 0.04
+        assert replay.frame_rate < 5 / 0.04
+
+        # stopping a replay
+        for frame_idx, frame in replay.iter_frames():
+            replay.stop()
+        assert replay.num_frames_sent == 1
+
+def test_invalid_capture_type(tmp_path, config_manager):
+
+    capture_path = tmp_path / "serial_stream.dat"
+    capture_path.write_bytes(bytes(100))
+
+    with pytest.raises(ValueError):
+        CaptureReplay(str(capture_path), config_manager, capture_type="USB")
+
+    with CaptureReplay(str(capture_path), config_manager) as replay:
+        with pytest.raises(ValueError):
+            replay.replay_to_udp(("127.0.0.1", 4098))
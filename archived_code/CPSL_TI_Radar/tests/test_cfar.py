@@ -0,0 +1,214 @@
+import os
+import numpy as np
+import pytest
+
+_CFAR = pytest.importorskip("CPSL_TI_Radar.Processors.DCA1000_Processors._CFAR")
+from CPSL_TI_Radar.ConfigManager import ConfigManager
+from CPSL_TI_Radar.Processors.DCA1000_Processors._Point_Cloud_Generator import (
+    _PointCloudGenerator,
+)
+from CPSL_TI_Radar.Processors.DCA1000_Processors._Processing_Context import (
+    _ProcessingContext,
+)
+
+radar_config_folder = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "..",
+    "..",
+    "CPSL_TI_Radar_cpp",
+    "config",
+    "radar",
+)
+
+
+def compute_noise_reference(cfar, data):
+    """Compute the CFAR noise estimate of each cell of a 1D array one cell at a time"""
+    noise = np.empty_like(data)
+    num_cells = data.size
+    for i in range(num_cells):
+        offsets = np.arange(cfar.num_guard + 1, cfar.num_guard + cfar.num_train + 1)
+        lagging, leading = i - offsets, i + offsets
+        if cfar.cyclic:
+            lagging, leading = lagging % num_cells, leading % num_cells
+        else:
+            lagging = lagging[lagging >= 0]
+            leading = leading[leading < num_cells]
+
+        match cfar.method:
+            case _CFAR._CFAR.CA:
+                noise[i] = np.mean(data[np.concatenate([lagging, leading])])
+            case _CFAR._CFAR.OS:
+                training_cells = np.sort(data[np.concatenate([lagging, leading])])
+                rank = int(np.round(cfar.os_rank * (training_cells.size - 1)))
+                noise[i] = training_cells[rank]
+            case _:
+                means = [np.mean(data[idxs]) for idxs in (lagging, leading) if idxs.size]
+                noise[i] = max(means) if cfar.method == _CFAR._CFAR.CAGO else min(means)
+    return noise
+
+def is_peak_reference(cfar, data):
+    """Check if each cell of a 1D array is not smaller than its neighbors one cell at a time"""
+    num_cells = data.size
+    is_peak = np.empty(num_cells, dtype=bool)
+    for i in range(num_cells):
+        neighbors = np.array([i - 1, i + 1])
+        if cfar.cyclic:
+            neighbors = neighbors % num_cells
+        else:
+            neighbors = neighbors[(neighbors >= 0) & (neighbors < num_cells)]
+        is_peak[i] = np.all(data[i] >= data[neighbors])
+    return is_peak
+
+@pytest.mark.parametrize("method", ["CA", "CAGO", "CASO", "OS"])
+@pytest.mark.parametrize("cyclic", [False, True])
+def test_noise_matches_reference(method, cyclic):
+
+    det_matrix = np.random.default_rng(0).normal(size=(20, 12))
+
+    for axis in (0, 1):
+        cfar = _CFAR._CFAR(
+            num_train=3, num_guard=2, threshold=1, method=method, axis=axis, cyclic=cyclic
+        )
+        expected = np.apply_along_axis(
+            lambda data: compute_noise_reference(cfar, data), axis, det_matrix
+        )
+        assert np.allclose(cfar.compute_noise(det_matrix), expected)
+
+def load_cfarCfg(config_file):
+    """Load the cfarCfg commands of a radar config in CPSL_TI_Radar_cpp/config/radar"""
+    config_manager = ConfigManager()
+    config_manager.load_config_from_cfg(os.path.join(radar_config_folder, config_file))
+    return config_manager.radar_config["cfarCfg"]
+
+def test_sdk3_cfarCfg():
+
+    # cfarCfg -1 0 2 8 4 3 0 15 0 and cfarCfg -1 1 0 4 2 3 1 15 1
+    cfarCfgs = load_cfarCfg(os.path.join("nav_configs", "6843_vel_sr.cfg"))
+    assert len(cfarCfgs) == 2
+
+    range_cfar, doppler_cfar = _CFAR._CFARDetector.from_cfarCfg(
+        cfarCfgs, num_virtual_antennas=12
+    ).cfars
+    assert (
+        range_cfar.axis,
+        range_cfar.method,
+        range_cfar.num_train,
+        range_cfar.num_guard,
+        range_cfar.cyclic,
+        range_cfar.peak_grouping,
+    ) == (0, _CFAR._CFAR.CASO, 8, 4, False, False)
+    assert (
+        doppler_cfar.axis,
+        doppler_cfar.method,
+        doppler_cfar.num_train,
+        doppler_cfar.num_guard,
+        doppler_cfar.cyclic,
+        doppler_cfar.peak_grouping,
+    ) == (1, _CFAR._CFAR.CA, 4, 2, True, True)
+
+    # SDK 3.x thresholds are in dB (log2 magnitude steps of 6 dB)
+    assert range_cfar.threshold == doppler_cfar.threshold == pytest.approx(15 / 6)
+
+def test_sdk2_cfarCfg():
+
+    # cfarCfg 0 2 8 4 3 0 1280
+    cfarCfgs = load_cfarCfg(os.path.join("IWR_Demos", "1443config.cfg"))
+    assert len(cfarCfgs) == 1
+
+    (cfar,) = _CFAR._CFARDetector.from_cfarCfg(cfarCfgs, num_virtual_antennas=8).cfars
+    assert cfar.threshold == pytest.approx(
+        ConfigManager.CFAR_threshold_cli_to_dB(1280, 8) / 6
+    )
+    assert (cfar.axis, cfar.method, cfar.num_train, cfar.num_guard, cfar.cyclic) == (
+        0,
+        _CFAR._CFAR.CASO,
+        8,
+        4,
+        False,
+    )
+
+def test_cfarCfg_exported(tmp_path):
+
+    config_manager = ConfigManager()
+    config_manager.load_config_from_cfg(
+        os.path.join(radar_config_folder, "nav_configs", "6843_vel_sr.cfg")
+    )
+    cfg_path = str(tmp_path / "radar.cfg")
+    config_manager.export_config_as_cfg(cfg_path)
+
+    with open(cfg_path) as f:
+        cfarCfg_lines = [line for line in f.read().splitlines() if line.startswith("cfarCfg")]
+    assert cfarCfg_lines == ["cfarCfg -1 0 2 8 4 3 0 15 0", "cfarCfg -1 1 0 4 2 3 1 15 1"]
+
+def test_detection_in_both_directions():
+
+    det_matrix = np.random.default_rng(0).normal(size=(32, 16))
+    det_matrix[10, 4] += 8
+    det_matrix[20, :] += 8  # detected along range only
+    det_matrix[:, 12] += 8  # detected along doppler only
+    detector = _CFAR._CFARDetector.from_cfarCfg(
+        load_cfarCfg(os.path.join("nav_configs", "6843_vel_sr.cfg")), num_virtual_antennas=12
+    )
+
+    expected = np.ones(det_matrix.shape, dtype=bool)
+    for cfar in detector.cfars:
+        noise = np.apply_along_axis(
+            lambda data: compute_noise_reference(cfar, data), cfar.axis, det_matrix
+        )
+        expected &= det_matrix > noise + cfar.threshold
+        if cfar.peak_grouping:
+            expected &= np.apply_along_axis(
+                lambda data: is_peak_reference(cfar, data), cfar.axis, det_matrix
+            )
+
+    detections = detector.detect(det_matrix)
+    assert np.array_equal(detections, expected)
+    assert detections[10, 4] and not detections[20, 2] and not detections[2, 12]
+
+def test_point_cloud_from_single_target():
+
+    num_antennas, samples_per_chirp, num_chirps = 8, 64, 16
+    range_bin, doppler_bin, sin_theta = 20, 3, 0.25
+    range_res, vel_res = 0.1, 0.05
+
+    # a single target (positive angles have negative phase shifts across the antennas)
+    antennas, samples, chirps = np.meshgrid(
+        np.arange(num_antennas),
+        np.arange(samples_per_chirp),
+        np.arange(num_chirps),
+        indexing="ij",
+    )
+    adc_data_cube = np.exp(
+        2j * np.pi * range_bin * samples / samples_per_chirp
+        + 2j * np.pi * doppler_bin * chirps / num_chirps
+        - 1j * np.pi * sin_theta * antennas
+    )
+    rng = np.random.default_rng(0)
+    adc_data_cube += 0.01 * (
+        rng.normal(size=adc_data_cube.shape) + 1j * rng.normal(size=adc_data_cube.shape)
+    )
+
+    context = _ProcessingContext(
+        num_antennas=num_antennas,
+        samples_per_chirp=samples_per_chirp,
+        num_chirps=num_chirps,
+        num_chirps_to_save=num_chirps,
+        max_range_bin=32,
+        num_angle_bins=32,
+    )
+    generator = _PointCloudGenerator(
+        cfar=_CFAR._CFAR(num_train=4, num_guard=2, threshold=15 / 6, axis=1, cyclic=True),
+        range_res=range_res,
+        vel_res=vel_res,
+        num_angle_bins=32,
+    )
+    points = generator.generate(
+        context.compute_range_doppler_fft(context.compute_range_fft(adc_data_cube))
+    )
+
+    r = range_bin * range_res
+    expected = [r * sin_theta, r * np.sqrt(1 - sin_theta**2), 0, doppler_bin * vel_res]
+    assert points.dtype == np.float32
+    assert points.shape == (1, 4)
+    assert np.allclose(points[0], expected, atol=1e-5)
@@ -0,0 +1,91 @@
+import os
+import shutil
+import pytest
+
+Config_Manager = pytest.importorskip("CPSL_TI_Radar.ConfigManager")
+ConfigCache = Config_Manager.ConfigCache
+ConfigManager = Config_Manager.ConfigManager
+
+config_path = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "generated_config_custom_CFAR.cfg",
+)
+
+
+def test_cached_cfg_matches_config_manager(tmp_path):
+
+    cfg_path = shutil.copy(config_path, tmp_path / "radar.cfg")
+    cache = ConfigCache()
+    cached_config = cache.load(str(cfg_path))
+
+    config_manager = ConfigManager()
+    with open(config_path) as f:
+        config_manager._load_cfg_lines(f.read().splitlines())
+    config_manager.config_loaded = True
+    config_manager.compute_radar_perforance()
+
+    assert Config_Manager.thaw_config(cached_config.radar_config) == config_manager.radar_config
+    assert (
+        cached_config.radar_performance["range"]["range_res"]
+        == config_manager.radar_performance["range"]["range_res"]
+    )
+
+    # cached configurations can not be modified
+    with pytest.raises(TypeError):
+        cached_config.radar_config["cfarCfg"][0]["threshold"] = "0"
+    with pytest.raises(TypeError):
+        cached_config.radar_config["chirpCfg"][0] = None
+
+def test_cache_invalidation(tmp_path):
+
+    cfg_path = tmp_path / "radar.cfg"
+    shutil.copy(config_path, cfg_path)
+    cache = ConfigCache()
+
+    cached_config = cache.load(str(cfg_path))
+    assert cache.load(str(cfg_path)) is cached_config
+    assert (cache.num_hits, cache.num_misses) == (1, 1)
+
+    # files with the same contents share the parsed configuration
+    copy_path = shutil.copy(cfg_path, tmp_path / "copy.cfg")
+    assert cache.load(str(copy_path)) is cached_config
+
+    # modified files are parsed again
+    content = cfg_path.read_text().replace("frameCfg 0 1 16 0 50", "frameCfg 0 1 16 0 100")
+    assert content != cfg_path.read_text()
+    cfg_path.write_text(content)
+    os.utime(cfg_path, ns=(0, 0))
+    modified_config = cache.load(str(cfg_path))
+    assert modified_config is not cached_config
+    assert modified_config.radar_config["frameCfg"]["periodicity"] == "100"
+
+def test_config_manager_copies_cached_config(tmp_path):
+
+    cfg_path = shutil.copy(config_path, tmp_path / "radar.cfg")
+    config_manager = ConfigManager()
+    config_manager.load_config_from_cfg(str(cfg_path))
+    config_manager.radar_config["cfarCfg"][0]["threshold"] = "0"
+
+    # changes made by one ConfigManager are not seen by others
+    other_config_manager = ConfigManager()
+    other_config_manager.load_config_from_cfg(str(cfg_path))
+    assert other_config_manager.radar_config["cfarCfg"][0]["threshold"] != "0"
+
+    # JSON exports load back into the same configuration
+    json_path = str(tmp_path / "radar.json")
+    other_config_manager.export_config_as_json(json_path)
+    json_config_manager = ConfigManager()
+    json_config_manager.load_config_from_JSON(json_path)
+    assert json_config_manager.radar_config == other_config_manager.radar_config
+
+def test_index_directory(tmp_path):
+
+    shutil.copy(config_path, tmp_path / "a.cfg")
+    shutil.copy(config_path, tmp_path / "b.cfg")
+    (tmp_path / "invalid.json").write_text("{")
+    (tmp_path / "notes.txt").write_text("frameCfg")
+
+    cache = ConfigCache()
+    index = cache.index_directory(str(tmp_path))
+    assert [os.path.basename(path) for path in index] == ["a.cfg", "b.cfg"]
+    assert cache.num_misses == 2
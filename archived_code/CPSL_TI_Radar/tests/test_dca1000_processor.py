@@ -0,0 +1,126 @@
+import os
+import numpy as np
+import pytest
+from multiprocessing import Pipe
+
+DCA1000_Processor = pytest.importorskip("CPSL_TI_Radar.Processors.DCA1000_Processor")
+
+settings_path = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "json_radar_settings",
+    "radar_1.json",
+)
+
+
+class _TestDCA1000Processor(DCA1000_Processor.DCA1000Processor):
+    def run(self):
+        # the tests call the processor methods directly
+        return
+
+
+@pytest.fixture
+def processor():
+    """DCA1000Processor streaming to a RadCloud model and PointCloud listener
+
+    Returns:
+        tuple(DCA1000Processor,Connection,Connection): the processor, and the model and
+            PointCloud listener ends of their connections
+    """
+    conn_parent, conn_parent_processor = Pipe()
+    conn_data, conn_data_processor = Pipe()
+    processor = _TestDCA1000Processor(
+        conn_parent_processor, conn_data_processor, settings_file_path=settings_path
+    )
+
+    conn_model, processor._conn_RadCloudModel = Pipe()
+    conn_point_cloud, processor._conn_PointCloud = Pipe()
+    processor._conn_RadCloudModel_enabled = True
+    processor._conn_PointCloud_enabled = True
+    processor._listeners_enabled = True
+    processor.point_cloud_method = "RadCloudModel"
+    processor.config_loaded = True
+    processor.RadCloudModel_max_frames_in_flight = 2
+
+    yield processor, conn_model, conn_point_cloud
+    processor.close()
+
+def send_frame(processor, frame_number):
+    range_azimuth_response = np.full((4, 4), frame_number, dtype=np.float32)
+    processor._send_frame_results(frame_number, None, range_azimuth_response, None)
+
+def run_model(conn_model):
+    """Reply to every range-azimuth response with a point cloud holding its frame number"""
+    while conn_model.poll():
+        range_azimuth_response = conn_model.recv()
+        conn_model.send(np.full((1, 4), range_azimuth_response[0, 0]))
+
+def recv_point_clouds(conn_point_cloud):
+    point_clouds = []
+    while conn_point_cloud.poll():
+        point_clouds.append(conn_point_cloud.recv())
+    return point_clouds
+
+def test_frames_skipped_while_model_busy(processor):
+
+    processor, conn_model, conn_point_cloud = processor
+    processor._start_streaming()
+
+    for frame_number in range(1, 5):
+        send_frame(processor, frame_number)
+    assert list(processor._RadCloudModel_frames_in_flight) == [1, 2]
+    assert processor.num_frames_skipped_RadCloudModel == 2
+    assert processor._conn_RadCloudModel in processor._get_data_conns()
+
+    # the point clouds are matched to the frames they were generated from
+    run_model(conn_model)
+    processor._process_RadCloudModel_results()
+    point_clouds = recv_point_clouds(conn_point_cloud)
+    assert [frame_number for frame_number, _ in point_clouds] == [1, 2]
+    for frame_number, point_cloud in point_clouds:
+        assert np.all(point_cloud == frame_number)
+    assert processor.RadCloudModel_latency_frames == 2
+    assert processor._conn_RadCloudModel not in processor._get_data_conns()
+
+    # frames are sent to the model again once it catches up
+    send_frame(processor, 5)
+    assert list(processor._RadCloudModel_frames_in_flight) == [5]
+    assert processor.num_frames_skipped_RadCloudModel == 2
+
+def test_restart_discards_frames_in_flight(processor):
+
+    processor, conn_model, conn_point_cloud = processor
+    processor._start_streaming()
+    send_frame(processor, 1)
+
+    # the frame numbers start over for the new stream
+    processor._start_streaming()
+    assert len(processor._RadCloudModel_frames_in_flight) == 0
+    assert processor._conn_RadCloudModel in processor._get_data_conns()
+
+    # the model point cloud of the previous stream's frame counts against max_frames_in_flight
+    send_frame(processor, 7)
+    send_frame(processor, 8)
+    assert list(processor._RadCloudModel_frames_in_flight) == [7]
+    assert processor.num_frames_skipped_RadCloudModel == 1
+
+    run_model(conn_model)
+    processor._process_RadCloudModel_results()
+    point_clouds = recv_point_clouds(conn_point_cloud)
+    assert len(point_clouds) == 1
+    frame_number, point_cloud = point_clouds[0]
+    assert frame_number == 7 and np.all(point_cloud == 7)
+    assert processor._conn_RadCloudModel not in processor._get_data_conns()
+
+def test_cfar_point_clouds_sent_with_frame_number(processor):
+
+    processor, conn_model, conn_point_cloud = processor
+    processor.point_cloud_method = "CFAR"
+    processor._start_streaming()
+
+    point_cloud = np.ones((3, 4), dtype=np.float32)
+    processor._send_frame_results(3, None, None, None, point_cloud)
+
+    assert not conn_model.poll()
+    frame_number, received_point_cloud = conn_point_cloud.recv()
+    assert frame_number == 3
+    assert np.array_equal(received_point_cloud, point_cloud)
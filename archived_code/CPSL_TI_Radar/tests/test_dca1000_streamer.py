@@ -0,0 +1,123 @@
+import os
+import numpy as np
+import pytest
+from multiprocessing import Pipe
+
+DCA1000_Streamer = pytest.importorskip("CPSL_TI_Radar.Streamers.DCA1000_Streamer")
+from CPSL_TI_Radar.Streamers._Frame_Assembler import _FrameAssembler
+from CPSL_TI_Radar.Streamers.Handlers.DCA1000 import DCA1000DataPacket
+
+settings_path = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "json_radar_settings",
+    "radar_1.json",
+)
+
+PAYLOAD_SIZE = 4
+
+
+class _TestDCA1000Streamer(DCA1000_Streamer.DCA1000Streamer):
+    def run(self):
+        # the tests call the streamer methods directly
+        return
+
+
+@pytest.fixture
+def streamer():
+    """DCA1000Streamer assembling frames into a list (instead of the shared frame ring)
+
+    Returns:
+        tuple(DCA1000Streamer,list): the streamer and the list of completed frames
+    """
+    conn_parent, conn_parent_streamer = Pipe()
+    conn_data, conn_data_streamer = Pipe()
+    conn_handler, conn_handler_streamer = Pipe()
+    streamer = _TestDCA1000Streamer(
+        conn_parent_streamer,
+        conn_data_streamer,
+        conn_handler_streamer,
+        settings_file_path=settings_path,
+    )
+
+    frames = []
+    streamer.frame_assembler = _FrameAssembler(
+        num_bytes_per_frame=4 * PAYLOAD_SIZE,
+        frame_complete_callback=lambda frame: frames.append(frame.copy()),
+    )
+
+    yield streamer, frames
+    streamer.close()
+
+def make_packet(seq_num):
+    """UDP packet with sequence number seq_num (numbered from 1) filled with seq_num"""
+    byte_count = (seq_num - 1) * PAYLOAD_SIZE
+    header = DCA1000DataPacket.HEADER.pack(seq_num, byte_count & 0xFFFFFFFF, byte_count >> 32)
+    return memoryview(header + bytes([seq_num]) * PAYLOAD_SIZE)
+
+def test_in_order_packets(streamer):
+    streamer, frames = streamer
+
+    for seq_num in range(1, 9):
+        streamer._process_packet(make_packet(seq_num))
+
+    assert streamer.dropped_udp_packets == 0
+    assert streamer.udp_packet_num == 8
+    assert streamer.udp_byte_count == 8 * PAYLOAD_SIZE
+    assert len(frames) == 2
+
+def test_reordered_packets(streamer):
+    streamer, frames = streamer
+
+    for seq_num in [1, 2, 3, 5, 7, 6, 8]:
+        streamer._process_packet(make_packet(seq_num))
+
+    # packet 6 arrived late, only packet 4 was dropped
+    assert streamer.dropped_udp_packets == 1
+    assert streamer.udp_packet_num == 8
+    assert streamer.udp_byte_count == 8 * PAYLOAD_SIZE
+
+    expected = np.repeat(np.array([1, 2, 3, 0, 5, 6, 7, 8], dtype=np.uint8), PAYLOAD_SIZE)
+    np.testing.assert_array_equal(np.concatenate(frames), expected)
+
+def test_packetize():
+
+    stream = np.random.default_rng(0).integers(0, 256, size=4000, dtype=np.uint8)
+    byte_count = 2**32 + 100
+
+    # packets are generated until the stop byte (the last packet extends past it)
+    packets = [
+        (bytes(header), payload)
+        for header, payload in DCA1000DataPacket.packetize(
+            memoryview(stream), byte_count, byte_count + 2000, 7
+        )
+    ]
+    assert [len(payload) for _, payload in packets] == [1456, 1456]
+    for packet_idx, (header, payload) in enumerate(packets):
+        packet_byte_count = byte_count + packet_idx * 1456
+        assert DCA1000DataPacket.HEADER.unpack(header) == (
+            7 + packet_idx, packet_byte_count & 0xFFFFFFFF, packet_byte_count >> 32
+        )
+        assert payload == stream[packet_idx * 1456 : (packet_idx + 1) * 1456].tobytes()
+
+    # the last packet is shortened when the stream ends
+    payload_sizes = [
+        len(payload)
+        for _, payload in DCA1000DataPacket.packetize(memoryview(stream), 0, 10000, 1)
+    ]
+    assert payload_sizes == [1456, 1456, 1088]
+
+def test_packetized_stream(streamer):
+    streamer, frames = streamer
+
+    # packets of several frames assembled by the streamer
+    streamer.frame_assembler = _FrameAssembler(
+        num_bytes_per_frame=2000,
+        frame_complete_callback=lambda frame: frames.append(frame.copy()),
+    )
+    stream = np.random.default_rng(0).integers(0, 256, size=6000, dtype=np.uint8)
+    for header, payload in DCA1000DataPacket.packetize(memoryview(stream), 0, stream.size, 1):
+        streamer._process_packet(memoryview(bytes(header) + payload))
+
+    assert streamer.dropped_udp_packets == 0
+    assert streamer.udp_byte_count == stream.size
+    np.testing.assert_array_equal(np.concatenate(frames), stream)
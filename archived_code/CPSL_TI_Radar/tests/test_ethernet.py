@@ -2,6 +2,10 @@ import json
 import os
 import socket
 import struct
+import threading
+import numpy as np
+import pytest
+from multiprocessing import Pipe
 
 
 #test to check that the serial ports work
@@ -170,3 +174,129 @@ def decode_FPGA_version(received_messsage: int):
         FPGA_version = "{}.{}".format(major_version, minor_version)
 
         return FPGA_version
+
+def get_free_port():
+    """Get a port that is free on both loopback addresses used by the DCA1000 emulator"""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def run_emulated_DCA1000Handler(json_config_path, tmp_path, emulator_kwargs):
+    """Stream a fixed number of frames from a DCA1000 emulator to a DCA1000Handler
+    (receive thread + packet ring) on loopback
+
+    Returns:
+        tuple(DCA1000Emulator,list,list): the emulator, the handler messages, and the
+            (sequence number, byte count, payload length) of each received packet
+    """
+
+    DCA1000_Emulator = pytest.importorskip("CPSL_TI_Radar.utilities.DCA1000_Emulator")
+    from CPSL_TI_Radar.Streamers.Handlers.DCA1000 import DCA1000Handler, DCA1000PacketRing
+    from CPSL_TI_Radar._Message import _Message, _MessageTypes
+
+    settings = parse_json(json_config_path)
+    DCA1000_settings = settings["Streamer"]["DCA1000_streaming"]
+    DCA1000_settings["FPGA_IP"] = "127.0.0.2"
+    DCA1000_settings["system_IP"] = "127.0.0.1"
+    DCA1000_settings["cmd_port"] = get_free_port()
+    DCA1000_settings["data_port"] = get_free_port()
+    settings_file_path = str(tmp_path / "radar_emulated_DCA1000.json")
+    with open(settings_file_path, "w") as f:
+        json.dump(settings, f)
+
+    emulator = DCA1000_Emulator.DCA1000Emulator(
+        FPGA_IP=DCA1000_settings["FPGA_IP"],
+        system_IP=DCA1000_settings["system_IP"],
+        cmd_port=DCA1000_settings["cmd_port"],
+        data_port=DCA1000_settings["data_port"],
+        **emulator_kwargs,
+    )
+
+    packet_ring = DCA1000PacketRing(2**16)
+    conn_handler, conn_handler_child = Pipe()
+    messages = []
+    def wait_for(message_type):
+        while True:
+            msg = conn_handler.recv()
+            messages.append(msg)
+            if msg.type == message_type:
+                return msg
+
+    with emulator:
+        handler_thread = threading.Thread(
+            target=DCA1000Handler,
+            kwargs={
+                "conn_parent": conn_handler_child,
+                "conn_handler_data": None,
+                "settings_file_path": settings_file_path,
+                "packet_ring": packet_ring,
+            },
+            daemon=True,
+        )
+        handler_thread.start()
+        wait_for(_MessageTypes.INIT_SUCCESS)
+
+        conn_handler.send(_Message(_MessageTypes.START_STREAMING))
+        wait_for(_MessageTypes.COMMAND_EXECUTED)
+
+        # receive until the emulator is finished and no packets are left
+        packets = []
+        while emulator.recording or packet_ring.wait_for_packets(timeout=0.5):
+            for _ in range(packet_ring.num_available()):
+                packet = packet_ring.get_packet()
+                seq_num, byte_count_low, byte_count_high = struct.unpack_from("<IIH", packet)
+                packets.append(
+                    (seq_num, byte_count_low | (byte_count_high << 32), len(packet) - 10)
+                )
+                packet_ring.release()
+
+        conn_handler.send(_Message(_MessageTypes.STOP_STREAMING))
+        wait_for(_MessageTypes.COMMAND_EXECUTED)
+        conn_handler.send(_Message(_MessageTypes.EXIT))
+        wait_for(_MessageTypes.COMMAND_EXECUTED)
+        handler_thread.join()
+
+    return emulator, messages, packets
+
+def test_DCA1000_emulator_drops_and_reordering(json_config_path, tmp_path):
+
+    emulator, messages, packets = run_emulated_DCA1000Handler(
+        json_config_path,
+        tmp_path,
+        {
+            "num_bytes_per_frame": 8 * 1456,
+            "frame_rate": 500,
+            "num_frames_to_send": 250,
+            "drop_probability": 0.01,
+            "reorder_probability": 0.01,
+        },
+    )
+
+    assert emulator.num_commands == 7
+    assert emulator.packet_size == 1470
+    assert any("FPGA Version 2.9" in str(msg.value) for msg in messages)
+
+    # every packet has the byte count of the bytes sent before it
+    for seq_num, byte_count, payload_length in packets:
+        assert byte_count == (seq_num - 1) * 1456
+        assert payload_length == 1456
+
+    seq_nums = np.array([packet[0] for packet in packets])
+    assert len(seq_nums) == emulator.num_packets_sent
+    assert emulator.num_packets_sent + emulator.num_dropped_packets == 250 * 8
+    assert np.unique(seq_nums).size == seq_nums.size
+    assert seq_nums.max() - seq_nums.size == emulator.num_dropped_packets
+    assert np.sum(np.diff(seq_nums) < 0) == emulator.num_reordered_packets
+    assert emulator.num_dropped_packets > 0 and emulator.num_reordered_packets > 0
+
+def test_DCA1000_emulator_throughput(json_config_path, tmp_path):
+
+    # stream as fast as possible (packets may be dropped by the kernel or the packet ring)
+    emulator, messages, packets = run_emulated_DCA1000Handler(
+        json_config_path,
+        tmp_path,
+        {"num_bytes_per_frame": 64 * 1456, "frame_rate": None, "num_frames_to_send": 500},
+    )
+
+    assert emulator.sample_rate_Msps > 0
+    assert 0 < len(packets) <= emulator.num_packets_sent
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+_Frame_Assembler = pytest.importorskip("CPSL_TI_Radar.Streamers._Frame_Assembler")
+
+
+def assemble(num_bytes_per_frame, packets):
+    """Run the given (byte_count, payload) packets through a frame assembler
+
+    Returns:
+        tuple(list,_FrameAssembler): copies of the completed frames and the assembler
+    """
+    frames = []
+    assembler = _Frame_Assembler._FrameAssembler(
+        num_bytes_per_frame=num_bytes_per_frame,
+        frame_complete_callback=lambda frame: frames.append(frame.copy()),
+    )
+    for byte_count, payload in packets:
+        assembler.add_packet(byte_count, memoryview(payload))
+    return frames, assembler
+
+def test_frames_straddle_packets():
+
+    stream = np.arange(30, dtype=np.uint8)
+    packets = [(i, stream[i : i + 7].tobytes()) for i in range(0, 30, 7)]
+
+    frames, assembler = assemble(10, packets)
+
+    assert len(frames) == 3
+    for i, frame in enumerate(frames):
+        assert np.array_equal(frame, stream[i * 10 : (i + 1) * 10])
+    assert assembler.num_zero_filled_bytes == 0
+
+def test_missing_bytes_zero_filled():
+
+    stream = np.arange(1, 21, dtype=np.uint8)
+    packets = [(0, stream[0:4].tobytes()), (8, stream[8:20].tobytes())]
+
+    frames, assembler = assemble(10, packets)
+
+    expected = stream.copy()
+    expected[4:8] = 0
+    assert len(frames) == 2
+    assert np.array_equal(np.concatenate(frames), expected)
+    assert assembler.num_zero_filled_bytes == 4
+
+def test_missing_frames_dropped():
+
+    stream = np.arange(1, 41, dtype=np.uint8)
+    packets = [(0, stream[0:10].tobytes()), (30, stream[30:40].tobytes())]
+
+    frames, assembler = assemble(10, packets)
+
+    assert len(frames) == 2
+    assert np.array_equal(frames[1], stream[30:40])
+    assert assembler.num_dropped_frames == 2
+
+def test_late_packet_written_in_place():
+
+    stream = np.arange(1, 11, dtype=np.uint8)
+    packets = [
+        (0, stream[0:3].tobytes()),
+        (6, stream[6:8].tobytes()),
+        (3, stream[3:6].tobytes()),
+        (8, stream[8:10].tobytes()),
+    ]
+
+    frames, assembler = assemble(10, packets)
+
+    assert len(frames) == 1
+    assert np.array_equal(frames[0], stream)
+    assert assembler.num_late_packets == 1
+    assert assembler.num_zero_filled_bytes == 0
+
+def test_duplicate_packets_ignored():
+
+    stream = np.arange(1, 11, dtype=np.uint8)
+    packets = [
+        (0, stream[0:3].tobytes()),
+        (0, stream[0:3].tobytes()),
+        (6, stream[6:8].tobytes()),
+        (3, stream[3:6].tobytes()),
+        (3, stream[3:6].tobytes()),
+        (2, stream[2:5].tobytes()),
+        (8, stream[8:10].tobytes()),
+    ]
+
+    frames, assembler = assemble(10, packets)
+
+    assert len(frames) == 1
+    assert np.array_equal(frames[0], stream)
+    assert assembler.num_late_packets == 4
+    assert assembler.num_zero_filled_bytes == 0
+
+def test_late_packet_partially_fills_gap():
+
+    stream = np.arange(1, 13, dtype=np.uint8)
+    packets = [
+        (0, stream[0:2].tobytes()),
+        (8, stream[8:10].tobytes()),
+        (1, stream[1:4].tobytes()),
+        (6, stream[6:8].tobytes()),
+        (10, stream[10:12].tobytes()),
+    ]
+
+    frames, assembler = assemble(12, packets)
+
+    expected = stream.copy()
+    expected[4:6] = 0
+    assert len(frames) == 1
+    assert np.array_equal(frames[0], expected)
+    assert assembler.num_zero_filled_bytes == 2
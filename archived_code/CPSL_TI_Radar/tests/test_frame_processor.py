@@ -0,0 +1,237 @@
+import os
+import signal
+import numpy as np
+import pytest
+from multiprocessing import connection
+
+_Frame_Processor = pytest.importorskip(
+    "CPSL_TI_Radar.Processors.DCA1000_Processors._Frame_Processor"
+)
+from CPSL_TI_Radar._Shared_Frame_Ring import _SharedFrameRing
+from CPSL_TI_Radar.utilities.ADC_Decoder import ADCDecoder
+from CPSL_TI_Radar.ConfigManager import ConfigManager
+
+# range and doppler CFAR settings from a repo radar config
+config_manager = ConfigManager()
+config_manager.load_config_from_cfg(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "..",
+        "..",
+        "CPSL_TI_Radar_cpp",
+        "config",
+        "radar",
+        "nav_configs",
+        "6843_vel_sr.cfg",
+    )
+)
+radar_config = config_manager.radar_config
+
+frame_config = {
+    "rx_channels": 4,
+    "num_az_antennas": 8,
+    "virtual_antennas_enabled": 1,
+    "samples_per_chirp": 64,
+    "total_chirps_per_frame": 32,
+    "chirp_loops_per_frame": 16,
+    "num_chirps_to_save": 16,
+    "max_range_bin": 32,
+    "num_angle_bins": 32,
+    "angle_bins": np.linspace(-np.pi / 2, np.pi / 2, 32, endpoint=False),
+    "AoA_method": "FFT",
+    "adc_data_format": ADCDecoder.INTERLEAVED,
+    "range_window": None,
+    "capon_diagonal_loading": 1e-3,
+    "rng_az_power_range_dB": [20, 80],
+    "rng_dop_power_range_dB": [20, 80],
+    "range_res": 0.1,
+    "vel_res": 0.05,
+    "cfarCfg": radar_config["cfarCfg"],
+    "CFAR_method": None,
+}
+
+
+@pytest.fixture
+def frame_ring():
+    decoder = ADCDecoder(4, 64, 32)
+    frame_ring = _SharedFrameRing(
+        name="cpsl_test_frames_{}".format(os.getpid()),
+        num_slots=8,
+        num_bytes_per_frame=decoder.num_bytes_per_frame,
+        create=True,
+    )
+    yield frame_ring
+    frame_ring.close()
+
+def write_frames(frame_ring, num_frames):
+    """Write random frames into the ring
+
+    Returns:
+        list: the (slot index, sequence number) of each frame
+    """
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(num_frames):
+        slot_idx, seq = frame_ring.get_next_write_slot()
+        slot = frame_ring.begin_write(slot_idx)
+        slot[:] = rng.integers(0, 256, size=slot.size, dtype=np.uint8)
+        frame_ring.publish(slot_idx, seq)
+        frames.append((slot_idx, seq))
+    return frames
+
+def test_pool_results_in_frame_order(frame_ring):
+
+    frames = write_frames(frame_ring, 6)
+    frame_processor = _Frame_Processor._FrameProcessor(frame_config)
+    pool = _Frame_Processor._FrameProcessorPool(3, frame_ring.name, frame_config)
+
+    try:
+        for slot_idx, seq in frames:
+            pool.submit(slot_idx, seq)
+        # a frame that was overwritten before it could be processed
+        pool.submit(frames[0][0], frames[0][1] + 100)
+
+        results = []
+        while pool.num_pending_frames:
+            for conn in connection.wait(pool.result_conns, timeout=10):
+                results.extend(pool.recv_results(conn))
+    finally:
+        pool.close()
+
+    assert [seq for seq, _ in results] == [seq for _, seq in frames]
+    assert pool.num_overwritten_frames == 1
+    for (slot_idx, seq), (_, worker_results) in zip(frames, results):
+        expected = frame_processor.process_frame(frame_ring.get_slot(slot_idx))
+        for worker_result, expected_result in zip(worker_results, expected):
+            assert np.allclose(worker_result, expected_result)
+
+@pytest.mark.skipif(not hasattr(signal, "SIGSTOP"), reason="requires POSIX signals")
+def test_pool_restarts_exited_workers(frame_ring):
+
+    frames = write_frames(frame_ring, 6)
+    pool = _Frame_Processor._FrameProcessorPool(2, frame_ring.name, frame_config)
+
+    def recv_all_results():
+        results = []
+        while pool.num_pending_frames:
+            for conn in connection.wait(pool.result_conns, timeout=10):
+                results.extend(pool.recv_results(conn))
+        return results
+
+    try:
+        # worker 1 exits before processing its frames (1 and 3)
+        os.kill(pool._workers[1].pid, signal.SIGSTOP)
+        for slot_idx, seq in frames[:4]:
+            pool.submit(slot_idx, seq)
+        os.kill(pool._workers[1].pid, signal.SIGKILL)
+
+        results = recv_all_results()
+        assert [seq for seq, _ in results] == [frames[0][1], frames[2][1]]
+        assert pool.num_dropped_frames == 2
+        assert pool.pop_worker_failures() == [(1, -signal.SIGKILL)]
+        assert pool.pop_worker_failures() == []
+
+        # the restarted worker processes new frames
+        for slot_idx, seq in frames[4:]:
+            pool.submit(slot_idx, seq)
+        results = recv_all_results()
+        assert [seq for seq, _ in results] == [seq for _, seq in frames[4:]]
+        assert pool.num_dropped_frames == 2
+    finally:
+        pool.close()
+
+def test_pool_pending_frames_limited_by_ring(frame_ring):
+
+    # the default of 2 frames per worker would let the streamer overwrite slots being read
+    pool = _Frame_Processor._FrameProcessorPool(
+        4, frame_ring.name, frame_config, frame_ring_slots=frame_ring.num_slots
+    )
+    try:
+        assert pool.max_pending_frames == frame_ring.num_slots - 1
+        for slot_idx, seq in write_frames(frame_ring, frame_ring.num_slots - 1):
+            assert pool.has_capacity
+            pool.submit(slot_idx, seq)
+        assert not pool.has_capacity
+
+        while pool.num_pending_frames:
+            for conn in connection.wait(pool.result_conns, timeout=10):
+                pool.recv_results(conn)
+    finally:
+        pool.close()
+
+def test_only_requested_products_are_computed(frame_ring):
+
+    frames = write_frames(frame_ring, 2)
+    frame_processor = _Frame_Processor._FrameProcessor(frame_config)
+    expected = []
+    for slot_idx, _ in frames:
+        results = frame_processor.process_frame(frame_ring.get_slot(slot_idx))
+        expected.append(tuple(np.copy(result) for result in results))
+
+    # ADC data cube only mode does not compute the range FFT
+    frame_processor.set_products([_Frame_Processor.FrameProducts.ADC_DATA_CUBE])
+    adc_data_cube, rng_az_resp, rng_dop_resp, point_cloud = frame_processor.process_frame(
+        frame_ring.get_slot(frames[0][0])
+    )
+    assert np.array_equal(adc_data_cube, expected[0][0])
+    assert rng_az_resp is None and rng_dop_resp is None and point_cloud is None
+    assert _Frame_Processor.FrameProducts.RANGE_FFT not in frame_processor._frame_products
+
+    with pytest.raises(ValueError):
+        frame_processor.set_products([_Frame_Processor.FrameProducts.RANGE_FFT])
+
+    # the pool workers switch products for the frames submitted afterwards
+    pool = _Frame_Processor._FrameProcessorPool(2, frame_ring.name, frame_config)
+    try:
+        pool.set_products([_Frame_Processor.FrameProducts.NORM_RNG_DOP_RESP])
+        for slot_idx, seq in frames:
+            pool.submit(slot_idx, seq)
+
+        results = []
+        while pool.num_pending_frames:
+            for conn in connection.wait(pool.result_conns, timeout=10):
+                results.extend(pool.recv_results(conn))
+    finally:
+        pool.close()
+
+    for (_, worker_results), expected_results in zip(results, expected):
+        assert worker_results[0] is None and worker_results[1] is None
+        assert np.allclose(worker_results[2], expected_results[2])
+        assert worker_results[3] is None
+
+def test_default_products_without_cfarCfg(frame_ring):
+
+    frames = write_frames(frame_ring, 1)
+    frame_processor = _Frame_Processor._FrameProcessor(dict(frame_config, cfarCfg=None))
+    assert frame_processor.products == set(_Frame_Processor.FrameProducts.OUTPUTS) - {
+        _Frame_Processor.FrameProducts.POINT_CLOUD
+    }
+
+    adc_data_cube, rng_az_resp, rng_dop_resp, point_cloud = frame_processor.process_frame(
+        frame_ring.get_slot(frames[0][0])
+    )
+    assert adc_data_cube is not None and rng_az_resp is not None and rng_dop_resp is not None
+    assert point_cloud is None
+
+    with pytest.raises(ValueError):
+        frame_processor.set_products([_Frame_Processor.FrameProducts.POINT_CLOUD])
+
+def test_range_fft_shared_by_responses(frame_ring):
+
+    frames = write_frames(frame_ring, 1)
+    frame_processor = _Frame_Processor._FrameProcessor(frame_config)
+
+    # count the range FFTs computed for a frame
+    num_range_ffts = []
+    compute, sources = frame_processor._product_graph[
+        _Frame_Processor.FrameProducts.RANGE_FFT
+    ]
+    frame_processor._product_graph[_Frame_Processor.FrameProducts.RANGE_FFT] = (
+        lambda adc_data_cube: num_range_ffts.append(1) or compute(adc_data_cube),
+        sources,
+    )
+
+    results = frame_processor.process_frame(frame_ring.get_slot(frames[0][0]))
+    assert all(result is not None for result in results)
+    assert len(num_range_ffts) == 1
@@ -0,0 +1,70 @@
+import json
+import pytest
+from multiprocessing import Pipe
+
+_Processor = pytest.importorskip("CPSL_TI_Radar.Processors._Processor")
+FrameQueuePolicies = _Processor.FrameQueuePolicies
+
+
+def make_processor(json_config_path, tmp_path, policy, queue_size):
+    """Create a _Processor with the given frame queue settings
+
+    Returns:
+        tuple(_Processor,Connection): the processor and the Streamer end of the data Pipe
+    """
+    with open(json_config_path) as f:
+        settings = json.load(f)
+    settings["Processor"]["frame_queue_policy"] = policy
+    settings["Processor"]["frame_queue_size"] = queue_size
+    tmp_settings_path = tmp_path / "radar.json"
+    tmp_settings_path.write_text(json.dumps(settings))
+
+    conn_parent, conn_parent_child = Pipe()
+    conn_processor_data, conn_streamer_data = Pipe(False)
+    processor = _Processor._Processor(
+        conn_parent=conn_parent_child,
+        conn_processor_data=conn_processor_data,
+        settings_file_path=str(tmp_settings_path),
+    )
+    return processor, conn_streamer_data
+
+def send_frames(conn, num_frames):
+    for i in range(num_frames):
+        conn.send_bytes(bytes([i]))
+
+@pytest.mark.parametrize(
+    "policy,expected_frames,num_dropped",
+    [
+        (FrameQueuePolicies.DROP_OLDEST, [3, 4], 3),
+        (FrameQueuePolicies.DROP_NEWEST, [0, 1], 3),
+        (FrameQueuePolicies.BLOCK, [0, 1], 0),
+    ],
+)
+def test_frame_queue_policies(json_config_path, tmp_path, policy, expected_frames, num_dropped):
+
+    processor, conn = make_processor(json_config_path, tmp_path, policy, queue_size=2)
+    send_frames(conn, 5)
+
+    processed_frames = []
+    for i in range(2):
+        assert processor._process_new_packet()
+        processed_frames.append(processor.current_packet[0])
+
+    frame_stats = processor._get_frame_stats()
+    assert processed_frames == expected_frames
+    assert frame_stats["num_frames_dropped"] == num_dropped
+    assert frame_stats["num_frames_processed"] == 2
+
+def test_block_policy_leaves_frames_with_streamer(json_config_path, tmp_path):
+
+    processor, conn = make_processor(
+        json_config_path, tmp_path, FrameQueuePolicies.BLOCK, queue_size=2
+    )
+    send_frames(conn, 5)
+
+    processed_frames = []
+    while processor._process_new_packet():
+        processed_frames.append(processor.current_packet[0])
+
+    assert processed_frames == [0, 1, 2, 3, 4]
+    assert processor._get_frame_stats()["num_frames_received"] == 5
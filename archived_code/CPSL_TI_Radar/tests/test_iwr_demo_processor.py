@@ -0,0 +1,119 @@
+import os
+import struct
+import numpy as np
+import pytest
+from multiprocessing import Pipe
+
+IWR_Demo_Processor = pytest.importorskip("CPSL_TI_Radar.Processors.IWR_Demo_Processor")
+from CPSL_TI_Radar.Processors.TLV_Processors._TLVTags import TLVTags
+
+settings_folder = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "json_radar_settings"
+)
+
+MAGIC_WORD = bytes([0x02, 0x01, 0x04, 0x03, 0x06, 0x05, 0x08, 0x07])
+VEL_IDX_TO_M_PER_S = 0.1
+
+
+class _TestIWRDemoProcessor(IWR_Demo_Processor.IWRDemoProcessor):
+    def run(self):
+        # the tests call the processor methods directly
+        return
+
+
+def make_TLV(tag, payload):
+    return struct.pack("<2I", tag, len(payload)) + payload
+
+def make_packet(sdk_version, frame_number, TLVs):
+    header_length = 40 if sdk_version == "3.5" else 36
+    packet_length = header_length + sum(len(TLV) for TLV in TLVs)
+    header_fields = [0x03050004, packet_length, 0x6843, frame_number, 1234, 0, len(TLVs)]
+    if sdk_version == "3.5":
+        header_fields.append(0)
+    header = MAGIC_WORD + struct.pack("<{}I".format(len(header_fields)), *header_fields)
+    return header + b"".join(TLVs)
+
+def make_processor(settings_file):
+    """IWRDemoProcessor with its DetectedPoints and TLVData listeners connected
+
+    Returns:
+        tuple(IWRDemoProcessor,Connection,Connection,Connection): the processor, and the streamer,
+            detected points listener, and TLV data listener ends of its connections
+    """
+    conn_parent, conn_parent_processor = Pipe()
+    conn_data, conn_data_processor = Pipe()
+    processor = _TestIWRDemoProcessor(
+        conn_parent_processor,
+        conn_data_processor,
+        settings_file_path=os.path.join(settings_folder, settings_file),
+    )
+    processor.tlv_processor_detected_objects.radar_performance = {
+        "velocity": {"vel_idx_to_m_per_s": VEL_IDX_TO_M_PER_S}
+    }
+
+    conn_points, processor.tlv_processor_detected_objects._conn_listener = Pipe()
+    processor.tlv_processor_detected_objects._conn_listener_enabled = True
+    conn_TLV_data, processor._conn_TLVData = Pipe()
+    processor._conn_TLVData_enabled = True
+
+    return processor, conn_data, conn_points, conn_TLV_data
+
+def test_sdk_2_1_packets():
+
+    processor, conn_data, conn_points, conn_TLV_data = make_processor("radar_1.json")
+
+    points = np.array(
+        [[3, -2, 100, 512, 1024, -256], [7, 1, 200, -512, 2048, 0]], dtype=np.int16
+    )
+    range_profile = np.arange(16, dtype=np.uint16)
+    stats = np.arange(1, 7, dtype=np.uint32)
+    conn_data.send_bytes(
+        make_packet(
+            "2.1",
+            5,
+            [
+                make_TLV(TLVTags.DETECTED_POINTS, struct.pack("<2H", 2, 9) + points.tobytes()),
+                make_TLV(TLVTags.RANGE_PROFILE, range_profile.tobytes()),
+                make_TLV(TLVTags.STATS, stats.tobytes()),
+            ],
+        )
+    )
+    processor._process_new_packet()
+
+    # detected points are converted to [x,y,z,vel] objects
+    expected = np.column_stack(
+        (points[:, 3:] / 2**9, points[:, 1] * VEL_IDX_TO_M_PER_S)
+    ).astype(np.float32)
+    np.testing.assert_allclose(conn_points.recv(), expected)
+
+    frame_number, TLV_data = conn_TLV_data.recv()
+    assert frame_number == 5
+    np.testing.assert_array_equal(TLV_data[TLVTags.RANGE_PROFILE], range_profile)
+    assert TLV_data[TLVTags.STATS]["inter_frame_CPU_load"] == 6
+    assert TLV_data[TLVTags.DETECTED_POINTS].shape == (2,)
+
+    # only the TLVs of the current packet are kept
+    conn_data.send_bytes(
+        make_packet("2.1", 6, [make_TLV(TLVTags.STATS, stats.tobytes()), make_TLV(99, b"\x00" * 4)])
+    )
+    processor._process_new_packet()
+    assert set(processor.TLV_data) == {TLVTags.STATS}
+    frame_number, TLV_data = conn_TLV_data.recv()
+    assert frame_number == 6
+    assert set(TLV_data) == {TLVTags.STATS}
+    assert not conn_points.poll()
+
+def test_sdk_3_5_points():
+
+    processor, conn_data, conn_points, conn_TLV_data = make_processor("radar_6843.json")
+
+    points = np.random.default_rng(0).standard_normal((5, 4)).astype(np.float32)
+    conn_data.send_bytes(
+        make_packet("3.5", 9, [make_TLV(TLVTags.DETECTED_POINTS, points.tobytes())])
+    )
+    processor._process_new_packet()
+
+    np.testing.assert_array_equal(conn_points.recv(), points)
+    frame_number, TLV_data = conn_TLV_data.recv()
+    assert frame_number == 9
+    np.testing.assert_array_equal(TLV_data[TLVTags.DETECTED_POINTS]["velocity"], points[:, 3])
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+_Processing_Context = pytest.importorskip(
+    "CPSL_TI_Radar.Processors.DCA1000_Processors._Processing_Context"
+)
+
+num_antennas, samples_per_chirp, num_chirps = 4, 64, 16
+max_range_bin, num_angle_bins = 32, 32
+
+
+@pytest.fixture
+def adc_data_cube():
+    rng = np.random.default_rng(0)
+    shape = (num_antennas, samples_per_chirp, num_chirps)
+    return (rng.normal(size=shape) + 1j * rng.normal(size=shape)).astype(np.complex64)
+
+def make_context(range_window=None):
+    return _Processing_Context._ProcessingContext(
+        num_antennas=num_antennas,
+        samples_per_chirp=samples_per_chirp,
+        num_chirps=num_chirps,
+        num_chirps_to_save=num_chirps,
+        max_range_bin=max_range_bin,
+        num_angle_bins=num_angle_bins,
+        range_window=range_window,
+    )
+
+def test_range_azimuth_power(adc_data_cube):
+
+    context = make_context()
+    # process the frame twice to check that the workspaces are reset between frames
+    for i in range(2):
+        power = context.compute_range_azimuth_power_dB(
+            context.compute_range_fft(adc_data_cube)
+        )
+
+    rng_fft = np.fft.fft(adc_data_cube, axis=1)[:, :max_range_bin, :]
+    expected = 20 * np.log10(
+        np.abs(np.fft.fftshift(np.fft.fft(rng_fft, n=num_angle_bins, axis=0), axes=0))
+    )
+    assert np.allclose(power, np.transpose(expected, axes=(1, 0, 2)), atol=1e-3)
+
+def test_range_doppler_power(adc_data_cube):
+
+    context = make_context(range_window="hann")
+    power = context.compute_range_doppler_power_dB(
+        context.compute_range_fft(adc_data_cube), antenna=1
+    )
+
+    window = np.hanning(samples_per_chirp + 1)[:-1]
+    rng_fft = np.fft.fft(adc_data_cube[1] * window[:, np.newaxis], axis=0)
+    expected = 20 * np.log10(
+        np.abs(np.fft.fftshift(np.fft.fft(rng_fft[:max_range_bin], axis=1), axes=1))
+    )
+    assert np.allclose(power, expected, atol=1e-3)
+
+def test_workspaces_reused(adc_data_cube):
+
+    context = make_context()
+    rng_fft = context.compute_range_fft(adc_data_cube)
+    first = context.compute_range_doppler_power_dB(rng_fft)
+    second = context.compute_range_doppler_power_dB(rng_fft)
+
+    assert first is second
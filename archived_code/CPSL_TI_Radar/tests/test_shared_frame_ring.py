@@ -0,0 +1,116 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+_Shared_Frame_Ring = pytest.importorskip("CPSL_TI_Radar._Shared_Frame_Ring")
+_SharedFrameRing = _Shared_Frame_Ring._SharedFrameRing
+
+NUM_SLOTS = 4
+NUM_BYTES_PER_FRAME = 100
+
+
+@pytest.fixture
+def ring_name():
+    return "cpsl_test_ring_{}".format(os.getpid())
+
+def write_frame(ring, value):
+    slot_idx, seq = ring.get_next_write_slot()
+    ring.begin_write(slot_idx)[:] = value
+    return ring.publish(slot_idx, seq)
+
+# attaches to a ring and prints the validity and first byte of a slot
+READ_FRAME_SCRIPT = """
+import sys
+from CPSL_TI_Radar._Shared_Frame_Ring import _SharedFrameRing
+ring = _SharedFrameRing(sys.argv[1])
+slot_idx, seq = int(sys.argv[2]), int(sys.argv[3])
+print(ring.slot_valid(slot_idx, seq), ring.get_slot(slot_idx)[0])
+ring.close()
+"""
+
+def test_slot_wraparound(ring_name):
+
+    writer = _SharedFrameRing(ring_name, NUM_SLOTS, NUM_BYTES_PER_FRAME, create=True)
+    reader = _SharedFrameRing(ring_name)
+    try:
+        assert (reader.num_slots, reader.num_bytes_per_frame) == (
+            NUM_SLOTS,
+            NUM_BYTES_PER_FRAME,
+        )
+
+        for frame_idx in range(2 * NUM_SLOTS + 1):
+            slot_idx, seq = _SharedFrameRing.decode_message(write_frame(writer, frame_idx))
+            assert slot_idx == frame_idx % NUM_SLOTS
+            assert seq == frame_idx + 1
+
+            frame = reader.get_slot(slot_idx)
+            assert frame.shape == (NUM_BYTES_PER_FRAME,)
+            assert np.all(frame == frame_idx)
+            assert reader.slot_valid(slot_idx, seq)
+
+        # slots are 64 byte aligned
+        assert reader.get_slot(1).ctypes.data - reader.get_slot(0).ctypes.data == 128
+    finally:
+        reader.close()
+        writer.close()
+
+def test_overwritten_slot_detection(ring_name):
+
+    writer = _SharedFrameRing(ring_name, NUM_SLOTS, NUM_BYTES_PER_FRAME, create=True)
+    reader = _SharedFrameRing(ring_name)
+    try:
+        slot_idx, seq = _SharedFrameRing.decode_message(write_frame(writer, 1))
+
+        # a slot being rewritten is invalid until the new frame is published
+        for _ in range(NUM_SLOTS - 1):
+            write_frame(writer, 2)
+        next_slot_idx, next_seq = writer.get_next_write_slot()
+        assert next_slot_idx == slot_idx
+        writer.begin_write(next_slot_idx)
+        assert not reader.slot_valid(slot_idx, seq)
+
+        writer.publish(next_slot_idx, next_seq)
+        assert not reader.slot_valid(slot_idx, seq)
+        assert reader.slot_valid(slot_idx, next_seq)
+    finally:
+        reader.close()
+        writer.close()
+
+def test_attach_and_close(ring_name):
+
+    with pytest.raises(FileNotFoundError):
+        _SharedFrameRing(ring_name)
+
+    writer = _SharedFrameRing(ring_name, NUM_SLOTS, NUM_BYTES_PER_FRAME, create=True)
+    try:
+        slot_idx, seq = _SharedFrameRing.decode_message(write_frame(writer, 7))
+
+        # a reader in another process (with its own resource tracker) does not
+        # unlink the ring when it exits
+        result = subprocess.run(
+            [sys.executable, "-c", READ_FRAME_SCRIPT, ring_name, str(slot_idx), str(seq)],
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split() == ["True", "7"]
+
+        reader = _SharedFrameRing(ring_name)
+        assert reader.slot_valid(slot_idx, seq)
+        reader.close()
+
+        # replacing a stale ring with the same name
+        replacement = _SharedFrameRing(ring_name, NUM_SLOTS, 2 * NUM_BYTES_PER_FRAME, create=True)
+        reader = _SharedFrameRing(ring_name)
+        assert reader.num_bytes_per_frame == 2 * NUM_BYTES_PER_FRAME
+        reader.close()
+        replacement.close()
+    finally:
+        writer.close()
+
+    # the creator unlinks the ring when it is closed
+    with pytest.raises(FileNotFoundError):
+        _SharedFrameRing(ring_name)
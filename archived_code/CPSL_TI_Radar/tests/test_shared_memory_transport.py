@@ -0,0 +1,77 @@
+import os
+import numpy as np
+import pytest
+from multiprocessing import Process
+
+Shared_Memory_Transport = pytest.importorskip(
+    "CPSL_TI_Radar.utilities.Shared_Memory_Transport"
+)
+SharedMemoryPublisher = Shared_Memory_Transport.SharedMemoryPublisher
+SharedMemorySubscriber = Shared_Memory_Transport.SharedMemorySubscriber
+
+
+@pytest.fixture
+def segment_name():
+    return "cpsl_test_transport_{}".format(os.getpid())
+
+def publish_frames(segment_name, num_frames):
+    publisher = SharedMemoryPublisher(segment_name, capacity=8 * 64 * 64)
+    array = np.empty((64, 64), dtype=np.float64)
+    for frame_number in range(1, num_frames + 1):
+        array[:] = frame_number
+        publisher.publish(array, frame_number)
+    publisher.close()
+
+def test_publish_and_read(segment_name):
+
+    publisher = SharedMemoryPublisher(segment_name, capacity=1024)
+    subscriber = SharedMemorySubscriber(segment_name, timeout=1)
+
+    try:
+        assert not subscriber.has_new_array()
+        assert subscriber.read() == (0, None)
+
+        # non-contiguous arrays are published in their logical order
+        array = np.arange(24, dtype=np.complex64).reshape(2, 3, 4).transpose(1, 0, 2)
+        publisher.publish(array, frame_number=7)
+
+        assert subscriber.has_new_array()
+        frame_number, received = subscriber.read()
+        assert frame_number == 7
+        assert received.dtype == array.dtype
+        assert np.array_equal(received, array)
+        assert not subscriber.has_new_array()
+
+        seq, frame_number, view = subscriber.read_view()
+        assert np.array_equal(view, array)
+        publisher.publish(array, frame_number=8)
+        assert not subscriber.view_valid(seq)
+        del view
+
+        with pytest.raises(ValueError):
+            publisher.publish(np.zeros(1025, dtype=np.uint8))
+    finally:
+        subscriber.close()
+        publisher.close()
+
+    assert not os.path.exists("/dev/shm/" + segment_name)
+
+def test_reads_are_never_torn(segment_name):
+
+    writer = Process(target=publish_frames, args=(segment_name, 2000))
+    writer.start()
+
+    subscriber = SharedMemorySubscriber(segment_name, timeout=5)
+    num_reads = 0
+    try:
+        while subscriber.wait_for_new_array(timeout=5):
+            frame_number, array = subscriber.read()
+            if array is not None:
+                assert np.all(array == frame_number)
+                num_reads += 1
+        assert subscriber.closed
+    finally:
+        subscriber.close()
+        writer.join()
+
+    assert num_reads > 0
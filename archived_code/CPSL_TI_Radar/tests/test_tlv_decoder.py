@@ -0,0 +1,142 @@
+import struct
+import numpy as np
+import pytest
+
+_TLV_Decoder = pytest.importorskip("CPSL_TI_Radar.Processors.TLV_Processors._TLV_Decoder")
+_TLVTags = pytest.importorskip("CPSL_TI_Radar.Processors.TLV_Processors._TLVTags")
+_TLVDecoder = _TLV_Decoder._TLVDecoder
+TLVTags = _TLVTags.TLVTags
+
+MAGIC_WORD = bytes([0x02, 0x01, 0x04, 0x03, 0x06, 0x05, 0x08, 0x07])
+NUM_RANGE_BINS = 16
+NUM_DOPPLER_BINS = 8
+NUM_AZ_ANTENNAS = 8
+RADAR_PERFORMANCE = {
+    "range": {"num_range_bins": NUM_RANGE_BINS},
+    "velocity": {"num_doppler_bins": NUM_DOPPLER_BINS},
+    "angle": {"num_az_antennas": NUM_AZ_ANTENNAS},
+}
+
+
+def make_TLV(tag, payload):
+    return struct.pack("<2I", tag, len(payload)) + payload
+
+def make_packet(sdk_version, frame_number, TLVs, num_detected_objects=0):
+    """Make a packet from a list of TLVs (header size depends on the SDK version)"""
+    header_length = 40 if sdk_version == "3.5" else 36
+    packet_length = header_length + sum(len(TLV) for TLV in TLVs)
+    header_fields = [0x03050004, packet_length, 0x6843, frame_number, 1234]
+    header_fields += [num_detected_objects, len(TLVs)]
+    if sdk_version == "3.5":
+        header_fields.append(0)
+    header = MAGIC_WORD + struct.pack("<{}I".format(len(header_fields)), *header_fields)
+    return bytearray(header + b"".join(TLVs))
+
+def make_payloads(rng):
+    return {
+        TLVTags.RANGE_PROFILE: rng.integers(0, 2**16, NUM_RANGE_BINS, dtype=np.uint16),
+        TLVTags.NOISE_PROFILE: rng.integers(0, 2**16, NUM_RANGE_BINS, dtype=np.uint16),
+        TLVTags.AZIMUTH_STATIC_HEAT_MAP: rng.integers(
+            -(2**15), 2**15, (NUM_RANGE_BINS, NUM_AZ_ANTENNAS, 2), dtype=np.int16
+        ),
+        TLVTags.RANGE_DOPPLER_HEAT_MAP: rng.integers(
+            0, 2**16, (NUM_RANGE_BINS, NUM_DOPPLER_BINS), dtype=np.uint16
+        ),
+        TLVTags.STATS: np.arange(1, 7, dtype=np.uint32),
+    }
+
+def test_decode_sdk_3_5_packet():
+
+    rng = np.random.default_rng(0)
+    points = rng.standard_normal((5, 4)).astype(np.float32)
+    payloads = make_payloads(rng)
+    TLVs = [make_TLV(TLVTags.DETECTED_POINTS, points.tobytes())]
+    TLVs += [make_TLV(tag, payload.tobytes()) for tag, payload in payloads.items()]
+    packet = make_packet("3.5", 42, TLVs, num_detected_objects=5)
+
+    decoder = _TLVDecoder("3.5")
+    decoder.load_config(RADAR_PERFORMANCE)
+    header, decoded = decoder.decode(packet)
+
+    assert header["frame_number"] == 42
+    assert header["packet_length"] == len(packet)
+    assert header["num_data_structures"] == len(TLVs)
+    assert header["sub_frame_number"] == 0
+
+    # every decoded TLV is a view into the packet
+    for tag, data in decoded.items():
+        assert np.shares_memory(np.asarray(data), np.frombuffer(packet, np.uint8))
+
+    detected_points = decoded[TLVTags.DETECTED_POINTS]
+    np.testing.assert_array_equal(detected_points["x"], points[:, 0])
+    np.testing.assert_array_equal(detected_points["velocity"], points[:, 3])
+
+    np.testing.assert_array_equal(
+        decoded[TLVTags.RANGE_PROFILE], payloads[TLVTags.RANGE_PROFILE]
+    )
+    np.testing.assert_array_equal(
+        decoded[TLVTags.NOISE_PROFILE], payloads[TLVTags.NOISE_PROFILE]
+    )
+    np.testing.assert_array_equal(
+        decoded[TLVTags.RANGE_DOPPLER_HEAT_MAP],
+        payloads[TLVTags.RANGE_DOPPLER_HEAT_MAP],
+    )
+
+    az_heat_map = decoded[TLVTags.AZIMUTH_STATIC_HEAT_MAP]
+    assert az_heat_map.shape == (NUM_RANGE_BINS, NUM_AZ_ANTENNAS)
+    np.testing.assert_array_equal(
+        az_heat_map["imag"], payloads[TLVTags.AZIMUTH_STATIC_HEAT_MAP][..., 0]
+    )
+    np.testing.assert_array_equal(
+        az_heat_map["real"], payloads[TLVTags.AZIMUTH_STATIC_HEAT_MAP][..., 1]
+    )
+
+    stats = decoded[TLVTags.STATS]
+    assert stats["inter_frame_processing_time"] == 1
+    assert stats["inter_frame_CPU_load"] == 6
+
+def test_decode_sdk_2_1_points():
+
+    points = np.array(
+        [[3, -2, 100, 512, 1024, -256], [7, 1, 200, -512, 2048, 0]], dtype=np.int16
+    )
+    descriptor = struct.pack("<2H", 2, 9)
+    TLVs = [make_TLV(TLVTags.DETECTED_POINTS, descriptor + points.tobytes())]
+    packet = make_packet("2.1", 7, TLVs, num_detected_objects=2)
+
+    decoder = _TLVDecoder("2.1")
+    header, decoded = decoder.decode(packet)
+    assert header["frame_number"] == 7
+    assert "sub_frame_number" not in header.dtype.names
+
+    TLV_tag, TLV = next(decoder.iter_TLVs(packet))
+    descriptor = decoder.decode_points_descriptor_sdk_2_1(TLV)
+    assert descriptor["num_objects"] == 2
+    assert descriptor["xyz_q_format"] == 9
+
+    detected_points = decoded[TLVTags.DETECTED_POINTS]
+    assert detected_points.shape == (2,)
+    np.testing.assert_array_equal(detected_points["doppler_idx"], points[:, 1])
+    np.testing.assert_array_equal(detected_points["z"], points[:, 5])
+
+def test_unknown_tags_and_shapes():
+
+    payload = np.arange(10, dtype=np.uint16)
+    TLVs = [make_TLV(99, b"\x00" * 4), make_TLV(TLVTags.RANGE_PROFILE, payload.tobytes())]
+    packet = make_packet("3.5", 0, TLVs)
+
+    # without a config, profiles are left flat
+    decoder = _TLVDecoder("3.5")
+    header, decoded = decoder.decode(packet)
+    assert decoded[99] is None
+    np.testing.assert_array_equal(decoded[TLVTags.RANGE_PROFILE], payload)
+
+    # a profile that does not match the config is not reshaped
+    decoder.load_config(RADAR_PERFORMANCE)
+    header, decoded = decoder.decode(packet)
+    assert decoded[TLVTags.RANGE_PROFILE].shape == (10,)
+
+def test_invalid_sdk_version():
+
+    with pytest.raises(ValueError):
+        _TLVDecoder("1.0")
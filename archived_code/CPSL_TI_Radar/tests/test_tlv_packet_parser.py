@@ -0,0 +1,80 @@
+import io
+import struct
+import numpy as np
+import pytest
+
+_TLV_Packet_Parser = pytest.importorskip("CPSL_TI_Radar.Streamers._TLV_Packet_Parser")
+_TLVPacketParser = _TLV_Packet_Parser._TLVPacketParser
+
+
+class FakeSerialPort(io.RawIOBase):
+    """Serial port that returns a recorded byte stream in fixed size chunks"""
+
+    def __init__(self, data, chunk_size):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.position = 0
+
+    @property
+    def in_waiting(self):
+        return min(self.chunk_size, len(self.data) - self.position)
+
+    def readinto(self, b):
+        num_bytes = min(len(b), len(self.data) - self.position)
+        b[:num_bytes] = self.data[self.position : self.position + num_bytes]
+        self.position += num_bytes
+        return num_bytes
+
+def make_packet(frame_number, num_payload_bytes):
+    """Make an SDK 3.5 style packet (40 byte header) with a random payload"""
+    packet_length = 40 + num_payload_bytes
+    header = _TLVPacketParser.MAGIC_WORD + struct.pack(
+        "<8I", 0x03050004, packet_length, 0x6843, frame_number, 0, 0, 0, 0
+    )
+    payload = np.random.default_rng(frame_number).integers(
+        0, 256, size=num_payload_bytes, dtype=np.uint8
+    )
+    return header + payload.tobytes()
+
+def test_packets_split_across_reads():
+
+    packets = [make_packet(i, 32 * (i + 1)) for i in range(20)]
+    # start in the middle of a packet and include a corrupted header
+    stream = (
+        packets[0][50:]
+        + b"".join(packets[1:10])
+        + _TLVPacketParser.MAGIC_WORD
+        + struct.pack("<2I", 0, 8)
+        + b"".join(packets[10:])
+    )
+
+    # small buffer to force the unparsed bytes to be moved to the start of the buffer
+    parser = _TLVPacketParser(buffer_size=2048)
+    serial_port = FakeSerialPort(stream, chunk_size=97)
+
+    received = []
+    while parser.read_from(serial_port):
+        for packet in parser.get_packets():
+            assert isinstance(packet, memoryview)
+            received.append(bytes(packet))
+
+    assert received == packets[1:]
+    assert parser.num_invalid_headers == 1
+    assert parser.num_discarded_bytes == len(packets[0]) - 50 + 16
+
+def test_write_and_reset():
+
+    packet = make_packet(0, 64)
+    parser = _TLVPacketParser(buffer_size=1024)
+
+    parser.write(packet[:-1])
+    assert list(parser.get_packets()) == []
+    parser.write(packet[-1:])
+    assert [bytes(p) for p in parser.get_packets()] == [packet]
+
+    parser.write(packet[:30])
+    parser.reset()
+    assert parser.num_buffered_bytes == 0
+
+    with pytest.raises(ValueError):
+        parser.write(bytes(1025))
@@ -1,7 +1,16 @@
+import argparse
+import os
+import shutil
+import subprocess
+import time
+from collections import deque
+from multiprocessing import Pool
 import numpy as np
 import scipy.fft as fft
 from scipy.signal import find_peaks
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib.widgets import Button
 from mpl_toolkits.mplot3d import Axes3D
 import mplcursors
@@ -9,6 +18,8 @@ from MMWaveDevice import MMWaveDevice
 from sklearn.cluster import DBSCAN
 import matplotlib.ticker as ticker
 
+from CPSL_TI_Radar.utilities.ADC_Decoder import ADCDecoder
+
 running = True
 running_chirp = True
 
@@ -26,48 +37,226 @@ def read_adc_data(adc_data_bin_file, mmwave_device_0, mmwave_device_1):
     num_chirps_1 = mmwave_device_1.num_chirp_per_frame
     num_frames = mmwave_device_0.num_frame
     num_rx = mmwave_device_0.num_rx_chnl
-    num_lanes = 4
 
     adc_data = np.fromfile(adc_data_bin_file, dtype=np.int16)
     expected_size = (num_samples_0 * num_chirps_0 + num_samples_1 * num_chirps_1) * num_frames * num_rx * 2
     if adc_data.size != expected_size:
         raise ValueError(f"Size of the adc data ({adc_data.size}) does not match the expected size ({expected_size})")
 
-    if mmwave_device_0.adc_bits != 16:
-        l_max = 2**(mmwave_device_0.adc_bits - 1) - 1
-        adc_data[adc_data > l_max] -= 2**mmwave_device_0.adc_bits
-
-    if mmwave_device_0.is_iq_swap:
-        adc_data = adc_data.reshape(-1, num_lanes).T
-    else:
-        adc_data = adc_data.reshape(-1, num_lanes * 2).T
-        adc_data = adc_data[:num_lanes] + 1j * adc_data[num_lanes:]
-
-    adc_data = adc_data.T.flatten()
+    adc_data = decode_adc_samples(adc_data, mmwave_device_0)
 
     adc_data_0 = adc_data[0::2].reshape((num_frames, num_chirps_0, num_samples_0, num_rx)).transpose(2, 1, 0, 3)
     adc_data_1 = adc_data[1::2].reshape((num_frames, num_chirps_1, num_samples_1, num_rx)).transpose(2, 1, 0, 3)
 
     return adc_data_0, adc_data_1
 
+def decode_adc_samples(adc_data, mmwave_device, num_lanes=4):
+    """Decode raw int16 adc data (a whole capture or a chunk of complete frames) into the sample stream
+    (samples of the two profiles alternate)"""
+    if mmwave_device.adc_bits != 16:
+        l_max = 2**(mmwave_device.adc_bits - 1) - 1
+        adc_data = np.where(adc_data > l_max, adc_data - 2**mmwave_device.adc_bits, adc_data).astype(np.int16)
+
+    if mmwave_device.is_iq_swap:
+        adc_data = adc_data.reshape(-1, num_lanes).T
+        adc_data = adc_data.T.flatten()
+    else:
+        # each group of num_lanes * 2 ints holds one complex sample per lane (interleaved LVDS format)
+        adc_data = ADCDecoder.deinterleave_lanes(adc_data, num_lanes)
+
+    return adc_data
+
+def sample_times(frame, chirp, sample, profile_index, frame_periodicity, sample_rate, idle_time, adc_start_time, ramp_time):
+    """Time of ADC samples from the start of the capture (arguments are broadcast together)"""
+    return frame * frame_periodicity + (2 * chirp + profile_index) * (idle_time + ramp_time) + (idle_time + adc_start_time) + sample / sample_rate
+
+# interference events found by detect_interference_events
+EVENT_DTYPE = np.dtype([
+    ("frame", np.int32),
+    ("chirp", np.int32),
+    ("profile", np.int8),
+    ("rx", np.int8),
+    ("threshold", np.float32),
+    ("onset_sample", np.int32),
+    ("onset_time", np.float64),
+    ("peak_magnitude", np.float32),
+])
+EVENT_CSV_FORMAT = ["%d", "%d", "%d", "%d", "%g", "%d", "%.6f", "%.2f"]
+
+def detect_interference_events(adc_data_bin_file, mmwave_device_0, mmwave_device_1, events_file=None, thresholds=(50,), frames_per_chunk=64):
+    """Find the interference in every frame, chirp, and rx channel of a capture without loading it into memory
+    (the file is memory mapped and decoded a chunk of frames at a time). An event is recorded for each chirp
+    whose magnitude exceeds a threshold, with the first sample above the threshold as its onset (like plot_adc_data)
+
+    Args:
+        adc_data_bin_file (str): path to the adc data
+        mmwave_device_0 (MMWaveDevice): device configuration of profile 0
+        mmwave_device_1 (MMWaveDevice): device configuration of profile 1
+        events_file (str, optional): file to write the events to (.npy files are saved as EVENT_DTYPE
+            arrays, all other files as csv). Defaults to None (events are only returned).
+        thresholds (tuple, optional): magnitude thresholds (an event is recorded for each threshold
+            that is exceeded). Defaults to (50,).
+        frames_per_chunk (int, optional): number of frames decoded at a time. Defaults to 64.
+
+    Returns:
+        np.ndarray: EVENT_DTYPE array of events ordered by frame, chirp, profile, rx, and threshold
+    """
+    profiles = []
+    for profile_index, mmwave_device in enumerate((mmwave_device_0, mmwave_device_1)):
+        profiles.append({
+            "profile_index": profile_index,
+            "num_samples": mmwave_device.num_sample_per_chirp,
+            "num_chirps": mmwave_device.num_chirp_per_frame,
+            "frame_periodicity": mmwave_device.frame_periodicity,
+            "sample_rate": mmwave_device.adc_samp_rate * 1000,
+            "idle_time": mmwave_device.chirp_idle_time / 1000,
+            "adc_start_time": mmwave_device.chirp_adc_start_time / 1000,
+            "ramp_time": mmwave_device.chirp_ramp_time / 1000,
+        })
+    num_frames = mmwave_device_0.num_frame
+    num_rx = mmwave_device_0.num_rx_chnl
+    num_ints_per_frame = sum(profile["num_samples"] * profile["num_chirps"] for profile in profiles) * num_rx * 2
 
-def range_fft(adc_data, range_data, num_samples, num_chirps, num_rx, win_hann, dbfs_coeff):
-    for chirp in range(num_chirps):
-        for rx in range(num_rx):
-            adc_data_segment = adc_data[:, chirp, rx]
-            windowed_data = win_hann * adc_data_segment
-            fft_data = 20 * np.log10(np.abs(fft.fft(windowed_data)) + 1e-6)
-            range_data[:, chirp, rx] = fft_data + dbfs_coeff
+    adc_data = np.memmap(adc_data_bin_file, dtype=np.int16, mode="r")
+    if adc_data.size != num_ints_per_frame * num_frames:
+        raise ValueError(f"Size of the adc data ({adc_data.size}) does not match the expected size ({num_ints_per_frame * num_frames})")
 
-def compute_range_doppler(adc_data, num_samples, num_chirps, num_frames):
-    fft_range_doppler_cube = np.zeros((num_samples, num_chirps, num_frames), dtype=np.complex128)
-    for frame_index in range(num_frames):
-        fft_range_doppler_cube[:, :, frame_index] = fft.fftshift(fft.fft(adc_data[:, :, frame_index, 0], axis=1), axes=1)
+    # magnitudes are compared as powers to avoid the square root
+    thresholds = np.sort(np.asarray(thresholds, dtype=np.float32))
+    power_thresholds = thresholds ** 2
 
-    for chirp_index in range(num_chirps):
-        fft_range_doppler_cube[:, chirp_index, :] = fft.fft(fft_range_doppler_cube[:, chirp_index, :], axis=0)
+    csv_file = None
+    if events_file is not None and not events_file.endswith(".npy"):
+        csv_file = open(events_file, "w")
+        csv_file.write(",".join(EVENT_DTYPE.names) + "\n")
 
-    return 20 * np.log10(np.abs(fft_range_doppler_cube))
+    events = []
+    start_time = time.perf_counter()
+    try:
+        for start_frame in range(0, num_frames, frames_per_chunk):
+            stop_frame = min(start_frame + frames_per_chunk, num_frames)
+            samples = decode_adc_samples(adc_data[start_frame * num_ints_per_frame : stop_frame * num_ints_per_frame], mmwave_device_0)
+
+            chunk_events = []
+            for profile in profiles:
+                data = samples[profile["profile_index"]::2].reshape((stop_frame - start_frame, profile["num_chirps"], profile["num_samples"], num_rx))
+                # int16 samples (is_iq_swap) would overflow when squared
+                data = data.astype(np.complex64, copy=False)
+                power = data.real ** 2 + data.imag ** 2
+                peak_power = power.max(axis=2)
+
+                # only the chirps above a threshold are searched for the onset
+                for threshold, power_threshold in zip(thresholds, power_thresholds):
+                    frame, chirp, rx = np.nonzero(peak_power > power_threshold)
+                    if frame.size == 0:
+                        break
+                    onset = np.argmax(power[frame, chirp, :, rx] > power_threshold, axis=1)
+
+                    profile_events = np.empty(frame.size, dtype=EVENT_DTYPE)
+                    profile_events["frame"] = frame + start_frame
+                    profile_events["chirp"] = chirp
+                    profile_events["profile"] = profile["profile_index"]
+                    profile_events["rx"] = rx
+                    profile_events["threshold"] = threshold
+                    profile_events["onset_sample"] = onset
+                    profile_events["onset_time"] = sample_times(
+                        profile_events["frame"], chirp, onset, profile["profile_index"], profile["frame_periodicity"],
+                        profile["sample_rate"], profile["idle_time"], profile["adc_start_time"], profile["ramp_time"])
+                    profile_events["peak_magnitude"] = np.sqrt(peak_power[frame, chirp, rx])
+                    chunk_events.append(profile_events)
+
+            if not chunk_events:
+                continue
+            chunk_events = np.concatenate(chunk_events)
+            chunk_events = chunk_events[np.lexsort([chunk_events[name] for name in ("threshold", "rx", "profile", "chirp", "frame")])]
+            events.append(chunk_events)
+            if csv_file is not None:
+                np.savetxt(csv_file, chunk_events, fmt=EVENT_CSV_FORMAT, delimiter=",")
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+        adc_data._mmap.close()
+
+    events = np.concatenate(events) if events else np.empty(0, dtype=EVENT_DTYPE)
+    if events_file is not None and events_file.endswith(".npy"):
+        np.save(events_file, events)
+
+    elapsed_time = time.perf_counter() - start_time
+    print(f"Found {events.size} interference events in {num_frames} frames ({num_ints_per_frame * num_frames * 2 / elapsed_time * 1e-6:.1f} MB/s)")
+
+    return events
+
+
+def magnitude_dB(data):
+    """20*log10(|data| + 1e-6) computed in float32 (complex64 inputs stay single precision)"""
+    magnitude = np.abs(data).astype(np.float32, copy=False)
+    magnitude += 1e-6
+    np.log10(magnitude, out=magnitude)
+    magnitude *= 20
+    return magnitude
+
+class RangeDopplerEngine:
+    def __init__(self, adc_data, win_hann, dbfs_coeff, batch_size=64):
+        """Computes the windowed range FFT, doppler FFT, and dB magnitudes of every frame/rx of a
+        profile once (with axis-wise FFTs in complex64) and serves frames from the cached results
+
+        Args:
+            adc_data (np.ndarray): num_samples x num_chirps x num_frames x num_rx ADC data (see read_adc_data)
+            win_hann (np.ndarray): num_samples range window
+            dbfs_coeff (float): dB to dBFS conversion added to the range magnitudes
+            batch_size (int, optional): number of frames processed at a time (limits the temporary
+                complex buffers). Defaults to 64.
+        """
+        self.adc_data = adc_data
+        self.win_hann = np.asarray(win_hann, dtype=np.float32)[:, np.newaxis, np.newaxis, np.newaxis]
+        self.dbfs_coeff = np.float32(dbfs_coeff)
+        self.batch_size = batch_size
+
+        self.num_samples, self.num_chirps, self.num_frames, self.num_rx = adc_data.shape
+
+        # num_samples x num_chirps x num_frames x num_rx dB magnitudes (computed on first access)
+        self._range_dB = None
+        self._range_doppler_dB = None
+
+    def compute(self):
+        """Compute the range and range-doppler magnitudes for all frames (only done once)"""
+        if self._range_dB is not None:
+            return
+
+        shape = (self.num_samples, self.num_chirps, self.num_frames, self.num_rx)
+        self._range_dB = np.empty(shape, dtype=np.float32)
+        self._range_doppler_dB = np.empty(shape, dtype=np.float32)
+
+        for start in range(0, self.num_frames, self.batch_size):
+            frames = slice(start, min(start + self.batch_size, self.num_frames))
+
+            windowed_data = self.adc_data[:, :, frames, :].astype(np.complex64)
+            windowed_data *= self.win_hann
+            range_fft_data = fft.fft(windowed_data, axis=0, overwrite_x=True, workers=-1)
+            self._range_dB[:, :, frames, :] = magnitude_dB(range_fft_data)
+            self._range_dB[:, :, frames, :] += self.dbfs_coeff
+
+            # doppler FFT of the range FFT (zero velocity in the center chirp bin)
+            range_doppler_data = fft.fft(range_fft_data, axis=1, overwrite_x=True, workers=-1)
+            self._range_doppler_dB[:, :, frames, :] = fft.fftshift(magnitude_dB(range_doppler_data), axes=1)
+
+    @property
+    def range_dB(self):
+        self.compute()
+        return self._range_dB
+
+    @property
+    def range_doppler_dB(self):
+        self.compute()
+        return self._range_doppler_dB
+
+    def range_frame(self, frame_index):
+        """num_samples x num_chirps x num_rx range magnitudes (dBFS) of a frame (view into the cache)"""
+        return self.range_dB[:, :, frame_index, :]
+
+    def range_doppler_frame(self, frame_index, rx_channel=0):
+        """num_samples x num_chirps range-doppler magnitudes (dB) of a frame (view into the cache)"""
+        return self.range_doppler_dB[:, :, frame_index, rx_channel]
 
 def plot_range_doppler(ax, range_doppler_data, v_max, v_res, num_samples, num_chirps, range_res, desired_frame):
     velocities = np.linspace(-v_max, v_max, num_chirps)
@@ -91,8 +280,7 @@ def plot_adc_data(ax, line_real, line_imag, adc_data, num_samples, num_chirps, d
     data = adc_data[:, desired_chirp, desired_frame, rx_channel]
     t = np.linspace(0, num_samples-1, num_samples)
 
-    time_per_sample = 1 / sample_rate
-    time_indices = desired_frame * frame_periodicity + (2 * desired_chirp + profile_index) * (idle_time + ramp_time) + (idle_time + adc_start_time) + t * time_per_sample
+    time_indices = sample_times(desired_frame, desired_chirp, t, profile_index, frame_periodicity, sample_rate, idle_time, adc_start_time, ramp_time)
 
     complex_magnitude = np.abs(data)
     threshold = 50 if freq > 77 else 50
@@ -116,10 +304,7 @@ def plot_adc_data(ax, line_real, line_imag, adc_data, num_samples, num_chirps, d
 def plot_2d_fft_3d(ax, adc_data, num_samples, num_chirps, rx_channel, desired_frame, range_res):
     frame_data = adc_data[:, :, desired_frame-1, rx_channel]
     frame_data = np.reshape(frame_data, (num_samples, num_chirps))
-    fft_2d_range = np.zeros((num_samples, num_chirps))
-    for chirp in range(num_chirps):
-        frame_data_chirp = frame_data[:, chirp]
-        fft_2d_range[:, chirp] = 20 * np.log10(np.abs(fft.fft(frame_data_chirp)) + 1e-6)
+    fft_2d_range = magnitude_dB(fft.fft(frame_data.astype(np.complex64), axis=0))
     x_vals = np.arange(1, num_chirps + 1)
     y_vals = np.arange(num_samples) * range_res
 
@@ -136,10 +321,7 @@ def plot_2d_fft_3d(ax, adc_data, num_samples, num_chirps, rx_channel, desired_fr
 def plot_2d_fft_image(ax, adc_data, num_samples, num_chirps, num_frames, rx_channel, desired_frame, range_res):
     frame_data = adc_data[:, :, desired_frame-1, rx_channel]
     frame_data = np.reshape(frame_data, (num_samples, num_chirps))
-    fft_2d_range = np.zeros((num_samples, num_chirps))
-    for chirp in range(num_chirps):
-        frame_data_chirp = frame_data[:, chirp]
-        fft_2d_range[:, chirp] = 20 * np.log10(np.abs(fft.fft(frame_data_chirp)))
+    fft_2d_range = magnitude_dB(fft.fft(frame_data.astype(np.complex64), axis=0))
     x_vals = np.arange(1, num_chirps + 1)
     y_vals = np.arange(num_samples) * range_res
 
@@ -190,22 +372,152 @@ def analyze_periods(timestamps):
 
 def predict_next_interference(timestamps, unique_periods, counts, frame_periodicity, idle_time, adc_start_time):
     if len(unique_periods) > 0 and counts.max() >= 3:
-        mean_period = np.mean(unique_periods)
-        last_timestamp = timestamps[-1]
-        next_interference_time = last_timestamp + mean_period
-        lower_bound = last_timestamp + mean_period - 0.25
-        upper_bound = last_timestamp + mean_period + 0.25
+        return predict_from_period(timestamps[-1], np.mean(unique_periods), frame_periodicity, idle_time, adc_start_time)
+
+    return None, None, None
 
-        n = int(next_interference_time // frame_periodicity)
-        start_time = frame_periodicity * n + idle_time + adc_start_time
-        end_time = frame_periodicity * (n + 1)
+def predict_from_period(last_timestamp, mean_period, frame_periodicity, idle_time, adc_start_time):
+    next_interference_time = last_timestamp + mean_period
+    lower_bound = last_timestamp + mean_period - 0.25
+    upper_bound = last_timestamp + mean_period + 0.25
 
-        if start_time <= next_interference_time <= end_time:
-            return next_interference_time, lower_bound, upper_bound
+    n = int(next_interference_time // frame_periodicity)
+    start_time = frame_periodicity * n + idle_time + adc_start_time
+    end_time = frame_periodicity * (n + 1)
+
+    if start_time <= next_interference_time <= end_time:
+        return next_interference_time, lower_bound, upper_bound
 
     return None, None, None
 
 
+class InterferencePeriodTracker:
+    def __init__(self, window_size=256, decay=0.99, eps=0.01, resolution=1e-4, min_count=3):
+        """Online replacement for analyze_periods/predict_next_interference. Periods between
+        interference timestamps are kept in a histogram (bins of size resolution) over a sliding
+        window, with older periods exponentially decayed. The main cluster is the bins within eps
+        of the densest bin, so each new timestamp costs O(eps / resolution) instead of re-running
+        DBSCAN over every timestamp of the session
+
+        Args:
+            window_size (int, optional): number of most recent periods kept. Defaults to 256.
+            decay (float, optional): weight of each period is multiplied by decay every time a new
+                period is added. Defaults to 0.99.
+            eps (float, optional): maximum distance of a period from the center of the main cluster
+                (same as the DBSCAN eps). Defaults to 0.01.
+            resolution (float, optional): histogram bin size (periods were rounded to 4 decimals). Defaults to 1e-4.
+            min_count (int, optional): decayed weight the most common period needs before predictions are made.
+                Defaults to 3.
+        """
+        self.window_size = window_size
+        self.decay = decay
+        self.resolution = resolution
+        self.min_count = min_count
+        self._eps_bins = int(round(eps / resolution))
+
+        self.num_timestamps = 0
+        self.last_timestamp = None
+
+        # (bin, raw weight) of each period in the window, and the raw weight, number of periods, and density
+        # (raw weight of the periods within eps) of each occupied bin. Decay is applied lazily: new periods are
+        # added with a weight of _scale (which grows by 1 / decay per period), so the decayed weight of a bin
+        # is its raw weight / _scale
+        self._periods = deque()
+        self._weights = {}
+        self._num_periods = {}
+        self._densities = {}
+        self._scale = 1.0
+
+        # center bin of the main cluster and the cluster's periods, decayed weights, and mean
+        self._mode_bin = None
+        self.unique_periods = np.zeros(0)
+        self.counts = np.zeros(0)
+        self.mean_period = None
+
+    def update(self, timestamp):
+        """Add a new interference timestamp"""
+        self.num_timestamps += 1
+        if self.last_timestamp is None:
+            self.last_timestamp = timestamp
+            return
+
+        period_bin = int(round((timestamp - self.last_timestamp) / self.resolution))
+        self.last_timestamp = timestamp
+
+        self._scale /= self.decay
+        self._add_period(period_bin, self._scale)
+        self._periods.append((period_bin, self._scale))
+
+        mode_changed = False
+        if len(self._periods) > self.window_size:
+            old_bin, old_weight = self._periods.popleft()
+            self._remove_period(old_bin, old_weight)
+
+            # the main cluster lost weight, so another cluster could now be denser
+            mode_changed = abs(old_bin - self._mode_bin) <= self._eps_bins
+
+        if self._scale > 1e100:
+            self._rescale()
+
+        if mode_changed or self._mode_bin is None:
+            self._mode_bin = max(self._densities, key=self._densities.get)
+        else:
+            # the new period added to the density of every bin within eps of it, so any of them could now be the densest
+            for neighbor in self._neighbors(period_bin):
+                if neighbor in self._densities and self._densities[neighbor] > self._densities[self._mode_bin]:
+                    self._mode_bin = neighbor
+
+        self._update_cluster()
+
+    def _neighbors(self, period_bin):
+        """The bins within eps of a bin"""
+        return range(period_bin - self._eps_bins, period_bin + self._eps_bins + 1)
+
+    def _add_period(self, period_bin, weight):
+        if period_bin not in self._weights:
+            self._weights[period_bin] = 0.0
+            self._num_periods[period_bin] = 0
+            self._densities[period_bin] = sum(self._weights.get(neighbor, 0.0) for neighbor in self._neighbors(period_bin))
+
+        self._weights[period_bin] += weight
+        self._num_periods[period_bin] += 1
+        for neighbor in self._neighbors(period_bin):
+            if neighbor in self._densities:
+                self._densities[neighbor] += weight
+
+    def _remove_period(self, period_bin, weight):
+        self._weights[period_bin] -= weight
+        self._num_periods[period_bin] -= 1
+        for neighbor in self._neighbors(period_bin):
+            if neighbor in self._densities:
+                self._densities[neighbor] -= weight
+
+        if self._num_periods[period_bin] == 0:
+            del self._weights[period_bin]
+            del self._num_periods[period_bin]
+            del self._densities[period_bin]
+
+    def _rescale(self):
+        """Fold the lazy decay into the stored weights before they overflow"""
+        self._weights = {period_bin: weight / self._scale for period_bin, weight in self._weights.items()}
+        self._densities = {period_bin: density / self._scale for period_bin, density in self._densities.items()}
+        self._periods = deque((period_bin, weight / self._scale) for period_bin, weight in self._periods)
+        self._scale = 1.0
+
+    def _update_cluster(self):
+        cluster_bins = [period_bin for period_bin in self._neighbors(self._mode_bin) if period_bin in self._weights]
+        self.unique_periods = np.round(np.array(cluster_bins) * self.resolution, 4)
+        self.counts = np.array([self._weights[period_bin] for period_bin in cluster_bins]) / self._scale
+        self.mean_period = np.average(self.unique_periods, weights=self.counts)
+
+    def predict_next_interference(self, frame_periodicity, idle_time, adc_start_time):
+        """Predict the next interference time from the mean period of the main cluster (see predict_next_interference)"""
+        if self.mean_period is None or self.counts.max() < self.min_count:
+            return None, None, None
+
+        return predict_from_period(self.last_timestamp, self.mean_period, frame_periodicity, idle_time, adc_start_time)
+
+
 
 def plot_periods(ax, unique_periods, counts):
     ax.clear()
@@ -265,10 +577,181 @@ def plot_prediction(ax, next_interference_time, lower_bound, upper_bound, timest
     ax.legend()
     plt.draw()
 
-def main():
-    adc_data_bin_file = '/Users/edwardju/Downloads/adc_data_ChangeFreq.bin'
-    mmwave_setup_json_file = '/Users/edwardju/Downloads/ChangeFreq.mmwave.json'
-    
+class HeadlessRenderer:
+    def __init__(self, num_samples, num_chirps, range_res, v_max, range_limits, range_doppler_limits, profile_index=0, rx_channel=0, chirp_index=0, dpi=100):
+        """Renders the range FFT and range-doppler plots of frames without a display (Agg canvas). The figure and
+        its artists are created once and only their data is updated for each frame
+
+        Args:
+            num_samples (int): number of samples (range bins) per chirp
+            num_chirps (int): number of chirps (doppler bins) per frame
+            range_res (float): range resolution (m)
+            v_max (float): maximum velocity (m/s)
+            range_limits (tuple): (min, max) range FFT magnitudes (dBFS) of the y axis
+            range_doppler_limits (tuple): (min, max) range-doppler magnitudes (dB) of the color scale
+            profile_index (int, optional): the profile being rendered (for the titles). Defaults to 0.
+            rx_channel (int, optional): the rx channel to render. Defaults to 0.
+            chirp_index (int, optional): the chirp whose range FFT is plotted. Defaults to 0.
+            dpi (int, optional): resolution of the rendered frames. Defaults to 100.
+        """
+        self.profile_index = profile_index
+        self.rx_channel = rx_channel
+        self.chirp_index = chirp_index
+
+        self.fig = Figure(figsize=(12, 5), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax_range, self.ax_range_doppler = self.fig.subplots(1, 2)
+
+        ranges = np.arange(num_samples) * range_res
+        self.line_range, = self.ax_range.plot(ranges, np.zeros(num_samples))
+        self.ax_range.set_ylim(*range_limits)
+        self.ax_range.set_xlabel('Range (m)')
+        self.ax_range.set_ylabel('Magnitude (dBFS)')
+
+        self.image_range_doppler = self.ax_range_doppler.imshow(
+            np.zeros((num_samples, num_chirps)), aspect='auto', extent=[-v_max, v_max, ranges.max(), ranges.min()],
+            cmap='viridis', vmin=range_doppler_limits[0], vmax=range_doppler_limits[1])
+        self.ax_range_doppler.set_xlabel('Velocity (m/s)')
+        self.ax_range_doppler.set_ylabel('Range (m)')
+        self.fig.colorbar(self.image_range_doppler, ax=self.ax_range_doppler, label='Magnitude (dB)')
+
+        # the layout is computed with titles so that they fit
+        self.update(0, np.zeros((num_samples, num_chirps, rx_channel + 1)), np.zeros((num_samples, num_chirps)))
+        self.fig.tight_layout()
+
+    def update(self, frame_index, range_frame, range_doppler_frame):
+        """Update the plots with a frame's data
+
+        Args:
+            frame_index (int): the frame's index in the capture (for the titles)
+            range_frame (np.ndarray): num_samples x num_chirps x num_rx range magnitudes of the frame (see RangeDopplerEngine.range_frame)
+            range_doppler_frame (np.ndarray): num_samples x num_chirps range-doppler magnitudes of the frame (see RangeDopplerEngine.range_doppler_frame)
+        """
+        self.line_range.set_ydata(range_frame[:, self.chirp_index, self.rx_channel])
+        self.image_range_doppler.set_data(range_doppler_frame)
+        self.ax_range.set_title(f'Range FFT (Profile {self.profile_index}) for frame: {frame_index}, chirp: {self.chirp_index}')
+        self.ax_range_doppler.set_title(f'Range-Doppler FFT (Profile {self.profile_index}) for frame: {frame_index}')
+
+    def render(self):
+        """Draw the plots and get the height x width x 4 RGBA pixels (valid until the next frame is drawn)"""
+        self.canvas.draw()
+        return self.canvas.buffer_rgba()
+
+    def save_png(self, png_file):
+        self.canvas.print_png(png_file)
+
+    @property
+    def size(self):
+        """(width, height) of the rendered frames in pixels"""
+        width, height = self.canvas.get_width_height()
+        return width, height
+
+# state of each render_frames worker process (set by _init_render_worker)
+_render_worker = {}
+
+def _init_render_worker(renderer_kwargs, frame_indices, range_dB, range_doppler_dB):
+    _render_worker["renderer"] = HeadlessRenderer(**renderer_kwargs)
+    _render_worker["frame_indices"] = frame_indices
+    _render_worker["range_dB"] = range_dB
+    _render_worker["range_doppler_dB"] = range_doppler_dB
+
+def _render_frame(args):
+    """Render a frame to a png (if png_file is given) or return its RGBA pixels"""
+    i, png_file = args
+    renderer = _render_worker["renderer"]
+    renderer.update(
+        _render_worker["frame_indices"][i],
+        _render_worker["range_dB"][:, :, i, :],
+        _render_worker["range_doppler_dB"][:, :, i, renderer.rx_channel])
+
+    if png_file is not None:
+        renderer.save_png(png_file)
+        return None
+    return bytes(renderer.render())
+
+def render_frames(adc_data, win_hann, dbfs_coeff, num_samples, num_chirps, range_res, v_max, output, frames=None, profile_index=0, rx_channel=0, chirp_index=0, num_workers=None, fps=10):
+    """Render the range FFT and range-doppler plots of a range of frames to png files or an mp4 video, with the
+    frames split across a pool of headless renderers
+
+    Args:
+        adc_data (np.ndarray): num_samples x num_chirps x num_frames x num_rx ADC data of a profile (see read_adc_data)
+        win_hann (np.ndarray): num_samples range window
+        dbfs_coeff (float): dB to dBFS conversion added to the range magnitudes
+        num_samples (int): number of samples per chirp
+        num_chirps (int): number of chirps per frame
+        range_res (float): range resolution (m)
+        v_max (float): maximum velocity (m/s)
+        output (str): an .mp4 file (requires ffmpeg) or a directory to write frame_XXXXX.png files to
+        frames (range, optional): the frames to render. Defaults to None (all frames).
+        profile_index (int, optional): the profile being rendered (for the titles). Defaults to 0.
+        rx_channel (int, optional): the rx channel to render. Defaults to 0.
+        chirp_index (int, optional): the chirp whose range FFT is plotted. Defaults to 0.
+        num_workers (int, optional): number of render processes. Defaults to None (one per cpu).
+        fps (int, optional): frame rate of mp4 videos. Defaults to 10.
+
+    Returns:
+        int: the number of frames rendered
+    """
+    if frames is None:
+        frames = range(adc_data.shape[2])
+
+    # only the selected frames are processed (a range with a negative step that includes frame 0 stops at -1,
+    # which would index from the end as a slice stop)
+    frame_slice = slice(frames.start, frames.stop if frames.stop >= 0 else None, frames.step)
+    engine = RangeDopplerEngine(adc_data[:, :, frame_slice, :], win_hann, dbfs_coeff)
+    range_dB = engine.range_dB
+    range_doppler_dB = engine.range_doppler_dB
+
+    # the same axis and color limits are used for every frame
+    range_limits = (float(range_dB[:, chirp_index, :, rx_channel].min()), float(range_dB[:, chirp_index, :, rx_channel].max()))
+    range_doppler_limits = (float(range_doppler_dB[:, :, :, rx_channel].min()), float(range_doppler_dB[:, :, :, rx_channel].max()))
+    renderer_kwargs = {
+        "num_samples": num_samples,
+        "num_chirps": num_chirps,
+        "range_res": range_res,
+        "v_max": v_max,
+        "range_limits": range_limits,
+        "range_doppler_limits": range_doppler_limits,
+        "profile_index": profile_index,
+        "rx_channel": rx_channel,
+        "chirp_index": chirp_index,
+    }
+
+    write_video = output.endswith(".mp4")
+    if write_video:
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg is required to render mp4 videos")
+        tasks = [(i, None) for i in range(len(frames))]
+
+        width, height = HeadlessRenderer(**renderer_kwargs).size
+        # the frames are padded to an even size for yuv420p
+        video = subprocess.Popen([
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", output,
+        ], stdin=subprocess.PIPE)
+    else:
+        os.makedirs(output, exist_ok=True)
+        tasks = [(i, os.path.join(output, f"frame_{frame_index:05d}.png")) for i, frame_index in enumerate(frames)]
+
+    start_time = time.perf_counter()
+    with Pool(num_workers, initializer=_init_render_worker, initargs=(renderer_kwargs, frames, range_dB, range_doppler_dB)) as pool:
+        # frames are returned in order so that they can be written to the video as they are rendered
+        for rgba in pool.imap(_render_frame, tasks, chunksize=4):
+            if write_video:
+                video.stdin.write(rgba)
+
+    if write_video:
+        video.stdin.close()
+        if video.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to write {output}")
+
+    elapsed_time = time.perf_counter() - start_time
+    print(f"Rendered {len(frames)} frames to {output} ({len(frames) / elapsed_time:.1f} frames/s)")
+
+    return len(frames)
+
+def main(adc_data_bin_file, mmwave_setup_json_file):
     mmwave_device_profile_0 = MMWaveDevice(adc_data_bin_file, mmwave_setup_json_file, profile_id=0)
     mmwave_device_profile_0.print_device_configuration()
     
@@ -309,8 +792,14 @@ def main():
     v_max_1 = mmwave_device_profile_1.v_max
     v_res_1 = mmwave_device_profile_1.v_res
 
-    range_data_0 = np.zeros((num_samples_0, num_chirps_0, num_rx_0), dtype=np.float32)
-    range_data_1 = np.zeros((num_samples_1, num_chirps_1, num_rx_1), dtype=np.float32)
+    # interference periods of each profile (updated with each new timestamp)
+    trackers = [InterferencePeriodTracker(), InterferencePeriodTracker()]
+
+    # range and range-doppler magnitudes of every frame are computed once per profile (on first use)
+    engines = [
+        RangeDopplerEngine(adc_data_profile_0, win_hann_0, dbfs_coeff_0),
+        RangeDopplerEngine(adc_data_profile_1, win_hann_1, dbfs_coeff_1),
+    ]
 
     desired_frame = 1
     rx_channel = 0
@@ -369,15 +858,11 @@ def main():
 
         while plt.fignum_exists(fig.number) and plt.fignum_exists(fig_chirp.number):
             if running:
+                range_magnitude = engines[profile_index].range_frame(frame_index)[:, :, rx_channel]
+                line1.set_ydata(range_magnitude[:, chirp_index])
                 if profile_index == 0:
-                    range_fft(adc_data_profile_0[:, :, frame_index, :], range_data_0, num_samples_0, num_chirps_0, num_rx_0, win_hann_0, dbfs_coeff_0)
-                    range_magnitude = range_data_0[:, :, rx_channel]
-                    line1.set_ydata(range_magnitude[:, chirp_index])
                     plot_adc_data(ax2, line_real, line_imag, adc_data_profile_0, num_samples_0, num_chirps_0, frame_index, chirp_index, rx_channel, frame_periodicity_0, sample_rate_0, idle_time_0, adc_start_time_0, ramp_time_0, freq_0, profile_index)
                 else:
-                    range_fft(adc_data_profile_1[:, :, frame_index, :], range_data_1, num_samples_1, num_chirps_1, num_rx_1, win_hann_1, dbfs_coeff_1)
-                    range_magnitude = range_data_1[:, :, rx_channel]
-                    line1.set_ydata(range_magnitude[:, chirp_index])
                     plot_adc_data(ax2, line_real, line_imag, adc_data_profile_1, num_samples_1, num_chirps_1, frame_index, chirp_index, rx_channel, frame_periodicity_1, sample_rate_1, idle_time_1, adc_start_time_1, ramp_time_1, freq_1, profile_index)
 
                 ax1.set_title(f'Range FFT (Profile {profile_index})')
@@ -387,7 +872,7 @@ def main():
                 plot_2d_fft_3d(ax3, adc_data_profile_0 if profile_index == 0 else adc_data_profile_1, num_samples_0 if profile_index == 0 else num_samples_1, num_chirps_0 if profile_index == 0 else num_chirps_1, rx_channel, frame_index, range_res_0 if profile_index == 0 else range_res_1)
                 plot_2d_fft_image(ax4, adc_data_profile_0 if profile_index == 0 else adc_data_profile_1, num_samples_0 if profile_index == 0 else num_samples_1, num_chirps_0 if profile_index == 0 else num_chirps_1, num_frames_0 if profile_index == 0 else num_frames_1, rx_channel, frame_index, range_res_0 if profile_index == 0 else range_res_1)
 
-                range_doppler_data = compute_range_doppler(adc_data_profile_0 if profile_index == 0 else adc_data_profile_1, num_samples_0 if profile_index == 0 else num_samples_1, num_chirps_0 if profile_index == 0 else num_chirps_1, num_frames_0 if profile_index == 0 else num_frames_1)
+                range_doppler_data = engines[profile_index].range_doppler_dB[:, :, :, 0]
                 plot_range_doppler(ax6, range_doppler_data, v_max_0 if profile_index == 0 else v_max_1, v_res_0 if profile_index == 0 else v_res_1, num_samples_0 if profile_index == 0 else num_samples_1, num_chirps_0 if profile_index == 0 else num_chirps_1, range_res_0 if profile_index == 0 else range_res_1, frame_index)
 
                 plt.draw()
@@ -411,18 +896,23 @@ def main():
             else:
                 plt.pause(0.1)  
 
+            # only the new timestamps are added to the trackers
+            for tracker, timestamps in zip(trackers, (timestamps_0, timestamps_1)):
+                for timestamp in timestamps[tracker.num_timestamps:]:
+                    tracker.update(timestamp)
+
             if len(timestamps_0) > 1:
-                unique_periods_0, counts_0 = analyze_periods(timestamps_0)
+                unique_periods_0, counts_0 = trackers[0].unique_periods, trackers[0].counts
                 print(unique_periods_0, counts_0)
                 plot_periods(ax_periods, unique_periods_0, counts_0)
-                next_interference_time_0, lower_bound_0, upper_bound_0 = predict_next_interference(timestamps_0, unique_periods_0, counts_0, frame_periodicity_0, idle_time_0, adc_start_time_0)
+                next_interference_time_0, lower_bound_0, upper_bound_0 = trackers[0].predict_next_interference(frame_periodicity_0, idle_time_0, adc_start_time_0)
                 plot_prediction(ax_prediction, next_interference_time_0, lower_bound_0, upper_bound_0, timestamps_0, frame_periodicity_0, idle_time_0, adc_start_time_0, unique_periods_0, counts_0)
 
             if len(timestamps_1) > 1:
-                unique_periods_1, counts_1 = analyze_periods(timestamps_1)
-                print(unique_periods_1, counts_1)   
+                unique_periods_1, counts_1 = trackers[1].unique_periods, trackers[1].counts
+                print(unique_periods_1, counts_1)
                 plot_periods(ax_periods, unique_periods_1, counts_1)
-                next_interference_time_1, lower_bound_1, upper_bound_1 = predict_next_interference(timestamps_1, unique_periods_1, counts_1, frame_periodicity_1, idle_time_1, adc_start_time_1)
+                next_interference_time_1, lower_bound_1, upper_bound_1 = trackers[1].predict_next_interference(frame_periodicity_1, idle_time_1, adc_start_time_1)
                 plot_prediction(ax_prediction, next_interference_time_1, lower_bound_1, upper_bound_1, timestamps_1, frame_periodicity_1, idle_time_1, adc_start_time_1, unique_periods_1, counts_1)
 
         print("Timestamps when amplitude went beyond threshold:", timestamps_0, timestamps_1)
@@ -431,5 +921,49 @@ def main():
     except KeyboardInterrupt:
         pass
 
+def detect_events_main(adc_data_bin_file, mmwave_setup_json_file, events_file, thresholds, frames_per_chunk):
+    mmwave_device_profile_0 = MMWaveDevice(adc_data_bin_file, mmwave_setup_json_file, profile_id=0)
+    mmwave_device_profile_1 = MMWaveDevice(adc_data_bin_file, mmwave_setup_json_file, profile_id=1)
+
+    detect_interference_events(adc_data_bin_file, mmwave_device_profile_0, mmwave_device_profile_1, events_file, thresholds, frames_per_chunk)
+
+def render_main(adc_data_bin_file, mmwave_setup_json_file, output, frames, profile_index, rx_channel, chirp_index, num_workers, fps):
+    mmwave_device_profile_0 = MMWaveDevice(adc_data_bin_file, mmwave_setup_json_file, profile_id=0)
+    mmwave_device_profile_1 = MMWaveDevice(adc_data_bin_file, mmwave_setup_json_file, profile_id=1)
+
+    adc_data_profiles = read_adc_data(adc_data_bin_file, mmwave_device_profile_0, mmwave_device_profile_1)
+    mmwave_device = (mmwave_device_profile_0, mmwave_device_profile_1)[profile_index]
+    adc_data = adc_data_profiles[profile_index]
+
+    render_frames(
+        adc_data, mmwave_device.win_hann, mmwave_device.dbfs_coeff, mmwave_device.num_sample_per_chirp, mmwave_device.num_chirp_per_frame,
+        mmwave_device.range_res, mmwave_device.v_max, output, range(adc_data.shape[2])[frames], profile_index, rx_channel, chirp_index, num_workers, fps)
+
+def parse_frames(frames):
+    """Parse a start:stop[:step] frame range (any part can be left out, ex: 100: or ::10)"""
+    return slice(*[int(value) if value else None for value in frames.split(":")])
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Post-process (or find interference in) a two profile adc capture")
+    parser.add_argument("--adc-data", default='/Users/edwardju/Downloads/adc_data_ChangeFreq.bin', help="path to the adc data")
+    parser.add_argument("--mmwave-json", default='/Users/edwardju/Downloads/ChangeFreq.mmwave.json', help="path to the mmwave setup json")
+    parser.add_argument("--events", help="find the interference events of the whole capture (without plotting) and write them to this file (.csv or .npy)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[50], help="magnitude thresholds for --events")
+    parser.add_argument("--frames-per-chunk", type=int, default=64, help="number of frames decoded at a time for --events")
+    parser.add_argument("--render", help="render the range FFT and range-doppler plots (without a display) to an .mp4 file or a directory of pngs")
+    parser.add_argument("--frames", type=parse_frames, default=slice(None), help="start:stop[:step] frames to --render (defaults to all frames)")
+    parser.add_argument("--profile", type=int, choices=[0, 1], default=0, help="profile to --render")
+    parser.add_argument("--rx-channel", type=int, default=0, help="rx channel to --render")
+    parser.add_argument("--chirp", type=int, default=0, help="chirp whose range FFT is rendered")
+    parser.add_argument("--workers", type=int, help="number of render processes (defaults to one per cpu)")
+    parser.add_argument("--fps", type=int, default=10, help="frame rate of rendered videos")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.events:
+        detect_events_main(args.adc_data, args.mmwave_json, args.events, args.thresholds, args.frames_per_chunk)
+    elif args.render:
+        render_main(args.adc_data, args.mmwave_json, args.render, args.frames, args.profile, args.rx_channel, args.chirp, args.workers, args.fps)
+    else:
+        main(args.adc_data, args.mmwave_json)
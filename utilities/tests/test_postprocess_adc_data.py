@@ -0,0 +1,214 @@
+import os
+import sys
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("mplcursors")
+pytest.importorskip("MMWaveDevice")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+Postprocess_adc_data = pytest.importorskip("Postprocess_adc_data")
+InterferencePeriodTracker = Postprocess_adc_data.InterferencePeriodTracker
+analyze_periods = Postprocess_adc_data.analyze_periods
+HeadlessRenderer = Postprocess_adc_data.HeadlessRenderer
+RangeDopplerEngine = Postprocess_adc_data.RangeDopplerEngine
+
+def timestamps_from_periods(periods):
+    return np.concatenate(([0.0], np.cumsum(periods)))
+
+def assert_mode_is_densest(tracker):
+    if tracker._densities:
+        assert tracker._densities[tracker._mode_bin] == max(tracker._densities.values())
+
+def test_tracker_matches_analyze_periods():
+
+    # main cluster around 0.105 s and a few outliers (fewer than DBSCAN's min_samples)
+    periods = np.array([0.099] * 3 + [0.105] * 6 + [0.110] * 3 + [0.25, 0.4, 0.4])
+    np.random.default_rng(0).shuffle(periods)
+    timestamps = timestamps_from_periods(periods)
+
+    tracker = InterferencePeriodTracker(decay=1.0)
+    for timestamp in timestamps:
+        tracker.update(timestamp)
+
+    unique_periods, counts = analyze_periods(timestamps)
+    assert tracker._mode_bin == 1050
+    np.testing.assert_allclose(tracker.unique_periods, unique_periods)
+    np.testing.assert_allclose(tracker.counts, counts)
+
+def test_tracker_sliding_window():
+
+    # the interference period changes part way through the session
+    periods = np.array([0.2] * 8 + [0.099] * 3 + [0.105] * 6 + [0.110] * 3)
+    timestamps = timestamps_from_periods(periods)
+
+    window_size = 12
+    tracker = InterferencePeriodTracker(window_size=window_size, decay=1.0)
+    for timestamp in timestamps:
+        tracker.update(timestamp)
+        assert_mode_is_densest(tracker)
+
+    unique_periods, counts = analyze_periods(timestamps[-window_size - 1 :])
+    assert tracker._mode_bin == 1050
+    np.testing.assert_allclose(tracker.unique_periods, unique_periods)
+    np.testing.assert_allclose(tracker.counts, counts)
+
+def test_tracker_mode_moves_to_neighbor():
+
+    # the new period (12) makes its neighbor (13) the densest bin
+    resolution = 1e-4
+    tracker = InterferencePeriodTracker(decay=1.0, eps=resolution, resolution=resolution)
+    for timestamp in timestamps_from_periods(np.array([10, 10, 10, 13, 13, 14, 12]) * resolution):
+        tracker.update(timestamp)
+        assert_mode_is_densest(tracker)
+
+    assert tracker._mode_bin == 13
+    np.testing.assert_allclose(tracker.unique_periods, [0.0012, 0.0013, 0.0014])
+    np.testing.assert_allclose(tracker.counts, [1, 2, 1])
+
+def make_profile_data(num_samples=16, num_chirps=8, num_frames=6, num_rx=2):
+    """num_samples x num_chirps x num_frames x num_rx complex64 adc data with a different tone in every frame"""
+    rng = np.random.default_rng(0)
+    samples = np.arange(num_samples)[:, np.newaxis, np.newaxis, np.newaxis]
+    frames = np.arange(num_frames)[np.newaxis, np.newaxis, :, np.newaxis]
+    adc_data = 100 * np.exp(2j * np.pi * (frames + 1) * samples / num_samples)
+    adc_data = adc_data + rng.normal(size=(num_samples, num_chirps, num_frames, num_rx))
+    return adc_data.astype(np.complex64)
+
+def test_range_doppler_engine_matches_per_frame_fft():
+
+    adc_data = make_profile_data(num_frames=7)
+    win_hann = np.hanning(16)
+    dbfs_coeff = -100.0
+
+    # frames are processed in batches that do not divide the number of frames
+    engine = RangeDopplerEngine(adc_data, win_hann, dbfs_coeff, batch_size=3)
+
+    # the engine's complex64 FFTs differ the most (in dB) in the near-null bins
+    for frame_index in range(adc_data.shape[2]):
+        frame = adc_data[:, :, frame_index, :].astype(np.complex128) * win_hann[:, np.newaxis, np.newaxis]
+        range_fft = np.fft.fft(frame, axis=0)
+        expected_range_dB = 20 * np.log10(np.abs(range_fft) + 1e-6) + dbfs_coeff
+        expected_range_doppler_dB = np.fft.fftshift(20 * np.log10(np.abs(np.fft.fft(range_fft, axis=1)) + 1e-6), axes=1)
+
+        np.testing.assert_allclose(engine.range_frame(frame_index), expected_range_dB, atol=1e-2)
+        for rx_channel in range(adc_data.shape[3]):
+            np.testing.assert_allclose(
+                engine.range_doppler_frame(frame_index, rx_channel), expected_range_doppler_dB[:, :, rx_channel], atol=1e-2)
+
+def render_frames(adc_data, output, frames):
+    num_samples, num_chirps = adc_data.shape[:2]
+    return Postprocess_adc_data.render_frames(
+        adc_data, np.hanning(num_samples), -100.0, num_samples, num_chirps, 0.1, 2.0, str(output),
+        frames=frames, rx_channel=1, chirp_index=2, num_workers=2)
+
+def test_parse_frames():
+
+    assert Postprocess_adc_data.parse_frames("100:") == slice(100, None)
+    assert Postprocess_adc_data.parse_frames("::10") == slice(None, None, 10)
+    assert Postprocess_adc_data.parse_frames("5:20:2") == slice(5, 20, 2)
+    assert Postprocess_adc_data.parse_frames("::-1") == slice(None, None, -1)
+    assert range(6)[Postprocess_adc_data.parse_frames("::-1")] == range(5, -1, -1)
+
+def test_headless_renderer():
+
+    renderer = HeadlessRenderer(16, 8, 0.1, 2.0, (-100, 0), (0, 60), rx_channel=1, chirp_index=2, dpi=50)
+    range_frame = np.random.default_rng(0).uniform(-100, 0, size=(16, 8, 2))
+    range_doppler_frame = np.random.default_rng(1).uniform(0, 60, size=(16, 8))
+    renderer.update(3, range_frame, range_doppler_frame)
+
+    width, height = renderer.size
+    assert (width, height) == (600, 250)
+    rgba = np.asarray(renderer.render())
+    assert rgba.shape == (height, width, 4)
+    np.testing.assert_array_equal(renderer.line_range.get_ydata(), range_frame[:, 2, 1])
+    np.testing.assert_array_equal(renderer.image_range_doppler.get_array(), range_doppler_frame)
+    assert renderer.ax_range_doppler.get_title().endswith("frame: 3")
+
+def test_render_frames_to_png(tmp_path):
+
+    adc_data = make_profile_data()
+    assert render_frames(adc_data, tmp_path / "every_other", range(6)[1::2]) == 3
+    assert sorted(os.listdir(tmp_path / "every_other")) == ["frame_00001.png", "frame_00003.png", "frame_00005.png"]
+    with open(tmp_path / "every_other" / "frame_00001.png", "rb") as png_file:
+        assert png_file.read(8) == b"\x89PNG\r\n\x1a\n"
+
+def test_render_frames_reversed(tmp_path):
+
+    adc_data = make_profile_data()
+    assert render_frames(adc_data, tmp_path / "forward", range(6)) == 6
+    assert render_frames(adc_data, tmp_path / "reversed", range(6)[Postprocess_adc_data.parse_frames("::-1")]) == 6
+
+    # every frame is rendered with its own data (and the same axis limits)
+    assert sorted(os.listdir(tmp_path / "reversed")) == sorted(os.listdir(tmp_path / "forward"))
+    for png_name in os.listdir(tmp_path / "forward"):
+        with open(tmp_path / "forward" / png_name, "rb") as forward, open(tmp_path / "reversed" / png_name, "rb") as reversed_png:
+            assert forward.read() == reversed_png.read()
+
+def make_mmwave_device(num_samples, num_chirps, num_frames=7, num_rx=4):
+    """the MMWaveDevice parameters used by read_adc_data and detect_interference_events"""
+    return SimpleNamespace(
+        num_sample_per_chirp=num_samples, num_chirp_per_frame=num_chirps, num_frame=num_frames, num_rx_chnl=num_rx,
+        adc_bits=16, is_iq_swap=False, frame_periodicity=0.04, adc_samp_rate=5000,
+        chirp_idle_time=7000, chirp_adc_start_time=6000, chirp_ramp_time=60000)
+
+def events_reference(adc_data_bin_file, mmwave_device_0, mmwave_device_1, thresholds):
+    """Find the events by scanning every chirp of the fully loaded capture"""
+    adc_data_profiles = Postprocess_adc_data.read_adc_data(adc_data_bin_file, mmwave_device_0, mmwave_device_1)
+    events = []
+    for frame in range(mmwave_device_0.num_frame):
+        for profile_index, (adc_data, mmwave_device) in enumerate(zip(adc_data_profiles, (mmwave_device_0, mmwave_device_1))):
+            for chirp in range(mmwave_device.num_chirp_per_frame):
+                for rx in range(mmwave_device.num_rx_chnl):
+                    magnitude = np.abs(adc_data[:, chirp, frame, rx].astype(np.complex128))
+                    for threshold in sorted(thresholds):
+                        if not np.any(magnitude > threshold):
+                            continue
+                        onset = np.argmax(magnitude > threshold)
+                        onset_time = Postprocess_adc_data.sample_times(
+                            frame, chirp, onset, profile_index, mmwave_device.frame_periodicity, mmwave_device.adc_samp_rate * 1000,
+                            mmwave_device.chirp_idle_time / 1000, mmwave_device.chirp_adc_start_time / 1000, mmwave_device.chirp_ramp_time / 1000)
+                        events.append((frame, chirp, profile_index, rx, threshold, onset, onset_time, magnitude.max()))
+    return np.sort(np.array(events, dtype=Postprocess_adc_data.EVENT_DTYPE), order=["frame", "chirp", "profile", "rx", "threshold"])
+
+def test_detect_interference_events(tmp_path):
+
+    mmwave_device_0 = make_mmwave_device(num_samples=8, num_chirps=3)
+    # the samples of the two profiles alternate, so their frames hold the same number of samples
+    mmwave_device_1 = make_mmwave_device(num_samples=12, num_chirps=2)
+
+    # low level noise with bursts of interference at random samples
+    rng = np.random.default_rng(0)
+    num_ints = (8 * 3 + 12 * 2) * 4 * 2 * mmwave_device_0.num_frame
+    adc_data = rng.integers(-15, 16, size=num_ints, dtype=np.int16)
+    interference = rng.random(num_ints) < 0.02
+    adc_data[interference] = rng.integers(-200, 201, size=np.count_nonzero(interference), dtype=np.int16)
+    adc_data_bin_file = str(tmp_path / "adc_data.bin")
+    adc_data.tofile(adc_data_bin_file)
+
+    thresholds = (100, 30, 60)
+    expected = events_reference(adc_data_bin_file, mmwave_device_0, mmwave_device_1, thresholds)
+    assert len(set(expected["threshold"])) == 3
+
+    # the chunks do not divide the number of frames
+    events_file = str(tmp_path / "events.npy")
+    events = Postprocess_adc_data.detect_interference_events(
+        adc_data_bin_file, mmwave_device_0, mmwave_device_1, events_file, thresholds, frames_per_chunk=3)
+
+    assert events.dtype == Postprocess_adc_data.EVENT_DTYPE
+    for name in ("frame", "chirp", "profile", "rx", "threshold", "onset_sample"):
+        np.testing.assert_array_equal(events[name], expected[name])
+    np.testing.assert_allclose(events["onset_time"], expected["onset_time"])
+    np.testing.assert_allclose(events["peak_magnitude"], expected["peak_magnitude"], rtol=1e-5)
+    np.testing.assert_array_equal(np.load(events_file), events)
+
+    # csv events files hold the same events
+    csv_file = str(tmp_path / "events.csv")
+    Postprocess_adc_data.detect_interference_events(
+        adc_data_bin_file, mmwave_device_0, mmwave_device_1, csv_file, thresholds, frames_per_chunk=4)
+    csv_events = np.loadtxt(csv_file, delimiter=",", skiprows=1)
+    assert csv_events.shape == (events.size, len(Postprocess_adc_data.EVENT_DTYPE.names))
+    np.testing.assert_array_equal(csv_events[:, 0], events["frame"])
+    np.testing.assert_array_equal(csv_events[:, 5], events["onset_sample"])